@@ -1,7 +1,15 @@
 # Import the necessary modules for handling the graph and Dijkstra's algorithm.
 from Graph import Graph_journey_duration
-from dijkstra import dijkstra
+from dijkstra import dijkstra_search, bidirectional_dijkstra
+from landmarks import get_landmarks, alt_search
+from contraction_hierarchy import ContractionHierarchy, ch_search
 import os
+
+# Search engines ShortestPathFinder can use: Dijkstra's algorithm from the start station,
+# bidirectional Dijkstra from both ends, A* guided by landmark distances (ALT),
+# or upward searches in a contraction hierarchy.
+SEARCH_ENGINES = ("dijkstra", "bidirectional", "alt", "ch")
+
 # Define a class to handle finding stations and tube lines on the London Underground graph.
 class StationLineFinder:
     # Initializer for the class, takes a graph as an argument.
@@ -10,12 +18,8 @@ class StationLineFinder:
 
     # Method to find the full name of a station given a partial or case-insensitive name.
     def find_station_name(self, station_name):
-        # Iterate over all stations in the graph.
-        for real_name in self.graph.stations:
-            # Check if the provided station name matches (ignoring case) with any real station name.
-            if station_name.lower() == real_name.lower():
-                return real_name  # Return the matching real station name.
-        return None  # If no match is found, return None.
+        # Look the name up in the station index, ignoring case.
+        return self.graph.station_index.find_name(station_name)
 
     # Method to get the index of a station from the user input.
     def get_station_index(self, station_name_prompt):
@@ -24,19 +28,44 @@ class StationLineFinder:
             matched_station = self.find_station_name(station_name)  # Find the full station name.
             if matched_station:
                 # If a matching station is found, return its index from the graph.
-                return self.graph.station_to_int[matched_station]
+                return self.graph.station_index.get_id(matched_station)
             print("Station not found. Please check the name and try again.")  # Error message if not found.
 
     # Method to get the tube line connecting two stations.
-    def get_tube_line(self, station1, station2):
-        # Check the tube_lines dictionary for a direct or reverse tuple of the stations.
-        return self.graph.tube_lines.get((station1, station2)) or self.graph.tube_lines.get((station2, station1))
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        # Return the tube line connecting the two stations (in either direction), keeping to preferred_line if it also connects them.
+        return self.graph.get_tube_line(station1, station2, preferred_line)
 
 # Define a class for finding the shortest path between two stations.
 class ShortestPathFinder():
-    # Initializer for the class, takes a StationLineFinder object as an argument.
-    def __init__(self, station_finder):
+    # Initializer for the class, takes a StationLineFinder object and optionally the search engine to use.
+    def __init__(self, station_finder, engine="dijkstra"):
+        if engine not in SEARCH_ENGINES:
+            raise RuntimeError("Unknown search engine " + str(engine) + ".")
         self.station_finder = station_finder  # Store the station finder object for later use.
+        self.engine = engine  # Name of the search engine, one of SEARCH_ENGINES.
+        # The ALT engine needs distances to and from its landmarks, loaded from disk or computed once here.
+        self.landmarks = get_landmarks(station_finder.graph) if engine == "alt" else None
+        # The CH engine contracts the whole network once, here, so that every query is fast.
+        self.hierarchy = ContractionHierarchy(station_finder.graph.graph) if engine == "ch" else None
+        self.num_settled = None  # Number of stations the last search settled before reaching the destination.
+
+    # Method to find the shortest path from one station to another, as distances and predecessors.
+    def search(self, source_index, destination_index):
+        graph = self.station_finder.graph.graph
+        if self.engine == "bidirectional":
+            # Search from both ends at once, meeting in the middle.
+            distances, predecessors, self.num_settled = bidirectional_dijkstra(graph, source_index, destination_index)
+        elif self.engine == "alt":
+            # Head for the destination, using the landmarks to bound the distance left.
+            distances, predecessors, self.num_settled = alt_search(graph, source_index, destination_index, self.landmarks)
+        elif self.engine == "ch":
+            # Search upward from both ends, then unpack the shortcuts back into real connections.
+            distances, predecessors, self.num_settled = ch_search(self.hierarchy, source_index, destination_index)
+        else:
+            # The search stops once the destination is settled, since only its path is needed.
+            distances, predecessors, self.num_settled = dijkstra_search(graph, source_index, destination_index)
+        return distances, predecessors
 
     # Method to find and print the shortest path between two stations.
     def find_and_print_shortest_path(self, line):
@@ -44,11 +73,12 @@ class ShortestPathFinder():
         source_index = self.station_finder.get_station_index("Enter the start station: ")
         destination_index = self.station_finder.get_station_index("Enter the destination station: ")
 
-        # Run Dijkstra's algorithm on the graph to find the shortest path.
-        distances, predecessors = dijkstra(self.station_finder.graph.graph, source_index)
+        # Run the search engine on the graph to find the shortest path.
+        distances, predecessors = self.search(source_index, destination_index)
 
         # Initialize a path list starting from the destination station.
-        path = [self.station_finder.graph.int_to_station[destination_index]]
+        station_index = self.station_finder.graph.station_index  # Converts station numbers back to names.
+        path = [station_index.get_name(destination_index)]
         current_station = destination_index  # Start from the destination station.
         previous_line = None  # Initialize the previous line as None.
 
@@ -59,14 +89,14 @@ class ShortestPathFinder():
 
             # If there is a line change, add a message to the path list.
             if previous_line is not None and line != previous_line:
-                path.insert(1, f"(Switch to {previous_line} line at {self.station_finder.graph.int_to_station[current_station]})")
+                path.insert(1, f"(Switch to {previous_line} line at {station_index.get_name(current_station)})")
 
             current_station = next_station  # Update the current station.
-            path.insert(0, self.station_finder.graph.int_to_station[current_station])  # Add the current station to the path.
+            path.insert(0, station_index.get_name(current_station))  # Add the current station to the path.
             previous_line = line  # Update the previous line.
 
         # Print the shortest path and total travel time.
-        print("Shortest path:", "Go on", line, "line in", self.station_finder.graph.int_to_station[source_index], "-->", " -> ".join(path))
+        print("Shortest path:", "Go on", line, "line in", station_index.get_name(source_index), "-->", " -> ".join(path))
         print(f"Total travel time: {distances[destination_index]} minutes")
 
 # Main execution block.
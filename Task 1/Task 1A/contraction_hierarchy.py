@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# contraction_hierarchy.py
+
+"""Contraction hierarchies for fast point-to-point shortest-path queries.
+
+Preprocessing contracts the vertices one at a time, from least to most
+important.  Contracting v removes it from the graph, and adds a shortcut
+between two of its neighbours whenever the path through v is the only shortest
+path between them, so distances among the remaining vertices do not change.
+
+A shortest path then always climbs to more important vertices and comes down
+again, so a query searches upward from both ends and meets at the top.  The
+upward searches settle only a few dozen vertices, however big the network.
+Shortcuts remember the vertex they bypass, so a path can be unpacked back into
+the edges of the original graph, with their labels.
+"""
+
+import time
+from indexed_min_heap import IndexedMinHeap
+
+# Witness searches give up after settling this many vertices and add the
+# shortcut.  An unneeded shortcut never gives a wrong answer, only a bigger graph.
+WITNESS_SETTLE_LIMIT = 60
+
+
+class ContractionHierarchy:
+
+	def __init__(self, G, witness_settle_limit=WITNESS_SETTLE_LIMIT):
+		"""Contract every vertex of the undirected, weighted graph G.
+
+		Vertices are contracted in order of their edge difference, the number of
+		shortcuts contracting them would add minus the number of edges removed,
+		plus the number of their neighbours already contracted, which spreads the
+		contractions evenly over the graph.  Priorities are updated lazily: a
+		vertex taken from the queue is contracted only if its recomputed
+		priority is still no greater than the smallest one left.
+
+		Arguments:
+		G -- an undirected, weighted graph, either an AdjacencyListGraph or a CSRGraph
+		witness_settle_limit -- number of vertices after which a witness search gives up
+		"""
+		if G.is_directed():
+			raise RuntimeError("ContractionHierarchy needs an undirected graph.")
+		start_time = time.perf_counter()
+		card_V = G.get_card_V()
+		self.card_V = card_V
+		self.witness_settle_limit = witness_settle_limit
+
+		# Remaining graph: adj[u][v] is [weight, middle], where middle is the vertex a
+		# shortcut bypasses, or None for an edge of G.  Parallel edges keep the lightest.
+		adj = [{} for _ in range(card_V)]
+		self.labels = {}  # label of each edge (u, v) of G with u < v
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				v, w = edge.get_v(), edge.get_weight()
+				if v != u and (v not in adj[u] or w < adj[u][v][0]):
+					adj[u][v] = [w, None]
+					if u < v:
+						self.labels[(u, v)] = edge.get_label()
+		self.adj = adj
+
+		# Scratch space for witness searches and queries, reused between them.
+		self.dist = [[float('inf')] * card_V, [float('inf')] * card_V]
+		self.queues = [IndexedMinHeap(card_V, self.dist[0]), IndexedMinHeap(card_V, self.dist[1])]
+
+		# Upward graph: up[u] maps each neighbour of u contracted after it to [weight, middle].
+		self.up = [None] * card_V
+		self.rank = [0] * card_V  # position of each vertex in the contraction order
+		self.num_shortcuts = 0
+		deleted_neighbours = [0] * card_V
+
+		priority = [0] * card_V
+		order = IndexedMinHeap(card_V, priority)
+		for v in range(card_V):
+			priority[v] = self.edge_difference(v)
+		order.build(range(card_V))
+
+		next_rank = 0
+		while order.get_size() > 0:
+			v = order.extract_min()
+			priority[v] = self.edge_difference(v) + deleted_neighbours[v]
+			if order.get_size() > 0 and priority[v] > priority[order.minimum()]:
+				order.insert(v)  # no longer the least important, so try again later
+				continue
+			for a, b, w in self.needed_shortcuts(v):
+				if b not in adj[a] or w < adj[a][b][0]:
+					if b not in adj[a]:
+						self.num_shortcuts += 1
+					adj[a][b] = [w, v]
+					adj[b][a] = [w, v]
+			# v's remaining edges all lead to vertices contracted after it.
+			self.up[v] = adj[v]
+			self.rank[v] = next_rank
+			next_rank += 1
+			for u in adj[v]:
+				del adj[u][v]
+				deleted_neighbours[u] += 1
+		self.adj = None  # every vertex has been contracted
+		self.preprocessing_time = time.perf_counter() - start_time
+
+	def needed_shortcuts(self, v):
+		"""Return the shortcuts (a, b, weight) that contracting v needs, one per
+		pair of its neighbours with no path as short as the one through v that avoids v."""
+		neighbours = list(self.adj[v].items())
+		shortcuts = []
+		for i in range(len(neighbours) - 1):
+			a, (w_av, _) = neighbours[i]
+			targets = {b: w_av + w_vb for b, (w_vb, _) in neighbours[i + 1:]}
+			witness = self.witness_search(a, v, targets, max(targets.values()))
+			for b, w in targets.items():
+				if witness.get(b, float('inf')) > w:
+					shortcuts.append((a, b, w))
+		return shortcuts
+
+	def edge_difference(self, v):
+		"""Return the number of shortcuts contracting v would add, minus its number of edges."""
+		return len(self.needed_shortcuts(v)) - len(self.adj[v])
+
+	def witness_search(self, a, v, targets, max_distance):
+		"""Search from a in the remaining graph without v, no farther than
+		max_distance and for at most witness_settle_limit vertices.  Return the
+		distances found to the vertices in targets."""
+		dist, queue, adj = self.dist[0], self.queues[0], self.adj
+		dist[a] = 0
+		queue.insert(a)
+		touched = [a]
+		found = {}
+		num_settled = 0
+		while queue.get_size() > 0 and num_settled < self.witness_settle_limit:
+			u = queue.extract_min()
+			num_settled += 1
+			if dist[u] > max_distance:
+				break
+			if u in targets:
+				found[u] = dist[u]
+				if len(found) == len(targets):
+					break
+			for x, (w, _) in adj[u].items():
+				if x != v and dist[x] > dist[u] + w:
+					if dist[x] == float('inf'):
+						touched.append(x)
+					dist[x] = dist[u] + w
+					queue.insert_or_decrease_key(x, dist[x])
+		# Found distances are exact, but a target still in the queue may already
+		# have been reached by a short enough path.
+		for b in targets:
+			if b not in found and dist[b] < float('inf'):
+				found[b] = dist[b]
+		queue.clear()
+		for u in touched:
+			dist[u] = float('inf')
+		return found
+
+	def query(self, s, t):
+		"""Return the distance from s to t, a shortest path as a list of vertices
+		of the original graph, and the number of vertices settled.  The distance is
+		infinite and the path empty if t is unreachable from s.
+
+		The path is simple, even where zero-weight edges let the unpacked
+		shortcuts return to a vertex.
+
+		Both searches only follow edges to vertices contracted later.  A side
+		stops once the smallest distance in its queue is no less than the
+		shortest path found so far through a vertex both sides have reached.
+		"""
+		if s == t:
+			return 0, [s], 0
+		dist, queues, up = self.dist, self.queues, self.up
+		parents = [{s: None}, {t: None}]  # vertex each search reached each vertex from
+		dist[0][s] = 0
+		dist[1][t] = 0
+		queues[0].insert(s)
+		queues[1].insert(t)
+		best, meeting = float('inf'), None
+		num_settled = 0
+
+		while True:
+			# Take the next vertex from the side with the smaller distance that can still help.
+			side = None
+			for i in (0, 1):
+				if queues[i].get_size() > 0 and dist[i][queues[i].minimum()] < best:
+					if side is None or dist[i][queues[i].minimum()] < dist[side][queues[side].minimum()]:
+						side = i
+			if side is None:
+				break
+			d, other, parent, queue = dist[side], dist[1 - side], parents[side], queues[side]
+			u = queue.extract_min()
+			num_settled += 1
+			if d[u] + other[u] < best:
+				best, meeting = d[u] + other[u], u
+			for x, (w, _) in up[u].items():
+				if d[x] > d[u] + w:
+					d[x] = d[u] + w
+					parent[x] = u
+					queue.insert_or_decrease_key(x, d[x])
+					if d[x] + other[x] < best:
+						best, meeting = d[x] + other[x], x
+
+		path = []
+		if meeting is not None:
+			# Climb from s to the meeting vertex and come down to t, unpacking shortcuts.
+			upward = [meeting]
+			while parents[0][upward[-1]] is not None:
+				upward.append(parents[0][upward[-1]])
+			upward.reverse()
+			downward = [meeting]
+			while parents[1][downward[-1]] is not None:
+				downward.append(parents[1][downward[-1]])
+			hierarchy_path = upward + downward[1:]
+			path = [s]
+			position = {s: 0}  # index of each vertex in path
+			for a, b in zip(hierarchy_path, hierarchy_path[1:]):
+				for u, v, w, label in self.unpack_edge(a, b):
+					# With zero-weight edges, two shortcuts can bypass the same vertex, so
+					# the unpacked path may come back to a vertex.  The loop weighs nothing,
+					# so cut it out and carry on from the first visit.
+					if v in position:
+						for x in path[position[v] + 1:]:
+							del position[x]
+						del path[position[v] + 1:]
+					else:
+						position[v] = len(path)
+						path.append(v)
+
+		# Reset the scratch space for the next query.
+		for i in (0, 1):
+			queues[i].clear()
+			for u in parents[i]:
+				dist[i][u] = float('inf')
+		return best, path, num_settled
+
+	def unpack_edge(self, a, b):
+		"""Return the edges (u, v, weight, label) of the original graph that the
+		edge or shortcut from a to b stands for, in order from a to b."""
+		edges = []
+		stack = [(a, b)]
+		while stack:
+			u, v = stack.pop()
+			lower, higher = (u, v) if self.rank[u] < self.rank[v] else (v, u)
+			w, middle = self.up[lower][higher]
+			if middle is None:
+				edges.append((u, v, w, self.labels[(min(u, v), max(u, v))]))
+			else:
+				# Unpack u to middle first, so push it last.
+				stack.append((middle, v))
+				stack.append((u, middle))
+		return edges
+
+	def unpack_path(self, path):
+		"""Return the edges (u, v, weight, label) along a path of vertices returned by query."""
+		edges = []
+		for a, b in zip(path, path[1:]):
+			edges.extend(self.unpack_edge(a, b))
+		return edges
+
+
+def ch_search(hierarchy, s, t):
+	"""Find a shortest path from s to t with a ContractionHierarchy, with the same
+	return values as dijkstra.dijkstra_search: d and pi are filled in only along
+	the path, with d infinite and pi None everywhere else."""
+	distance, path, num_settled = hierarchy.query(s, t)
+	d = [float('inf')] * hierarchy.card_V
+	pi = [None] * hierarchy.card_V
+	d[s] = 0
+	for u, v, w, label in hierarchy.unpack_path(path):
+		d[v] = d[u] + w
+		pi[v] = u
+	return d, pi, num_settled
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+
+	random.seed(4)
+	all_equal = True
+	for trial in range(20):
+		card_V = random.randint(1, 150)
+		G = AdjacencyListGraph(card_V, False, True)
+		for _ in range(random.randint(0, 3 * card_V)):
+			u, v = random.randrange(card_V), random.randrange(card_V)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, random.randint(0, 20), label=(u, v))
+		hierarchy = ContractionHierarchy(G)
+
+		for s in range(0, card_V, 5):
+			d = dijkstra(G, s)[0]
+			for t in range(card_V):
+				distance, path, num_settled = hierarchy.query(s, t)
+				edges = hierarchy.unpack_path(path)
+				# The unpacked path must be a simple path of real edges adding up to the
+				# distance, and following pi back from t must reach s without going round a cycle.
+				pi = ch_search(hierarchy, s, t)[1]
+				backtrack = [t]
+				while pi[backtrack[-1]] is not None and len(backtrack) <= card_V:
+					backtrack.append(pi[backtrack[-1]])
+				if (distance != d[t] or (path and (path[0] != s or path[-1] != t))
+						or len(set(path)) != len(path) or (path and backtrack[::-1] != path)
+						or sum(w for u, v, w, label in edges) != (d[t] if path else 0)
+						or any(G.find_edge(u, v).get_weight() != w for u, v, w, label in edges)
+						or any(label not in ((u, v), (v, u)) for u, v, w, label in edges)):
+					print("Mismatch from", s, "to", t, "in trial", trial)
+					all_equal = False
+	print("All contraction hierarchy distances and paths are " + ("" if all_equal else "not ") + "correct")
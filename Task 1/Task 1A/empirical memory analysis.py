@@ -0,0 +1,69 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import tracemalloc
+import os
+from network_compiler import compile_network  # Turns the connection columns into integer edge arrays.
+from adjacency_list_graph import AdjacencyListGraph
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Function to measure the memory used by the adjacency lists of one synthetic network.
+def measure_memory(num_lines, num_stations_per_line, num_interchange_stations, compact):
+    # Generate synthetic data and compile it into edge arrays.
+    df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations_per_line, num_interchange_stations)
+    stations, edge_u, edge_v, edge_weights, line_names, edge_lines, edge_line_bits = compile_network(
+        df['station 1'].to_numpy(), df['station 2'].to_numpy(),
+        pd.to_numeric(df['time in minutes between the stations']).astype(float).to_numpy(), df['tube line'].to_numpy())
+    edge_u, edge_v, edge_weights = edge_u.tolist(), edge_v.tolist(), edge_weights.tolist()
+
+    # Label each edge with the bitmask of its tube lines, as StationGraph.load_network does.
+    num_bytes = edge_line_bits.shape[1]
+    line_bytes = edge_line_bits.tobytes()
+    line_masks = [int.from_bytes(line_bytes[i:i + num_bytes], 'little')
+                  for i in range(0, len(line_bytes), num_bytes)]
+
+    # Count only the memory allocated while the graph is built.
+    tracemalloc.start()
+    graph = AdjacencyListGraph(len(stations), directed=False, weighted=True, compact=compact)
+    graph.insert_edges(edge_u, edge_v, edge_weights, line_masks)
+    graph_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return len(stations), graph.get_card_E(), graph_bytes
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    # Define parameters for memory analysis.
+    num_lines = 15
+    num_interchange_stations = 1
+    directory = os.path.join(parent_dir, r"Data sets")
+    memory_results = []
+
+    # Measure both edge representations for different numbers of stations.
+    for num_stations in [500, 1000, 2000, 3000, 4000, 5000]:
+        num_stations_per_line = num_stations // num_lines
+        for compact in [False, True]:
+            card_V, card_E, graph_bytes = measure_memory(num_lines, num_stations_per_line, num_interchange_stations, compact)
+            memory_results.append({
+                'Total Number of Stations': card_V,
+                'Number of Edges': card_E,
+                'Representation': 'compact' if compact else 'regular',
+                'Graph Memory (bytes)': graph_bytes,
+                # Each undirected edge is stored in both adjacency lists.
+                'Bytes per Edge': graph_bytes / card_E,
+            })
+
+    # Compile the results into a DataFrame and print a side-by-side summary.
+    df = pd.DataFrame(memory_results)
+    summary_df = df.pivot(index='Total Number of Stations', columns='Representation', values='Bytes per Edge')
+    summary_df['Saving (%)'] = 100 * (1 - summary_df['compact'] / summary_df['regular'])
+    print(summary_df.round(1).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'memory_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
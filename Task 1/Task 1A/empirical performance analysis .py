@@ -119,7 +119,8 @@ def analyze_performance(num_lines, num_stations_per_line, num_interchange_statio
 
     # Calculate the time taken and return it.
     time_taken = end_time - start_time
-    return time_taken
+    # Also return how many stations the search settled before reaching the destination.
+    return time_taken, spf.num_settled
 
 # Main execution block
 if __name__ == "__main__":
@@ -136,10 +137,11 @@ if __name__ == "__main__":
         num_stations_per_line = num_stations // num_lines
         for line in range(1, num_lines + 1):
             # Measure the time taken for each case and record it.
-            time_taken = analyze_performance(num_lines, num_stations_per_line, num_interchange_stations, line, directory)
+            time_taken, num_settled = analyze_performance(num_lines, num_stations_per_line, num_interchange_stations, line, directory)
             performance_results.append({
                 'Total Number of Stations': num_stations,
-                'Time Taken (s)': time_taken
+                'Time Taken (s)': time_taken,
+                'Stations Settled': num_settled
             })
 
     # Compile the results into a DataFrame and summarize.
@@ -0,0 +1,78 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import random
+import tempfile
+import time
+import os
+from Graph import Graph_journey_duration, Graph_count_stations
+from dijkstra import dijkstra, QUEUE_TYPES
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Function to time dijkstra with each priority queue on one graph.
+def measure_queues(dataset, graph, num_sources):
+    frozen_graph = graph.get_frozen_graph()
+    # Every queue searches from the same source stations.
+    sources = random.sample(range(frozen_graph.get_card_V()), min(num_sources, frozen_graph.get_card_V()))
+    results = []
+    expected = None
+    for queue_type in QUEUE_TYPES:
+        start_time = time.perf_counter()
+        distances = [dijkstra(frozen_graph, source, queue_type=queue_type)[0] for source in sources]
+        time_taken = time.perf_counter() - start_time
+        # Every queue must find the same distances.
+        if expected is None:
+            expected = distances
+        elif distances != expected:
+            raise RuntimeError(queue_type + " queue found different distances on " + dataset + ".")
+        results.append({
+            'Dataset': dataset,
+            'Total Number of Stations': frozen_graph.get_card_V(),
+            'Number of Edges': frozen_graph.get_card_E(),
+            'Average Degree': frozen_graph.get_card_E() / frozen_graph.get_card_V(),
+            'Largest Weight': frozen_graph.get_integer_weight_bound(),
+            'Queue': queue_type,
+            'Time per Search (ms)': 1000 * time_taken / len(sources),
+        })
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_sources = 50
+    num_lines = 15
+    queue_results = []
+    random.seed(0)
+
+    # The real network, weighted by journey time and by number of stations.
+    queue_results += measure_queues('London Underground (minutes)', Graph_journey_duration(file_path), num_sources)
+    queue_results += measure_queues('London Underground (stations)', Graph_count_stations(file_path), num_sources)
+
+    # Synthetic networks of growing size, sparse with one interchange between
+    # neighbouring lines and denser with five.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_interchange_stations in [1, 5]:
+            for num_stations in [500, 1000, 2000, 5000]:
+                df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations // num_lines, num_interchange_stations)
+                csv_path = os.path.join(temp_dir, f'synthetic_{num_stations}_{num_interchange_stations}.csv')
+                df.to_csv(csv_path, index=False)
+                graph = Graph_journey_duration(csv_path, use_snapshot=False)
+                dataset = f'Synthetic ({num_stations} stations, {num_interchange_stations} interchanges)'
+                queue_results += measure_queues(dataset, graph, num_sources)
+
+    # Compile the results into a DataFrame and print which queue wins on each dataset.
+    df = pd.DataFrame(queue_results)
+    summary_df = df.pivot(index='Dataset', columns='Queue', values='Time per Search (ms)')
+    summary_df = summary_df.reindex(index=df['Dataset'].unique(), columns=list(QUEUE_TYPES))
+    summary_df['Fastest'] = summary_df.idxmin(axis=1)
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'priority_queue_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
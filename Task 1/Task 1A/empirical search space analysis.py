@@ -0,0 +1,76 @@
+# Import necessary libraries
+import pandas as pd
+import random
+import time
+import os
+from Graph import Graph_journey_duration
+from Task_1A import ShortestPathFinder, StationLineFinder, SEARCH_ENGINES
+from landmarks import get_landmarks_path
+
+# Function to run every search engine on the same station pairs.
+def measure_engines(graph, pairs):
+    station_finder = StationLineFinder(graph)
+    results = []
+    for engine in SEARCH_ENGINES:
+        spf = ShortestPathFinder(station_finder, engine)
+        if spf.landmarks is not None:
+            # Report what the landmarks cost before any query uses them.
+            print(f"{engine}: {len(spf.landmarks.landmarks)} landmarks, built in "
+                  f"{1000 * spf.landmarks.preprocessing_time:.1f} ms, "
+                  f"{spf.landmarks.get_memory_per_landmark()} bytes per landmark")
+        if spf.hierarchy is not None:
+            print(f"{engine}: {spf.hierarchy.num_shortcuts} shortcuts, built in "
+                  f"{1000 * spf.hierarchy.preprocessing_time:.1f} ms")
+        for source_index, destination_index in pairs:
+            start_time = time.perf_counter()
+            distances, predecessors = spf.search(source_index, destination_index)
+            time_taken = time.perf_counter() - start_time
+            results.append({
+                'Engine': engine,
+                'Source': graph.station_index.get_name(source_index),
+                'Destination': graph.station_index.get_name(destination_index),
+                'Journey Time (minutes)': distances[destination_index],
+                'Stations Settled': spf.num_settled,
+                'Time Taken (ms)': 1000 * time_taken,
+            })
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_pairs = 2000
+    random.seed(0)
+
+    graph = Graph_journey_duration(file_path)
+    # Build the landmarks from scratch, so their preprocessing time is measured.
+    landmarks_path = get_landmarks_path(graph)
+    if os.path.exists(landmarks_path):
+        os.remove(landmarks_path)
+    num_stations = len(graph.station_index)
+    pairs = [(random.randrange(num_stations), random.randrange(num_stations)) for _ in range(num_pairs)]
+    df = pd.DataFrame(measure_engines(graph, pairs))
+
+    # Every engine must find journeys of the same length.
+    journey_times = df.pivot_table(index=['Source', 'Destination'], columns='Engine', values='Journey Time (minutes)')
+    if not journey_times.eq(journey_times['dijkstra'], axis=0).all().all():
+        raise RuntimeError("The search engines found journeys of different lengths.")
+
+    # Summarise all journeys, and the longest tenth where a forward search covers most of the network.
+    long_journey = df['Journey Time (minutes)'] >= df['Journey Time (minutes)'].quantile(0.9)
+    summary_df = pd.concat({
+        'All journeys': df.groupby('Engine')[['Stations Settled', 'Time Taken (ms)']].mean(),
+        'Longest 10% of journeys': df[long_journey].groupby('Engine')[['Stations Settled', 'Time Taken (ms)']].mean(),
+    }).reindex(SEARCH_ENGINES, level='Engine')
+    summary_df['Share of Network Settled'] = summary_df['Stations Settled'] / num_stations
+    # Speedup of each engine over plain Dijkstra on the same journeys.
+    for name, group in summary_df.groupby(level=0):
+        summary_df.loc[name, 'Speedup'] = (group.loc[(name, 'dijkstra'), 'Time Taken (ms)'] / group['Time Taken (ms)']).values
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'search_space_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
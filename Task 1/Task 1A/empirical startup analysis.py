@@ -0,0 +1,77 @@
+# Import necessary libraries
+import pandas as pd
+import subprocess
+import sys
+import time
+import os
+from Graph import Graph_journey_duration  # Used to make sure the snapshot exists before timing.
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Code run in a fresh interpreter for each measurement. It starts Task_1A the same
+# way as its main block and stops when the route finder asks for the first station.
+CHILD_CODE = r'''
+import sys, time, builtins
+start = time.perf_counter()
+from Task_1A import Graph_journey_duration, StationLineFinder, ShortestPathFinder
+imported = time.perf_counter()
+
+class FirstPrompt(Exception):
+    pass
+
+def first_prompt(prompt):
+    raise FirstPrompt()
+
+builtins.input = first_prompt
+try:
+    graph = Graph_journey_duration(sys.argv[1], use_snapshot=sys.argv[2] == 'snapshot')
+    ShortestPathFinder(StationLineFinder(graph)).find_and_print_shortest_path("")
+except FirstPrompt:
+    prompted = time.perf_counter()
+print(imported - start, prompted - imported, time.time(), 'pandas' in sys.modules, 'numpy' in sys.modules)
+'''
+
+# Function to start the route finder once and time it up to the first prompt.
+def measure_startup(file_path, mode):
+    launched = time.time()
+    output = subprocess.run([sys.executable, '-c', CHILD_CODE, file_path, mode], cwd=current_dir,
+                            capture_output=True, text=True, check=True).stdout
+    import_time, load_time, prompted, pandas_imported, numpy_imported = output.split()
+    return {
+        'Mode': mode,
+        'Import Time (ms)': 1000 * float(import_time),
+        'Graph Load Time (ms)': 1000 * float(load_time),
+        # From launching the interpreter, so this includes Python's own start-up.
+        'Time to First Prompt (ms)': 1000 * (float(prompted) - launched),
+        'pandas Imported': pandas_imported == 'True',
+        'numpy Imported': numpy_imported == 'True',
+    }
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_runs = 10
+    startup_results = []
+
+    # Build the snapshot first, so the snapshot runs only measure loading it.
+    Graph_journey_duration(file_path)
+
+    # Compare starting from the snapshot with rebuilding the graph from the workbook.
+    for mode in ['snapshot', 'rebuild']:
+        for run in range(num_runs):
+            result = measure_startup(file_path, mode)
+            result['Run'] = run + 1
+            startup_results.append(result)
+
+    # Compile the results into a DataFrame and print the median of each mode.
+    df = pd.DataFrame(startup_results)
+    summary_df = df.groupby('Mode').median(numeric_only=True).drop(columns='Run')
+    summary_df[['pandas Imported', 'numpy Imported']] = df.groupby('Mode')[['pandas Imported', 'numpy Imported']].any()
+    print(summary_df.round(1).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'startup_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
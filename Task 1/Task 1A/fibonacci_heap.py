@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# fibonacci_heap.py
+
+"""Minimum Fibonacci heap for the integers 0 to n-1, with the same interface as IndexedMinHeap."""
+
+
+class FibonacciHeap:
+
+    def __init__(self, n, keys=None):
+        """Initialize an empty Fibonacci heap for the items 0 to n-1.
+
+        The heap is a circular, doubly linked root list of trees, as in Fredman
+        and Tarjan.  Insert adds a root and decrease_key cuts a node out to the
+        root list, cascading up through marked ancestors, both in O(1) amortized
+        time.  extract_min consolidates the roots so that no two have the same
+        degree, in O(lg n) amortized time.
+
+        The trees are kept in flat lists indexed by item rather than in node objects.
+
+        Arguments:
+        n -- number of possible items
+        keys -- optional list of n keys, indexed by item, as for IndexedMinHeap
+        """
+        self.keys = [float('inf')] * n if keys is None else keys
+        self.parent = [-1] * n
+        self.child = [-1] * n       # any one child, -1 if none
+        self.left = [0] * n         # neighbours in the circular list of siblings
+        self.right = [0] * n
+        self.degree = [0] * n       # number of children
+        self.mark = [False] * n     # True if a child was cut since the node became a child
+        self.in_heap = [False] * n
+        self.min = -1
+        self.size = 0
+
+    def get_size(self):
+        """Return the number of items in the priority queue."""
+        return self.size
+
+    def contains(self, v):
+        """Return True if item v is in the priority queue."""
+        return self.in_heap[v]
+
+    def get_key(self, v):
+        """Return the key of item v."""
+        return self.keys[v]
+
+    def minimum(self):
+        """Return the item with the minimum key."""
+        if self.min < 0:
+            raise RuntimeError("Heap underflow.")
+        return self.min
+
+    def add_root(self, v):
+        """Put v into the root list, next to the minimum, and update the minimum."""
+        m = self.min
+        if m < 0:
+            self.left[v] = self.right[v] = v
+            self.min = v
+            return
+        r = self.right[m]
+        self.left[v], self.right[v] = m, r
+        self.right[m] = self.left[r] = v
+        if self.keys[v] < self.keys[m]:
+            self.min = v
+
+    def remove_from_list(self, v):
+        """Remove v from its circular list of siblings."""
+        l, r = self.left[v], self.right[v]
+        self.right[l] = r
+        self.left[r] = l
+
+    def insert(self, v, k=None):
+        """Insert item v, with key k if given, otherwise with its current key."""
+        if self.in_heap[v]:
+            raise RuntimeError("Error in insert: item " + str(v) + " is already in the heap.")
+        if k is not None:
+            self.keys[v] = k
+        self.in_heap[v] = True
+        self.parent[v] = self.child[v] = -1
+        self.degree[v] = 0
+        self.mark[v] = False
+        self.size += 1
+        self.add_root(v)
+
+    def build(self, items, keys=None):
+        """Insert items, with keys from the list keys, indexed by item, if given,
+        otherwise with their current keys.  Each insert already takes O(1) time."""
+        for v in items:
+            self.insert(v, None if keys is None else keys[v])
+
+    def extract_min(self):
+        """Return and delete the item with the minimum key."""
+        z = self.min
+        if z < 0:
+            raise RuntimeError("Heap underflow.")
+        parent, left, right = self.parent, self.left, self.right
+
+        # Move z's children to the root list.
+        c = self.child[z]
+        if c >= 0:
+            last = left[c]
+            x = c
+            while True:
+                parent[x] = -1
+                if x == last:
+                    break
+                x = right[x]
+            # Splice the whole list of children in after z.
+            r = right[z]
+            right[z], left[c] = c, z
+            right[last], left[r] = r, last
+            self.child[z] = -1
+
+        # Remove z from the root list.
+        if right[z] == z:
+            self.min = -1
+        else:
+            self.min = right[z]
+            self.remove_from_list(z)
+            self.consolidate()
+        self.in_heap[z] = False
+        self.size -= 1
+        return z
+
+    def consolidate(self):
+        """Link roots of equal degree until every root has a different degree,
+        and find the new minimum."""
+        keys, degree, right = self.keys, self.degree, self.right
+        roots = []
+        x = self.min
+        while True:
+            roots.append(x)
+            x = right[x]
+            if x == self.min:
+                break
+
+        by_degree = []
+        for x in roots:
+            dx = degree[x]
+            while dx < len(by_degree) and by_degree[dx] >= 0:
+                y = by_degree[dx]
+                if keys[y] < keys[x]:
+                    x, y = y, x
+                self.link(y, x)
+                by_degree[dx] = -1
+                dx += 1
+            while dx >= len(by_degree):
+                by_degree.append(-1)
+            by_degree[dx] = x
+
+        # Rebuild the root list from the roots left.
+        self.min = -1
+        for x in by_degree:
+            if x >= 0:
+                self.add_root(x)
+
+    def link(self, y, x):
+        """Make root y a child of root x."""
+        self.remove_from_list(y)
+        c = self.child[x]
+        if c < 0:
+            self.left[y] = self.right[y] = y
+            self.child[x] = y
+        else:
+            r = self.right[c]
+            self.left[y], self.right[y] = c, r
+            self.right[c] = self.left[r] = y
+        self.parent[y] = x
+        self.degree[x] += 1
+        self.mark[y] = False
+
+    def decrease_key(self, v, k):
+        """Decrease the key of item v to k.  Error if k is greater than v's current key."""
+        if k > self.keys[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[v]))
+        self.keys[v] = k
+        p = self.parent[v]
+        if p >= 0 and k < self.keys[p]:
+            self.cut(v, p)
+            self.cascading_cut(p)
+        if k < self.keys[self.min]:
+            self.min = v
+
+    def cut(self, x, y):
+        """Move x, a child of y, to the root list."""
+        if self.right[x] == x:
+            self.child[y] = -1
+        else:
+            if self.child[y] == x:
+                self.child[y] = self.right[x]
+            self.remove_from_list(x)
+        self.degree[y] -= 1
+        self.parent[x] = -1
+        self.mark[x] = False
+        self.add_root(x)
+
+    def cascading_cut(self, y):
+        """Cut y too if it has now lost two children, and continue up the tree."""
+        z = self.parent[y]
+        while z >= 0:
+            if not self.mark[y]:
+                self.mark[y] = True
+                return
+            self.cut(y, z)
+            y, z = z, self.parent[z]
+
+    def insert_or_decrease_key(self, v, k):
+        """Insert item v with key k, or decrease its key to k if it is already in the heap."""
+        if self.in_heap[v]:
+            self.decrease_key(v, k)
+        else:
+            self.insert(v, k)
+
+    def is_heap(self):
+        """Verify that every child's key is at least its parent's, that the minimum
+        is a root with the smallest key, and that the degrees and size are right."""
+        if self.min < 0:
+            return self.size == 0
+        count = 0
+        stack = []
+        x = self.min
+        while True:
+            if self.parent[x] >= 0 or self.keys[x] < self.keys[self.min]:
+                return False
+            stack.append(x)
+            x = self.right[x]
+            if x == self.min:
+                break
+        while stack:
+            u = stack.pop()
+            count += 1
+            num_children = 0
+            c = self.child[u]
+            if c >= 0:
+                x = c
+                while True:
+                    if self.parent[x] != u or self.keys[x] < self.keys[u] or self.left[self.right[x]] != x:
+                        return False
+                    num_children += 1
+                    stack.append(x)
+                    x = self.right[x]
+                    if x == c:
+                        break
+            if num_children != self.degree[u]:
+                return False
+        return count == self.size
+
+
+if __name__ == "__main__":
+
+    import random
+
+    # Same sequence of operations as dijkstra: insert everything, then extract and decrease.
+    random.seed(1)
+    n = 200
+    keys = [0] + [float('inf')] * (n - 1)
+    pq = FibonacciHeap(n, keys)
+    pq.build(range(n))
+    extracted_keys = []
+    while pq.get_size() > 0:
+        u = pq.extract_min()
+        k = pq.get_key(u)
+        extracted_keys.append(k)
+        if not pq.is_heap() or pq.contains(u):
+            print("Heap property broken after extracting", u)
+        if k == float('inf'):
+            continue
+        for v in random.sample(range(n), 5):
+            w = random.randint(0, 9)
+            if pq.contains(v) and k + w < pq.get_key(v):
+                pq.decrease_key(v, k + w)
+                if not pq.is_heap():
+                    print("Heap property broken after decreasing", v)
+    print(extracted_keys == sorted(extracted_keys), len(extracted_keys) == n)
+
+    # Check minimum in empty priority queue.
+    try:
+        pq.extract_min()
+    except RuntimeError as e:
+        print(e)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# landmarks.py
+
+"""ALT search: A* with lower bounds from landmarks and the triangle inequality.
+
+For a landmark L and vertices v and t, the triangle inequality gives
+	dist(v, t) >= dist(L, t) - dist(L, v)  and  dist(v, t) >= dist(v, L) - dist(t, L),
+so distances from and to a few landmarks, computed once, bound the distance
+left to the target from every vertex.  A* uses the largest of these bounds to
+steer the search towards the target, without needing coordinates for the
+vertices.
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from adjacency_list_graph import AdjacencyListGraph
+from single_source_shortest_paths import initialize_single_source
+from dijkstra import dijkstra, make_queue
+
+# Bump when the layout of landmark files changes.
+LANDMARKS_VERSION = 1
+
+# First bytes of every landmark file.
+LANDMARKS_MAGIC = b'LANDMARK'
+
+# Number of landmarks get_landmarks chooses by default.
+NUM_LANDMARKS = 8
+
+
+class LandmarkIndex:
+
+	def __init__(self, landmarks, distances_from, distances_to=None, preprocessing_time=None):
+		"""Initialize an index of distances from and to landmark vertices.
+
+		Arguments:
+		landmarks -- list of landmark vertices
+		distances_from -- list of arrays, distances_from[i][v] is the distance from landmarks[i] to v
+		distances_to -- list of arrays, distances_to[i][v] is the distance from v to landmarks[i];
+		omit for an undirected graph, where it is the same as distances_from
+		preprocessing_time -- optional number of seconds taken to build the index
+		"""
+		self.landmarks = landmarks
+		self.distances_from = distances_from
+		self.distances_to = distances_from if distances_to is None else distances_to
+		self.preprocessing_time = preprocessing_time
+
+	@classmethod
+	def build(cls, G, k):
+		"""Choose k landmarks in graph G and compute their distances.
+
+		Landmarks are chosen far apart: the first is the vertex farthest from
+		vertex 0, and each next one the vertex farthest from all landmarks so far.
+		Landmarks on the edge of the network give the tightest bounds for journeys
+		across it.  Vertices unreachable from the landmarks so far count as
+		farthest, so every part of a disconnected graph gets a landmark.
+		"""
+		start_time = time.perf_counter()
+		card_V = G.get_card_V()
+		k = min(k, card_V)
+		reverse = None if not G.is_directed() else reverse_graph(G)
+
+		landmarks, distances_from, distances_to = [], [], []
+		nearest = dijkstra(G, 0)[0] if card_V > 0 else []  # distance to the nearest landmark
+		while len(landmarks) < k:
+			landmark = max(range(card_V), key=lambda v: (nearest[v], -v))
+			if landmark in landmarks:
+				break  # every vertex is a landmark already
+			landmarks.append(landmark)
+			d_from = dijkstra(G, landmark)[0]
+			distances_from.append(array('d', d_from))
+			if reverse is not None:
+				distances_to.append(array('d', dijkstra(reverse, landmark)[0]))
+			nearest = d_from if len(landmarks) == 1 else [min(a, b) for a, b in zip(nearest, d_from)]
+
+		return cls(landmarks, distances_from, distances_to if reverse is not None else None,
+				   time.perf_counter() - start_time)
+
+	def is_directed(self):
+		"""Return True if distances to the landmarks are stored separately from distances from them."""
+		return self.distances_to is not self.distances_from
+
+	def get_memory_per_landmark(self):
+		"""Return the number of bytes of distances stored for each landmark."""
+		if not self.landmarks:
+			return 0
+		arrays = self.distances_from + (self.distances_to if self.is_directed() else [])
+		return sum(a.itemsize * len(a) for a in arrays) // len(self.landmarks)
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the distance from v to t.  Landmarks that
+		cannot reach v or t, or be reached from them, give no bound."""
+		bound = 0
+		inf = float('inf')
+		for d_from, d_to in zip(self.distances_from, self.distances_to):
+			d_lt, d_lv, d_vl, d_tl = d_from[t], d_from[v], d_to[v], d_to[t]
+			if d_lt != inf and d_lv != inf and d_lt - d_lv > bound:
+				bound = d_lt - d_lv
+			if d_vl != inf and d_tl != inf and d_vl - d_tl > bound:
+				bound = d_vl - d_tl
+		return bound
+
+	def save(self, file_path, source_hash):
+		"""Write the index to a binary file, tagged with the hash of the file the graph was built from.
+
+		The file is a JSON header followed by the distance arrays as raw
+		little-endian doubles, like the graph snapshots in Graph.py.
+		"""
+		arrays = self.distances_from + (self.distances_to if self.is_directed() else [])
+		header = json.dumps({
+			'source_hash': source_hash,
+			'landmarks': self.landmarks,
+			'directed': self.is_directed(),
+			'card_V': len(arrays[0]) if arrays else 0,
+			'preprocessing_time': self.preprocessing_time,
+		}).encode('utf-8')
+		# Write to a temporary file first so that readers never see half an index.
+		temp_path = file_path + '.tmp'
+		with open(temp_path, 'wb') as f:
+			f.write(LANDMARKS_MAGIC)
+			f.write(struct.pack('<II', LANDMARKS_VERSION, len(header)))
+			f.write(header)
+			for values in arrays:
+				if sys.byteorder != 'little':
+					values = array(values.typecode, values)
+					values.byteswap()
+				f.write(values.tobytes())
+		os.replace(temp_path, file_path)
+
+	@classmethod
+	def load(cls, file_path, source_hash, k=None):
+		"""Return the index stored by save, or None if there is no file, it was
+		made from a different source file, or it has a different number of landmarks."""
+		try:
+			with open(file_path, 'rb') as f:
+				data = f.read()
+			position = len(LANDMARKS_MAGIC)
+			if data[:position] != LANDMARKS_MAGIC:
+				return None
+			version, header_size = struct.unpack_from('<II', data, position)
+			if version != LANDMARKS_VERSION:
+				return None
+			position += struct.calcsize('<II')
+			header = json.loads(data[position:position + header_size].decode('utf-8'))
+			if header['source_hash'] != source_hash or (k is not None and len(header['landmarks']) != k):
+				return None
+			position += header_size
+
+			num_arrays = len(header['landmarks']) * (2 if header['directed'] else 1)
+			arrays = []
+			for _ in range(num_arrays):
+				values = array('d')
+				end = position + header['card_V'] * values.itemsize
+				values.frombytes(data[position:end])
+				if sys.byteorder != 'little':
+					values.byteswap()
+				arrays.append(values)
+				position = end
+			if position != len(data):
+				return None
+			num_landmarks = len(header['landmarks'])
+			distances_to = arrays[num_landmarks:] if header['directed'] else None
+			return cls(header['landmarks'], arrays[:num_landmarks], distances_to, header['preprocessing_time'])
+		except (OSError, ValueError, KeyError, TypeError, struct.error):
+			return None
+
+
+def get_landmarks_path(station_graph):
+	"""Return the path of the file get_landmarks caches a station graph's landmarks in."""
+	return station_graph.file_path + os.path.splitext(station_graph.snapshot_suffix)[0] + '.landmarks'
+
+
+def get_landmarks(station_graph, k=NUM_LANDMARKS, use_cache=True):
+	"""Return a LandmarkIndex with k landmarks for a Graph_journey_duration or
+	Graph_count_stations.
+
+	If use_cache is True, the index is loaded from a file next to the graph's
+	source file when it was made from the same contents with the same number of
+	landmarks, and built and saved there otherwise, as the graph snapshots are.
+	"""
+	from Graph import file_hash
+	file_path = get_landmarks_path(station_graph)
+	if use_cache:
+		source_hash = file_hash(station_graph.file_path)
+		index = LandmarkIndex.load(file_path, source_hash, k)
+		if index is not None:
+			return index
+	index = LandmarkIndex.build(station_graph.graph, k)
+	if use_cache:
+		try:
+			index.save(file_path, source_hash)
+		except OSError:
+			pass  # the file is only a cache
+	return index
+
+
+def reverse_graph(G):
+	"""Return an AdjacencyListGraph with every edge of the directed graph G reversed."""
+	reverse = AdjacencyListGraph(G.get_card_V(), True, True)
+	for u in range(G.get_card_V()):
+		for edge in G.get_adj_list(u):
+			existing = reverse.find_edge(edge.get_v(), u)
+			if existing is None:
+				reverse.insert_edge(edge.get_v(), u, edge.get_weight())
+			else:
+				existing.set_weight(min(existing.get_weight(), edge.get_weight()))  # keep the lightest parallel edge
+	return reverse
+
+
+def alt_search(G, s, t, landmarks, queue_type='binary'):
+	"""Find a shortest path from s to t with A* search, using the lower bounds
+	from a LandmarkIndex as the estimate of the distance left to t.
+
+	Vertices are taken from the priority queue in order of d[v] plus the bound
+	from v to t, so the search heads for t instead of growing a ball around s,
+	and it stops as soon as t is extracted.
+
+	Arguments:
+	G -- a weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of source vertex
+	t -- index of target vertex
+	landmarks -- a LandmarkIndex built for G
+	queue_type -- priority queue to use, as for dijkstra.make_queue, except
+	'dial', and 'auto', which may choose it: its keys here can run up to twice
+	the largest weight ahead of the last one extracted, more than its buckets hold
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from s; d[t] and the d values of the vertices on the path
+	are exact, the rest only upper bounds
+	pi -- predecessors, so that following pi back from t gives a shortest path
+	num_settled -- number of vertices extracted from the priority queue
+	"""
+	if queue_type in ('dial', 'auto'):
+		raise RuntimeError("alt_search cannot use Dial's queue.")
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+	bound = [None] * card_V  # lower bound from each vertex to t, worked out when first reached
+	bound[s] = landmarks.lower_bound(s, t)
+	priority = [float('inf')] * card_V
+	priority[s] = d[s] + bound[s]
+
+	queue = make_queue(G, priority, queue_type)
+	queue.insert(s, priority[s])
+	num_settled = 0
+
+	while queue.get_size() > 0:
+		u = queue.extract_min()
+		num_settled += 1
+		if u == t:
+			break
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			if d[v] > d[u] + edge.get_weight():  # relax edge (u, v)
+				d[v] = d[u] + edge.get_weight()
+				pi[v] = u
+				if bound[v] is None:
+					bound[v] = landmarks.lower_bound(v, t)
+				# With exact landmark distances the bounds never let v be improved once
+				# it has been extracted, but if it is, it goes back into the queue.
+				queue.insert_or_decrease_key(v, d[v] + bound[v])
+
+	return d, pi, num_settled
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	import tempfile
+
+	random.seed(3)
+	for directed in (False, True):
+		card_V = 120
+		G = AdjacencyListGraph(card_V, directed, True)
+		for _ in range(4 * card_V):
+			u, v = random.randrange(card_V), random.randrange(card_V)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, random.randint(0, 20))
+		index = LandmarkIndex.build(G, 6)
+
+		# The bounds must never exceed the true distances, and A* must find them.
+		all_equal = True
+		for s in range(0, card_V, 7):
+			d = dijkstra(G, s)[0]
+			for t in range(card_V):
+				if index.lower_bound(s, t) > d[t]:
+					print("Bound too large from", s, "to", t)
+					all_equal = False
+				alt_d, alt_pi, num_settled = alt_search(G, s, t, index)
+				if alt_d[t] != d[t]:
+					print("Distance mismatch from", s, "to", t)
+					all_equal = False
+		print(("Directed" if directed else "Undirected") + " distances are " + ("" if all_equal else "not ") + "equal")
+
+		# Saving and loading gives the same index.
+		with tempfile.TemporaryDirectory() as temp_dir:
+			file_path = os.path.join(temp_dir, 'test.landmarks')
+			index.save(file_path, 'hash')
+			loaded = LandmarkIndex.load(file_path, 'hash', 6)
+			print(loaded.landmarks == index.landmarks and loaded.distances_to == index.distances_to
+				  and LandmarkIndex.load(file_path, 'other hash') is None)
@@ -0,0 +1,152 @@
+# Turns the connection columns of a table into the integer edge arrays that the
+# graphs in Graph.py are built from.
+import numpy as np
+import pandas as pd
+
+
+def factorize_stations(station_1, station_2):
+    """Number the stations in order of first appearance.
+
+    Arguments:
+    station_1, station_2 -- arrays of station names, one entry per connection
+
+    Returns:
+    stations -- array of unique station names, indexed by station number
+    ids_1, ids_2 -- station numbers for station_1 and station_2
+    """
+    # Same order as pd.concat([station 1, station 2]).unique().
+    codes, stations = pd.factorize(np.concatenate([np.asarray(station_1, dtype=object),
+                                                   np.asarray(station_2, dtype=object)]))
+    return stations, codes[:len(station_1)], codes[len(station_1):]
+
+
+def unique_connections(ids_1, ids_2, card_V):
+    """Group the connections by pair of stations.
+
+    A connection (a, b) is a duplicate of an earlier (a, b) or (b, a).
+
+    Returns:
+    first_rows -- row positions of the first connection seen between each
+    pair of stations, in their original order
+    groups -- for each row, the index in first_rows of its pair of stations
+    """
+    ids_1 = np.asarray(ids_1, dtype=np.int64)
+    ids_2 = np.asarray(ids_2, dtype=np.int64)
+    # One integer key per unordered pair of stations.
+    pair_keys = np.minimum(ids_1, ids_2) * card_V + np.maximum(ids_1, ids_2)
+    # Groups are numbered in order of first appearance, just like first_rows.
+    groups = pd.factorize(pair_keys)[0]
+    return np.flatnonzero(~pd.Index(pair_keys).duplicated(keep='first')), groups
+
+
+def line_bitsets(groups, line_codes, num_edges, num_lines):
+    """Return a uint8 array with one row of num_lines bits per edge, where bit c
+    of row e is set when a connection in group e is on the tube line with code c."""
+    line_bits = np.zeros((num_edges, max(1, (num_lines + 7) // 8)), dtype=np.uint8)
+    line_codes = np.asarray(line_codes, dtype=np.int64)
+    np.bitwise_or.at(line_bits, (groups, line_codes // 8), np.left_shift(1, line_codes % 8).astype(np.uint8))
+    return line_bits
+
+
+def compile_network(station_1, station_2, weights, lines, valid=None):
+    """Turn the connection columns into integer edge arrays.
+
+    Arguments:
+    station_1, station_2 -- arrays of station names
+    weights -- array of edge weights
+    lines -- array of tube line names
+    valid -- optional boolean array of the rows to build edges from; stations
+    on every row are still numbered
+
+    Returns:
+    stations -- array of unique station names, indexed by station number
+    edge_u, edge_v -- station numbers of the endpoints of each edge
+    edge_weights -- weight of each edge
+    line_names -- array of unique tube line names, indexed by line code
+    edge_lines -- code of the first tube line seen on each edge
+    edge_line_bits -- bitsets of the codes of every tube line on each edge,
+    as returned by line_bitsets
+    """
+    stations, ids_1, ids_2 = factorize_stations(station_1, station_2)
+    rows = np.arange(len(ids_1))
+    if valid is not None:
+        rows = rows[np.asarray(valid, dtype=bool)]
+    # Intern the tube line names as small integer codes.
+    line_codes, line_names = pd.factorize(np.asarray(lines, dtype=object)[rows], use_na_sentinel=False)
+    # Keep the first row for each pair of stations, just like a has_edge check would,
+    # but remember the lines of all of them.
+    first_rows, groups = unique_connections(ids_1[rows], ids_2[rows], len(stations))
+    edge_line_bits = line_bitsets(groups, line_codes, len(first_rows), len(line_names))
+    rows = rows[first_rows]
+    return (stations, ids_1[rows], ids_2[rows], np.asarray(weights)[rows],
+            np.asarray(line_names, dtype=object), line_codes[first_rows], edge_line_bits)
+
+
+class NetworkBuilder:
+    """Compile connection columns that arrive in chunks into the arrays returned
+    by compile_network, without keeping the rows themselves."""
+
+    def __init__(self):
+        # Station names and tube lines get provisional numbers in order of arrival.
+        self.station_ids = {}
+        self.line_codes = {}
+        # Row where each provisional station first appears in each column.
+        self.first_row_1 = np.empty(0, dtype=np.int64)
+        self.first_row_2 = np.empty(0, dtype=np.int64)
+        self.num_rows = 0
+        # Edge arrays of each chunk, using provisional numbers.
+        self.chunks = []
+
+    def add_chunk(self, station_1, station_2, weights, lines, valid=None):
+        """Add a chunk of connection columns; arguments as for compile_network."""
+        # Number the chunk's stations, then translate to provisional numbers.
+        chunk_stations, ids_1, ids_2 = factorize_stations(station_1, station_2)
+        provisional = np.array([self.station_ids.setdefault(name, len(self.station_ids))
+                                for name in chunk_stations], dtype=np.int64)
+        ids_1 = provisional[ids_1]
+        ids_2 = provisional[ids_2]
+
+        # Remember the first row each station is seen on in each column.
+        rows = self.num_rows + np.arange(len(ids_1))
+        self.num_rows += len(ids_1)
+        missing = len(self.station_ids) - len(self.first_row_1)
+        self.first_row_1 = np.concatenate([self.first_row_1, np.full(missing, -1, dtype=np.int64)])
+        self.first_row_2 = np.concatenate([self.first_row_2, np.full(missing, -1, dtype=np.int64)])
+        for first_row, ids in ((self.first_row_1, ids_1), (self.first_row_2, ids_2)):
+            first = np.flatnonzero(~pd.Index(ids).duplicated(keep='first'))
+            new = first[first_row[ids[first]] < 0]
+            first_row[ids[new]] = rows[new]
+
+        keep = np.arange(len(ids_1))
+        if valid is not None:
+            keep = keep[np.asarray(valid, dtype=bool)]
+        line_codes = np.array([self.line_codes.setdefault(line, len(self.line_codes))
+                               for line in np.asarray(lines, dtype=object)[keep]], dtype=np.int64)
+        self.chunks.append((ids_1[keep], ids_2[keep], np.asarray(weights)[keep], line_codes))
+
+    def compile(self):
+        """Return the arrays returned by compile_network for all chunks added so far."""
+        card_V = len(self.station_ids)
+        # Same order as pd.concat([station 1, station 2]).unique(): stations seen in
+        # the station 1 column first, then the rest in order of their first station 2 row.
+        order_keys = np.where(self.first_row_1 >= 0, self.first_row_1, self.num_rows + self.first_row_2)
+        order = np.argsort(order_keys, kind='stable')
+        renumber = np.empty(card_V, dtype=np.int64)
+        renumber[order] = np.arange(card_V)
+        stations = np.empty(card_V, dtype=object)
+        stations[renumber[list(self.station_ids.values())]] = list(self.station_ids.keys())
+
+        if self.chunks:
+            ids_1, ids_2, weights, line_codes = (np.concatenate(column) for column in zip(*self.chunks))
+        else:
+            ids_1 = ids_2 = line_codes = np.empty(0, dtype=np.int64)
+            weights = np.empty(0)
+        ids_1, ids_2 = renumber[ids_1], renumber[ids_2]
+        # Keep the first row for each pair of stations, just like a has_edge check would,
+        # but remember the lines of all of them.
+        first_rows, groups = unique_connections(ids_1, ids_2, card_V)
+        line_names = np.empty(len(self.line_codes), dtype=object)
+        line_names[list(self.line_codes.values())] = list(self.line_codes.keys())
+        edge_line_bits = line_bitsets(groups, line_codes, len(first_rows), len(line_names))
+        return (stations, ids_1[first_rows], ids_2[first_rows], weights[first_rows],
+                line_names, line_codes[first_rows], edge_line_bits)
@@ -10,12 +10,8 @@ class StationLineFinder:
 
     # Method to find the full name of a station given a partial or case-insensitive name.
     def find_station_name(self, station_name):
-        # Iterate over all stations in the graph.
-        for real_name in self.graph.stations:
-            # Check if the provided station name matches (ignoring case) with any real station name.
-            if station_name.lower() == real_name.lower():
-                return real_name  # Return the matching real station name.
-        return None  # If no match is found, return None.
+        # Look the name up in the station index, ignoring case.
+        return self.graph.station_index.find_name(station_name)
 
     # Method to get the index of a station from the user input.
     def get_station_index(self, station_name_prompt):
@@ -24,13 +20,13 @@ class StationLineFinder:
             matched_station = self.find_station_name(station_name)  # Find the full station name.
             if matched_station:
                 # If a matching station is found, return its index from the graph.
-                return self.graph.station_to_int[matched_station]
+                return self.graph.station_index.get_id(matched_station)
             print("Station not found. Please check the name and try again.")  # Error message if not found.
 
     # Method to get the tube line connecting two stations.
-    def get_tube_line(self, station1, station2):
-        # Check the tube_lines dictionary for a direct or reverse tuple of the stations.
-        return self.graph.tube_lines.get((station1, station2)) or self.graph.tube_lines.get((station2, station1))
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        # Return the tube line connecting the two stations (in either direction), keeping to preferred_line if it also connects them.
+        return self.graph.get_tube_line(station1, station2, preferred_line)
 
 # Define a class for finding the shortest path between two stations.
 class ShortestPathFinder():
@@ -48,7 +44,8 @@ class ShortestPathFinder():
         distances, predecessors = dijkstra(self.station_finder.graph.graph, source_index)
 
         # Initialize a path list starting from the destination station.
-        path = [self.station_finder.graph.int_to_station[destination_index]]
+        station_index = self.station_finder.graph.station_index  # Converts station numbers back to names.
+        path = [station_index.get_name(destination_index)]
         current_station = destination_index  # Start from the destination station.
         previous_line = None  # Initialize the previous line as None.
 
@@ -59,14 +56,14 @@ class ShortestPathFinder():
 
             # If there is a line change, add a message to the path list.
             if previous_line is not None and line != previous_line:
-                path.insert(1, f"(Switch to {previous_line} line at {self.station_finder.graph.int_to_station[current_station]})")
+                path.insert(1, f"(Switch to {previous_line} line at {station_index.get_name(current_station)})")
 
             current_station = next_station  # Update the current station.
-            path.insert(0, self.station_finder.graph.int_to_station[current_station])  # Add the current station to the path.
+            path.insert(0, station_index.get_name(current_station))  # Add the current station to the path.
             previous_line = line  # Update the previous line.
 
         # Print the shortest path and total travel time.
-        print("Shortest path:", "Go on", line, "line in", self.station_finder.graph.int_to_station[source_index], "-->", " -> ".join(path))
+        print("Shortest path:", "Go on", line, "line in", station_index.get_name(source_index), "-->", " -> ".join(path))
         print(f"Total travel time: {distances[destination_index]} minutes")
 
 # Main execution block.
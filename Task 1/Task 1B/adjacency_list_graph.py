@@ -30,22 +30,24 @@
 #                                                                       #
 #########################################################################
 
-from dll_sentinel import DLLSentinel
-from adjacency_matrix_graph import AdjacencyMatrixGraph
+from dll_sentinel import DLLSentinel, LinkedListNode, CompactLinkedListNode
 
 
 class Edge:
 
-	def __init__(self, v, weight=None):
+	def __init__(self, v, weight=None, label=None):
 		"""Initialize an edge to add to the adjacency list of another vertex.
 
 		Arguments:
 		v -- the other vertex that the edge is incident on
 		weight -- optional parameter for weighted graphs
+		label -- optional value stored with the edge, such as a set of line codes
 		"""
 		self.v = v
 		if weight is not None:
 			self.weight = weight
+		if label is not None:
+			self.label = label
 
 	def get_v(self):
 		"""Return the vertex index."""
@@ -59,6 +61,10 @@ class Edge:
 		"""Set the weight of this edge."""
 		self.weight = weight
 
+	def get_label(self):
+		"""Return the label of this edge, None if it has none."""
+		return getattr(self, "label", None)
+
 	def __str__(self):
 		"""String version of the vertex with optional weight in parentheses."""
 		return self.strmap(lambda v: v)
@@ -72,9 +78,55 @@ class Edge:
 		return string
 
 
+class CompactEdge:
+	# Fixed slots instead of a per-instance __dict__; weight and label are
+	# always present and are None when not used.
+	__slots__ = ('v', 'weight', 'label')
+
+	def __init__(self, v, weight=None, label=None):
+		"""Initialize an edge to add to the adjacency list of another vertex.
+
+		Arguments:
+		v -- the other vertex that the edge is incident on
+		weight -- optional parameter for weighted graphs
+		label -- optional value stored with the edge, such as a set of line codes
+		"""
+		self.v = v
+		self.weight = weight
+		self.label = label
+
+	def get_v(self):
+		"""Return the vertex index."""
+		return self.v
+
+	def get_weight(self):
+		"""Return the weight of this edge."""
+		return self.weight
+
+	def set_weight(self, weight):
+		"""Set the weight of this edge."""
+		self.weight = weight
+
+	def get_label(self):
+		"""Return the label of this edge, None if it has none."""
+		return self.label
+
+	def __str__(self):
+		"""String version of the vertex with optional weight in parentheses."""
+		return self.strmap(lambda v: v)
+
+	def strmap(self, mapping_func):
+		"""String version of the vertex with optional weight in parentheses.
+		Vertex numbers are mapped according to a mapping function."""
+		string = str(mapping_func(self.v))
+		if self.weight is not None:
+			string += " (" + str(self.weight) + ")"
+		return string
+
+
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, indexed=False, compact=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,13 +134,29 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether to keep, for each vertex, a dictionary
+		mapping each neighbor to its linked-list node, so that find_edge,
+		has_edge and delete_edge take O(1) expected time instead of a linear search
+		compact -- boolean indicating whether to store edges as CompactEdge objects
+		in CompactLinkedListNode nodes, which have no per-instance dictionaries
 		"""
 		self.directed = directed
 		self.weighted = weighted
+		self.compact = compact
+		if compact:
+			self.edge_class, node_class = CompactEdge, CompactLinkedListNode
+		else:
+			self.edge_class, node_class = Edge, LinkedListNode
 		self.adj_lists = [None] * card_V
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
-			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+			# Will be a list of Edge (or CompactEdge) objects.
+			self.adj_lists[i] = DLLSentinel(self.edge_class.get_v, node_class)
+		if indexed:
+			# edge_index[u][v] is the node holding edge (u, v) in adj_lists[u].
+			self.edge_index = [{} for i in range(card_V)]
+		else:
+			self.edge_index = None
 		self.card_V = card_V
 		self.card_E = 0
 
@@ -116,12 +184,28 @@ class AdjacencyListGraph:
 		"""Return a boolean indicating whether this graph is weighted."""
 		return self.weighted
 
-	def insert_edge(self, u, v, weight=None):
+	def is_compact(self):
+		"""Return a boolean indicating whether this graph stores compact edges."""
+		return self.compact
+
+	def is_indexed(self):
+		"""Return a boolean indicating whether this graph keeps a neighbor index."""
+		return self.edge_index is not None
+
+	def append_edge(self, u, v, weight, label=None):
+		"""Append an edge (u, v) to the adjacency list of u, keeping the neighbor index up to date."""
+		node = self.adj_lists[u].append(self.edge_class(v, weight, label))
+		if self.edge_index is not None:
+			self.edge_index[u][v] = node
+
+	def insert_edge(self, u, v, weight=None, label=None):
 		"""Insert an edge between vertices u and v.
 
 		Arguments:
 		u -- index of vertex u
 		v -- index of vertex v
+		weight -- weight of the edge, required for weighted graphs
+		label -- optional value stored with the edge
 		"""
 		# Check whether a weight is missing, or whether a weight is given in an unweighted graph.
 		if self.weighted:
@@ -138,7 +222,7 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		self.append_edge(u, v, weight, label)
 		self.card_E += 1
 
 		# If this graph is undirected, insert an edge from v to u.
@@ -146,16 +230,56 @@ class AdjacencyListGraph:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			self.append_edge(v, u, weight, label)
+
+	def insert_edges(self, us, vs, weights=None, labels=None):
+		"""Insert a batch of edges (us[i], vs[i]) in O(|batch|) time.
+
+		Unlike insert_edge, this does not search the adjacency lists for an
+		existing edge, so the caller must make sure that no edge in the batch is
+		already in the graph and that the batch holds no duplicates (for an
+		undirected graph, (u, v) and (v, u) count as duplicates).
+
+		Arguments:
+		us -- sequence of indices of the first endpoints
+		vs -- sequence of indices of the second endpoints
+		weights -- sequence of edge weights, required for weighted graphs
+		labels -- optional sequence of values stored with the edges
+		"""
+		if self.weighted:
+			if weights is None:
+				raise RuntimeError("Inserting unweighted edges in weighted graph.")
+		else:  # unweighted
+			if weights is not None:
+				raise RuntimeError("Inserting weighted edges in unweighted graph.")
+			weights = [None] * len(us)
+		if labels is None:
+			labels = [None] * len(us)
+
+		for u, v, weight, label in zip(us, vs, weights, labels):
+			# An undirected graph cannot have self-loops.
+			if not self.directed and u == v:
+				raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+			self.append_edge(u, v, weight, label)
+			self.card_E += 1
+			# If this graph is undirected, insert an edge from v to u.
+			if not self.directed:
+				self.append_edge(v, u, weight, label)
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_node(u, v)
 		if edge is None:
 			return None
 		else:
 			return edge.data
 
+	def find_node(self, u, v):
+		"""Return the linked-list node holding edge (u, v) if (u, v) is in this graph, None otherwise."""
+		if self.edge_index is not None:
+			return self.edge_index[u].get(v)
+		return self.adj_lists[u].search(v)
+
 	def has_edge(self, u, v):
 		"""Return True if edge (u, v) is in this graph, False otherwise."""
 		return self.find_edge(u, v) is not None
@@ -163,22 +287,32 @@ class AdjacencyListGraph:
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_node(u, v)
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
+			if self.edge_index is not None:
+				del self.edge_index[u][v]
 			self.card_E -= 1
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
+			edge = self.find_node(v, u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				if self.edge_index is not None:
+					del self.edge_index[v][u]
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed(), self.compact)
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
 			copy.adj_lists[u] = self.adj_lists[u].copy()
+			if copy.edge_index is not None:
+				# Point the index at the copy's own nodes.
+				node = copy.adj_lists[u].sentinel.next
+				while node is not copy.adj_lists[u].sentinel:
+					copy.edge_index[u][node.data.get_v()] = node
+					node = node.next
 		return copy
 
 	def get_edge_list(self):
@@ -194,7 +328,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed(), self.compact)
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -203,11 +337,12 @@ class AdjacencyListGraph:
 					weight = edge.get_weight()
 				else:
 					weight = None
-				xpose.insert_edge(v, u, weight)
+				xpose.insert_edge(v, u, weight, edge.get_label())
 		return xpose
 
 	def adjacency_matrix(self):
 		"""Return the adjacency-matrix representation of this graph."""
+		from adjacency_matrix_graph import AdjacencyMatrixGraph  # imports numpy, so only when needed
 		card_V = self.get_card_V()
 		matrix = AdjacencyMatrixGraph(card_V, self.directed, self.weighted)
 		weight_func = lambda edge: edge.get_weight() if self.weighted else None
@@ -292,6 +427,27 @@ if __name__ == "__main__":
 	print(graph3)
 	print(graph3.get_card_E())
 
+	# Indexed graphs give the same answers as linear searches.
+	graph4 = AdjacencyListGraph(10, directed=False, indexed=True)
+	for i in range(0, len(array1) - 1, 2):
+		try:
+			graph4.insert_edge(array1[i], array1[i + 1])
+		except RuntimeError as e:
+			print(e)
+	graph5 = graph4.copy()
+	graph5.delete_edge(*graph5.get_edge_list()[0])
+	print(all(graph4.has_edge(u, v) == graph2.has_edge(u, v) for u in range(10) for v in range(10)))
+	print(all(graph5.has_edge(u, v) == (graph5.adj_lists[u].search(v) is not None) for u in range(10) for v in range(10)))
+
+	# Compact graphs print the same as regular ones.
+	graph6 = AdjacencyListGraph(10, directed=False, compact=True)
+	for i in range(0, len(array1) - 1, 2):
+		try:
+			graph6.insert_edge(array1[i], array1[i + 1])
+		except RuntimeError as e:
+			print(e)
+	print(str(graph6) == str(graph2))
+
 	# Inserting weighted and unweighted.
 	graph3 = AdjacencyListGraph(10, True, True)
 	try:  # insert unweighted into weighted
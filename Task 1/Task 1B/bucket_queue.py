@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# bucket_queue.py
+
+"""Monotone minimum priority queues for whole-number keys, such as Dijkstra's
+distances when every edge weight is a nonnegative integer number of minutes or
+stations.  Both queues take the items 0 to n-1 and have the same interface as
+IndexedMinHeap.
+
+A queue is monotone when no key inserted or decreased is smaller than the key
+last extracted, which always holds in Dijkstra's algorithm.  Items may be
+inserted with an infinite key; they come out last, in no particular order.
+
+Decreasing a key leaves a stale entry behind in the item's old bucket instead
+of searching for it.  Stale entries are dropped when they are reached.
+"""
+
+
+class DialQueue:
+
+    def __init__(self, n, max_weight):
+        """Initialize an empty Dial's bucket queue for the items 0 to n-1.
+
+        Every finite key in the queue is at most max_weight more than the key last
+        extracted, so a circular array of max_weight + 1 buckets, one per key,
+        holds them all.  Extraction scans forward from the last key extracted.
+
+        Arguments:
+        n -- number of possible items
+        max_weight -- largest edge weight, a nonnegative integer
+        """
+        self.num_buckets = int(max_weight) + 1
+        self.buckets = [[] for _ in range(self.num_buckets)]
+        self.keys = [float('inf')] * n
+        self.in_queue = [False] * n
+        self.infinite = []          # items inserted with an infinite key
+        self.size = 0               # number of items in the queue
+        self.num_finite = 0         # number of those with a finite key
+        self.current = 0            # key of the bucket the scan has reached
+
+    def get_size(self):
+        """Return the number of items in the priority queue."""
+        return self.size
+
+    def contains(self, v):
+        """Return True if item v is in the priority queue."""
+        return self.in_queue[v]
+
+    def get_key(self, v):
+        """Return the key of item v."""
+        return self.keys[v]
+
+    def place(self, v, k):
+        """Put item v in the bucket for key k."""
+        if k == float('inf'):
+            self.infinite.append(v)
+            return
+        k = int(k)
+        if self.num_finite == 0 and k - self.current >= self.num_buckets:
+            self.current = k  # the queue is empty, so start the scan at k
+        elif k < self.current or k - self.current >= self.num_buckets:
+            raise RuntimeError("Key " + str(k) + " is outside the range of the bucket queue, "
+                               + str(self.current) + " to " + str(self.current + self.num_buckets - 1) + ".")
+        self.keys[v] = k
+        self.num_finite += 1
+        self.buckets[k % self.num_buckets].append(v)
+
+    def insert(self, v, k=None):
+        """Insert item v, with key k if given, otherwise with its current key."""
+        if self.in_queue[v]:
+            raise RuntimeError("Error in insert: item " + str(v) + " is already in the queue.")
+        if k is None:
+            k = self.keys[v]
+        self.in_queue[v] = True
+        self.size += 1
+        self.keys[v] = k
+        self.place(v, k)
+
+    def build(self, items, keys=None):
+        """Insert items, with keys from the list keys, indexed by item, if given,
+        otherwise with their current keys.  Each insert already takes O(1) time."""
+        for v in items:
+            self.insert(v, None if keys is None else keys[v])
+
+    def decrease_key(self, v, k):
+        """Decrease the key of item v to k.  Error if k is greater than v's current key."""
+        if k > self.keys[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[v]))
+        if k == self.keys[v]:
+            return
+        if self.keys[v] != float('inf'):
+            self.num_finite -= 1  # the old entry is now stale
+        self.place(v, k)
+
+    def insert_or_decrease_key(self, v, k):
+        """Insert item v with key k, or decrease its key to k if it is already in the queue."""
+        old_key = self.keys[v]
+        # Dijkstra's usual case, a smaller key in range, is handled here without further calls.
+        if self.in_queue[v] and k < old_key and self.current <= k < self.current + self.num_buckets:
+            if old_key == float('inf'):
+                self.num_finite += 1
+            k = int(k)
+            self.keys[v] = k
+            self.buckets[k % self.num_buckets].append(v)
+        elif self.in_queue[v]:
+            self.decrease_key(v, k)
+        else:
+            self.insert(v, k)
+
+    def find_min(self):
+        """Drop stale entries and return the list whose last entry is the item with the minimum key."""
+        if self.size == 0:
+            raise RuntimeError("Heap underflow.")
+        keys, in_queue = self.keys, self.in_queue
+        if self.num_finite == 0:
+            infinite = self.infinite
+            while not (in_queue[infinite[-1]] and keys[infinite[-1]] == float('inf')):
+                infinite.pop()
+            return infinite
+        buckets, num_buckets = self.buckets, self.num_buckets
+        current = self.current
+        while True:
+            bucket = buckets[current % num_buckets]
+            while bucket:
+                v = bucket[-1]
+                if in_queue[v] and keys[v] == current:
+                    self.current = current
+                    return bucket
+                bucket.pop()  # stale entry
+            current += 1
+
+    def minimum(self):
+        """Return the item with the minimum key."""
+        return self.find_min()[-1]
+
+    def extract_min(self):
+        """Return and delete the item with the minimum key."""
+        v = self.find_min().pop()
+        self.in_queue[v] = False
+        self.size -= 1
+        if self.keys[v] != float('inf'):
+            self.num_finite -= 1
+        return v
+
+
+class RadixHeap:
+
+    def __init__(self, n):
+        """Initialize an empty radix heap for the items 0 to n-1.
+
+        Bucket i holds the entries whose key first differs from the key last
+        extracted in bit i-1, and bucket 0 those equal to it.  When bucket 0 runs
+        out, the first nonempty bucket is spread over the lower buckets around its
+        minimum key.  Each entry moves down at most once per bit, so unlike Dial's
+        queue the cost grows with the logarithm of the weights, not the weights.
+
+        Arguments:
+        n -- number of possible items
+        """
+        self.buckets = [[]]
+        self.keys = [float('inf')] * n
+        self.in_queue = [False] * n
+        self.infinite = []          # items inserted with an infinite key
+        self.size = 0               # number of items in the queue
+        self.num_finite = 0         # number of those with a finite key
+        self.last = 0               # key last extracted
+
+    def get_size(self):
+        """Return the number of items in the priority queue."""
+        return self.size
+
+    def contains(self, v):
+        """Return True if item v is in the priority queue."""
+        return self.in_queue[v]
+
+    def get_key(self, v):
+        """Return the key of item v."""
+        return self.keys[v]
+
+    def place(self, v, k):
+        """Put item v in the bucket for key k."""
+        if k == float('inf'):
+            self.infinite.append(v)
+            return
+        k = int(k)
+        if k < self.last:
+            raise RuntimeError("Key " + str(k) + " is less than the key last extracted, " + str(self.last) + ".")
+        self.keys[v] = k
+        self.num_finite += 1
+        i = (k ^ self.last).bit_length()
+        while i >= len(self.buckets):
+            self.buckets.append([])
+        self.buckets[i].append((k, v))
+
+    def insert(self, v, k=None):
+        """Insert item v, with key k if given, otherwise with its current key."""
+        if self.in_queue[v]:
+            raise RuntimeError("Error in insert: item " + str(v) + " is already in the queue.")
+        if k is None:
+            k = self.keys[v]
+        self.in_queue[v] = True
+        self.size += 1
+        self.keys[v] = k
+        self.place(v, k)
+
+    def build(self, items, keys=None):
+        """Insert items, with keys from the list keys, indexed by item, if given,
+        otherwise with their current keys.  Each insert already takes O(1) time."""
+        for v in items:
+            self.insert(v, None if keys is None else keys[v])
+
+    def decrease_key(self, v, k):
+        """Decrease the key of item v to k.  Error if k is greater than v's current key."""
+        if k > self.keys[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[v]))
+        if k == self.keys[v]:
+            return
+        if self.keys[v] != float('inf'):
+            self.num_finite -= 1  # the old entry is now stale
+        self.place(v, k)
+
+    def insert_or_decrease_key(self, v, k):
+        """Insert item v with key k, or decrease its key to k if it is already in the queue."""
+        if self.in_queue[v]:
+            self.decrease_key(v, k)
+        else:
+            self.insert(v, k)
+
+    def find_min(self):
+        """Drop stale entries and return the list whose last entry holds the item with the minimum key."""
+        if self.size == 0:
+            raise RuntimeError("Heap underflow.")
+        keys, in_queue = self.keys, self.in_queue
+        if self.num_finite == 0:
+            infinite = self.infinite
+            while not (in_queue[infinite[-1]] and keys[infinite[-1]] == float('inf')):
+                infinite.pop()
+            return infinite
+        buckets = self.buckets
+        while True:
+            bucket = buckets[0]
+            while bucket:
+                k, v = bucket[-1]
+                if in_queue[v] and keys[v] == k:
+                    return bucket
+                bucket.pop()  # stale entry
+            # Bucket 0 is empty, so spread the first bucket with a live entry around its minimum.
+            i = 1
+            while True:
+                live = [(k, v) for k, v in buckets[i] if in_queue[v] and keys[v] == k]
+                buckets[i] = []
+                if live:
+                    break
+                i += 1
+            last = min(k for k, v in live)
+            self.last = last
+            for k, v in live:
+                buckets[(k ^ last).bit_length()].append((k, v))
+
+    def minimum(self):
+        """Return the item with the minimum key."""
+        entry = self.find_min()[-1]
+        return entry if self.num_finite == 0 else entry[1]
+
+    def extract_min(self):
+        """Return and delete the item with the minimum key."""
+        entry = self.find_min().pop()
+        v = entry if self.num_finite == 0 else entry[1]
+        self.in_queue[v] = False
+        self.size -= 1
+        if self.keys[v] != float('inf'):
+            self.num_finite -= 1
+        return v
+
+
+if __name__ == "__main__":
+
+    import random
+
+    # Run the same monotone sequence of operations through both queues and a sorted check.
+    for queue_class in (DialQueue, RadixHeap):
+        random.seed(2)
+        n = 200
+        max_weight = 9
+        queue = DialQueue(n, max_weight) if queue_class is DialQueue else RadixHeap(n)
+        keys = [0] + [float('inf')] * (n - 1)
+        queue.build(range(n), keys)
+        extracted_keys = []
+        while queue.get_size() > 0:
+            u = queue.extract_min()
+            k = queue.get_key(u)
+            extracted_keys.append(k)
+            if k == float('inf'):
+                continue
+            for v in random.sample(range(n), 5):
+                w = random.randint(0, max_weight)
+                if queue.contains(v) and k + w < queue.get_key(v):
+                    queue.decrease_key(v, k + w)
+        print(queue_class.__name__, extracted_keys == sorted(extracted_keys), len(extracted_keys) == n)
+
+    # A key below the last one extracted breaks monotonicity.
+    queue = RadixHeap(3)
+    queue.insert(0, 5)
+    queue.extract_min()
+    try:
+        queue.insert(1, 4)
+    except RuntimeError as e:
+        print(e)
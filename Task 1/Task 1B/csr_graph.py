@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+import json
+import struct
+from adjacency_list_graph import Edge
+
+# Magic bytes and format version at the start of a shared graph file.
+CSR_FILE_MAGIC = b'CSRGRAPH'
+CSR_FILE_VERSION = 1
+# Arrays in a shared graph file start on multiples of this many bytes.
+CSR_FILE_ALIGNMENT = 64
+
+
+class CSRGraph:
+
+	def __init__(self, offsets, targets, weights=None, directed=True):
+		"""Initialize a read-only graph in compressed sparse row (CSR) form.
+		The edges leaving vertex u are targets[offsets[u]:offsets[u + 1]], with
+		weights in the same positions of weights.
+
+		Arguments:
+		offsets -- sequence of card_V + 1 positions into targets, starting at 0
+		targets -- sequence of the vertex each edge enters
+		weights -- optional sequence of edge weights for weighted graphs
+		directed -- boolean indicating whether the graph is directed; an
+		undirected graph stores every edge in both directions
+		"""
+		if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(targets):
+			raise RuntimeError("Offsets do not match the number of targets.")
+		if weights is not None and len(weights) != len(targets):
+			raise RuntimeError("Number of weights does not match the number of targets.")
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+		self.directed = directed
+		self.weighted = weights is not None
+		self.card_V = len(offsets) - 1
+		self.card_E = len(targets) if directed else len(targets) // 2
+		# Optional annotations, filled in by open_csr for shared graph files.
+		self.stations = None    # station names, indexed by vertex
+		self.line_ids = None    # tube line code of each entry of targets
+		self.line_names = None  # tube line names, indexed by code
+		# Largest weight if every weight is a whole number, -1 if not, None until first asked.
+		self._integer_weight_bound = None
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def get_integer_weight_bound(self):
+		"""Return the largest edge weight if every weight is a nonnegative whole
+		number, otherwise None.  Worked out on the first call only, since a
+		CSRGraph never changes."""
+		if self._integer_weight_bound is None:
+			bound = integer_weight_bound(self.weights) if self.weighted else None
+			self._integer_weight_bound = -1 if bound is None else bound
+		return None if self._integer_weight_bound < 0 else self._integer_weight_bound
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u, as Edge objects.
+		Algorithms with a CSR fast path read the arrays directly instead."""
+		for i in range(self.offsets[u], self.offsets[u + 1]):
+			yield Edge(self.targets[i], None if self.weights is None else self.weights[i])
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return self.offsets[u + 1] - self.offsets[u]
+
+	def find_edge(self, u, v):
+		"""Return the position of edge (u, v) in targets if it is in this graph, None otherwise."""
+		for i in range(self.offsets[u], self.offsets[u + 1]):
+			if self.targets[i] == v:
+				return i
+		return None
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_edge(u, v) is not None
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.card_V):
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				v = self.targets[i]
+				if self.directed or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		result = ""
+		for u in range(self.card_V):
+			result += str(u) + ": "
+			for edge in self.get_adj_list(u):
+				result += str(edge) + " "
+			result += "\n"
+		return result
+
+
+def integer_weight_bound(weights):
+	"""Return the largest of a sequence of weights if every weight is a
+	nonnegative whole number, such as 3 or 3.0, otherwise None."""
+	bound = 0
+	for w in weights:
+		if not (w >= 0 and w % 1 == 0):  # also rules out infinity and NaN
+			return None
+		if w > bound:
+			bound = w
+	return int(bound)
+
+
+def freeze(G):
+	"""Return a CSRGraph with the same vertices and edges as the adjacency-list
+	graph G.  Each vertex keeps the order of its adjacency list, so algorithms
+	break ties exactly as they do on G."""
+	card_V = G.get_card_V()
+	offsets = [0] * (card_V + 1)
+	targets = []
+	weights = [] if G.is_weighted() else None
+	for u in range(card_V):
+		for edge in G.get_adj_list(u):
+			targets.append(edge.get_v())
+			if weights is not None:
+				weights.append(edge.get_weight())
+		offsets[u + 1] = len(targets)
+	return CSRGraph(offsets, targets, weights, G.is_directed())
+
+
+def save_csr(file_path, G, stations=None, line_ids=None, line_names=None):
+	"""Write a CSRGraph to a file that other processes can open with open_csr.
+	The arrays are stored raw and aligned, so open_csr maps them into memory
+	instead of reading them, and the operating system shares the pages between
+	every process that opens the same file.
+
+	Arguments:
+	file_path -- path of the file to write
+	G -- a CSRGraph
+	stations -- optional sequence of station names, indexed by vertex
+	line_ids -- optional sequence of tube line codes, one per entry of G.targets
+	line_names -- optional sequence of tube line names, indexed by code
+	"""
+	import numpy as np  # not imported at the top, so dijkstra can import CSRGraph cheaply
+	arrays = {
+		'offsets': np.asarray(G.offsets, dtype=np.int64),
+		'targets': np.asarray(G.targets, dtype=np.int32),
+	}
+	if G.weights is not None:
+		arrays['weights'] = np.asarray(G.weights)
+	if line_ids is not None:
+		arrays['line_ids'] = np.asarray(line_ids, dtype=np.int16)
+	if stations is not None:
+		# Station names are stored as one UTF-8 byte string plus the offset of each name.
+		encoded = [str(name).encode('utf-8') for name in stations]
+		arrays['station_offsets'] = np.cumsum([0] + [len(name) for name in encoded], dtype=np.int64)
+		arrays['station_bytes'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+	header = {'directed': G.is_directed(), 'line_names': None if line_names is None else [str(name) for name in line_names],
+			  'arrays': {}}
+	# The header records where each array starts, and the arrays start after the
+	# header, so grow the space reserved for the header until it fits.
+	header_size = 256
+	while True:
+		position = _align(len(CSR_FILE_MAGIC) + 8 + header_size)
+		for name, array in arrays.items():
+			header['arrays'][name] = [array.dtype.str, position, len(array)]
+			position = _align(position + array.nbytes)
+		header_bytes = json.dumps(header).encode('utf-8')
+		if len(header_bytes) <= header_size:
+			break
+		header_size = _align(len(header_bytes))
+	header_bytes = header_bytes.ljust(header_size)
+
+	with open(file_path, 'wb') as f:
+		f.write(CSR_FILE_MAGIC)
+		f.write(struct.pack('<II', CSR_FILE_VERSION, header_size))
+		f.write(header_bytes)
+		for name, array in arrays.items():
+			f.seek(header['arrays'][name][1])
+			f.write(array.tobytes())
+		f.truncate(position)
+
+
+def open_csr(file_path):
+	"""Open a file written by save_csr and return a read-only CSRGraph whose
+	arrays are memory-mapped views of the file.  stations, line_ids and
+	line_names are set on the graph when the file holds them."""
+	with open(file_path, 'rb') as f:
+		if f.read(len(CSR_FILE_MAGIC)) != CSR_FILE_MAGIC:
+			raise RuntimeError(file_path + " is not a shared graph file.")
+		version, header_size = struct.unpack('<II', f.read(8))
+		if version != CSR_FILE_VERSION:
+			raise RuntimeError("Unsupported shared graph file version " + str(version) + ".")
+		header = json.loads(f.read(header_size).decode('utf-8'))
+
+	import numpy as np
+	arrays = {}
+	for name, (dtype, offset, length) in header['arrays'].items():
+		if length == 0:  # an empty array cannot be memory-mapped
+			arrays[name] = np.empty(0, dtype=dtype)
+		else:
+			arrays[name] = np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=(length,))
+
+	G = CSRGraph(arrays['offsets'], arrays['targets'], arrays.get('weights'), header['directed'])
+	G.line_ids = arrays.get('line_ids')
+	G.line_names = header['line_names']
+	if 'station_offsets' in arrays:
+		station_bytes = arrays['station_bytes'].tobytes()
+		station_offsets = arrays['station_offsets'].tolist()
+		G.stations = [station_bytes[station_offsets[i]:station_offsets[i + 1]].decode('utf-8')
+					  for i in range(G.get_card_V())]
+	return G
+
+
+def _align(position):
+	"""Round a file position up to the next multiple of CSR_FILE_ALIGNMENT."""
+	return -(-position // CSR_FILE_ALIGNMENT) * CSR_FILE_ALIGNMENT
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	csr1 = freeze(graph1)
+	print(csr1)
+	print(str(csr1) == str(graph1))
+	print(csr1.get_edge_list() == graph1.get_edge_list())
+	print(csr1.get_card_E() == graph1.get_card_E())
+
+	# Round trip through a memory-mapped shared graph file.
+	import os
+	import tempfile
+	file_path = os.path.join(tempfile.mkdtemp(), 'graph.csr')
+	save_csr(file_path, csr1, vertices, [0] * len(csr1.targets), ['only line'])
+	mapped1 = open_csr(file_path)
+	print(mapped1.stations == vertices and mapped1.line_names == ['only line'])
+	print(mapped1.get_edge_list() == graph1.get_edge_list())
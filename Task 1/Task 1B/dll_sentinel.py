@@ -47,17 +47,39 @@ class LinkedListNode:
 		return str(self.data)
 
 
+class CompactLinkedListNode:
+	# Fixed slots instead of a per-instance __dict__.
+	__slots__ = ('prev', 'next', 'data')
+
+	def __init__(self, data):
+		"""Initialize a node of a circular doubly linked list with a sentinel with the given data."""
+		self.prev = None
+		self.next = None
+		self.data = data
+
+	def get_data(self):
+		"""Return data."""
+		return self.data
+
+	def __str__(self):
+		"""Return data as a string."""
+		return str(self.data)
+
+
 class DLLSentinel:
 
-	def __init__(self, get_key_func=None):
+	def __init__(self, get_key_func=None, node_class=LinkedListNode):
 		"""Initialize the sentinel of a circular doubly linked list with a sentinel.
 
 		Arguments:
 		get_key_func -- an optional function that returns the key for the
 		objects stored. May be a static function in the object class. If 
 		omitted, then identity function is used.
+		node_class -- class of the nodes, LinkedListNode or the smaller
+		CompactLinkedListNode
 		"""
-		self.sentinel = LinkedListNode(None)  # holds None as data
+		self.node_class = node_class
+		self.sentinel = node_class(None)  # holds None as data
 		self.sentinel.next = self.sentinel  # the sentinel points to itself in an empty list
 		self.sentinel.prev = self.sentinel
 
@@ -85,7 +107,7 @@ class DLLSentinel:
 
 	def insert(self, data, y):
 		"""Insert a node with data after node y.  Return the new node."""
-		x = LinkedListNode(data)   # construct a node x
+		x = self.node_class(data)  # construct a node x
 		x.next = y.next            # x's successor is y's successor
 		x.prev = y                 # x's predecessor is y
 		y.next.prev = x            # x comes before y's successor
@@ -127,7 +149,7 @@ class DLLSentinel:
 
 	def copy(self):
 		"""Return a copy of this circular doubly linked list with a sentinel."""
-		c = DLLSentinel(self.get_key)      # c is the copy
+		c = DLLSentinel(self.get_key, self.node_class)  # c is the copy
 		x = self.sentinel.next
 		while x != self.sentinel:
 			c.append(x.data)   # append a node with x's data to c
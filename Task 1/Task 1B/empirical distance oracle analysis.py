@@ -0,0 +1,72 @@
+# Import necessary libraries
+import pandas as pd
+import random
+import time
+import os
+from Graph import Graph_journey_duration
+from dijkstra import dijkstra, dijkstra_search
+from hub_labels import get_hub_labels, get_hub_labels_path
+
+# Function to time answering the same distance questions with Dijkstra and with hub labels.
+def measure_queries(graph, labels, pairs):
+    frozen_graph = graph.get_frozen_graph()
+    num_stations = frozen_graph.get_card_V()
+    results = []
+
+    # One distance question at a time, as an analytics job asking about single journeys would.
+    start_time = time.perf_counter()
+    expected = [dijkstra_search(frozen_graph, source, destination)[0][destination] for source, destination in pairs]
+    dijkstra_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    found = [labels.distance(source, destination) for source, destination in pairs]
+    labels_time = time.perf_counter() - start_time
+    if found != expected:
+        raise RuntimeError("Hub labels found different distances for single journeys.")
+    results.append({'Query': 'Single journey', 'Method': 'dijkstra', 'Time per Query (ms)': 1000 * dijkstra_time / len(pairs)})
+    results.append({'Query': 'Single journey', 'Method': 'hub labels', 'Time per Query (ms)': 1000 * labels_time / len(pairs)})
+
+    # Distances from every station to all the others, as the all-pairs analyses need.
+    start_time = time.perf_counter()
+    expected = [dijkstra(frozen_graph, source)[0] for source in range(num_stations)]
+    dijkstra_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    found = [labels.distances_from(source) for source in range(num_stations)]
+    labels_time = time.perf_counter() - start_time
+    if found != expected:
+        raise RuntimeError("Hub labels found different distances from a station to all the others.")
+    results.append({'Query': 'All destinations', 'Method': 'dijkstra', 'Time per Query (ms)': 1000 * dijkstra_time / num_stations})
+    results.append({'Query': 'All destinations', 'Method': 'hub labels', 'Time per Query (ms)': 1000 * labels_time / num_stations})
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_pairs = 20000
+    random.seed(0)
+
+    graph = Graph_journey_duration(file_path)
+    # Build the labels from scratch, so their preprocessing time is measured, then time loading them back.
+    labels_path = get_hub_labels_path(graph)
+    if os.path.exists(labels_path):
+        os.remove(labels_path)
+    labels = get_hub_labels(graph)
+    start_time = time.perf_counter()
+    get_hub_labels(graph)
+    load_time = time.perf_counter() - start_time
+    print(f"Hub labels: built in {1000 * labels.preprocessing_time:.1f} ms, loaded in {1000 * load_time:.1f} ms, "
+          f"{labels.get_average_label_size():.1f} hubs per label, {labels.get_memory()} bytes")
+
+    num_stations = labels.get_card_V()
+    pairs = [(random.randrange(num_stations), random.randrange(num_stations)) for _ in range(num_pairs)]
+    df = pd.DataFrame(measure_queries(graph, labels, pairs))
+    summary_df = df.pivot(index='Query', columns='Method', values='Time per Query (ms)')
+    summary_df['Speedup'] = summary_df['dijkstra'] / summary_df['hub labels']
+    print(summary_df.round(4).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'distance_oracle_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# hub_labels.py
+
+"""Hub labels (2-hop labels): an exact distance oracle for undirected graphs.
+
+Every vertex v has a label, a list of (hub, distance from v to hub) pairs,
+chosen so that for any two vertices s and t some hub on a shortest path
+between them is in both labels.  The distance from s to t is then the smallest
+dist(s, hub) + dist(hub, t) over the hubs the two labels share, which one
+merge of the two labels, sorted by hub, finds without searching the graph.
+
+Labels are built by pruned landmark labeling: a Dijkstra search from each
+vertex in turn, most important first, that stops at any vertex whose distance
+the labels made so far already give.
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from indexed_min_heap import IndexedMinHeap
+
+# Bump when the layout of hub label files changes.
+HUB_LABELS_VERSION = 1
+
+# First bytes of every hub label file.
+HUB_LABELS_MAGIC = b'HUBLABEL'
+
+
+class HubLabels:
+
+	def __init__(self, order, offsets, hubs, distances, preprocessing_time=None):
+		"""Initialize hub labels from their compact arrays.
+
+		Arguments:
+		order -- array of the vertices, most important first; hubs are stored by
+		their position in order, their rank
+		offsets -- array of card_V + 1 positions: the label of vertex v is the
+		entries offsets[v] to offsets[v + 1] - 1 of hubs and distances
+		hubs -- array of hub ranks, in increasing order within each label
+		distances -- array of distances from each vertex to the hubs in its label
+		preprocessing_time -- optional number of seconds taken to build the labels
+		"""
+		self.order = order
+		self.offsets = offsets
+		self.hubs = hubs
+		self.distances = distances
+		self.preprocessing_time = preprocessing_time
+
+	@classmethod
+	def build(cls, G, order=None):
+		"""Build hub labels for the undirected, weighted graph G.
+
+		Arguments:
+		G -- an undirected, weighted graph, either an AdjacencyListGraph or a CSRGraph
+		order -- optional sequence of the vertices, most important first.  Hubs
+		early in the order cover many shortest paths, which keeps the labels
+		short.  By default vertices are taken in decreasing order of degree.
+		"""
+		if G.is_directed():
+			raise RuntimeError("HubLabels needs an undirected graph.")
+		start_time = time.perf_counter()
+		card_V = G.get_card_V()
+		adj = [[(edge.get_v(), edge.get_weight()) for edge in G.get_adj_list(u)] for u in range(card_V)]
+		if order is None:
+			order = sorted(range(card_V), key=lambda v: (-len(adj[v]), v))
+
+		label_hubs = [[] for _ in range(card_V)]       # ranks, increasing, as labels grow in rank order
+		label_distances = [[] for _ in range(card_V)]
+		dist = [float('inf')] * card_V
+		queue = IndexedMinHeap(card_V, dist)
+		root_distance = [float('inf')] * card_V        # distance from the root to each hub in its label, by rank
+
+		for rank, root in enumerate(order):
+			for hub, d in zip(label_hubs[root], label_distances[root]):
+				root_distance[hub] = d
+			dist[root] = 0
+			queue.insert(root)
+			touched = [root]
+			while queue.get_size() > 0:
+				u = queue.extract_min()
+				d_u = dist[u]
+				# Prune u if the labels so far already give a path from root to u as short.
+				pruned = False
+				for hub, d in zip(label_hubs[u], label_distances[u]):
+					if root_distance[hub] + d <= d_u:
+						pruned = True
+						break
+				if pruned:
+					continue
+				label_hubs[u].append(rank)
+				label_distances[u].append(d_u)
+				for v, w in adj[u]:
+					if dist[v] > d_u + w:
+						if dist[v] == float('inf'):
+							touched.append(v)
+						dist[v] = d_u + w
+						queue.insert_or_decrease_key(v, dist[v])
+			# Reset the scratch space for the next root.
+			queue.clear()
+			for u in touched:
+				dist[u] = float('inf')
+			for hub in label_hubs[root]:
+				root_distance[hub] = float('inf')
+
+		# Store every label in three flat arrays.
+		offsets = array('q', [0])
+		hubs, distances = array('i'), array('d')
+		for v in range(card_V):
+			hubs.extend(label_hubs[v])
+			distances.extend(label_distances[v])
+			offsets.append(len(hubs))
+		return cls(array('i', order), offsets, hubs, distances, time.perf_counter() - start_time)
+
+	def get_card_V(self):
+		"""Return the number of vertices labelled."""
+		return len(self.offsets) - 1
+
+	def get_average_label_size(self):
+		"""Return the average number of hubs in a label."""
+		return len(self.hubs) / max(1, self.get_card_V())
+
+	def get_memory(self):
+		"""Return the number of bytes taken by the label arrays."""
+		return sum(a.itemsize * len(a) for a in (self.order, self.offsets, self.hubs, self.distances))
+
+	def get_label(self, v):
+		"""Return the label of vertex v as a list of (hub vertex, distance) pairs."""
+		start, end = self.offsets[v], self.offsets[v + 1]
+		return [(self.order[hub], d) for hub, d in zip(self.hubs[start:end], self.distances[start:end])]
+
+	def distance(self, s, t):
+		"""Return the distance from s to t, or infinity if t is unreachable from s,
+		by merging the labels of s and t."""
+		hubs, distances = self.hubs, self.distances
+		i, end_i = self.offsets[s], self.offsets[s + 1]
+		j, end_j = self.offsets[t], self.offsets[t + 1]
+		best = float('inf')
+		while i < end_i and j < end_j:
+			hub_i, hub_j = hubs[i], hubs[j]
+			if hub_i == hub_j:
+				if distances[i] + distances[j] < best:
+					best = distances[i] + distances[j]
+				i += 1
+				j += 1
+			elif hub_i < hub_j:
+				i += 1
+			else:
+				j += 1
+		return best
+
+	def distances_from(self, s):
+		"""Return the list of distances from s to every vertex, the same as the
+		distances dijkstra(G, s) returns.  The label of s is spread into a list
+		indexed by hub, so each other label is read once."""
+		hubs, distances, offsets = self.hubs, self.distances, self.offsets
+		inf = float('inf')
+		to_hub = [inf] * len(self.order)
+		for i in range(offsets[s], offsets[s + 1]):
+			to_hub[hubs[i]] = distances[i]
+		result = [inf] * self.get_card_V()
+		for t in range(self.get_card_V()):
+			best = inf
+			for i in range(offsets[t], offsets[t + 1]):
+				d = to_hub[hubs[i]] + distances[i]
+				if d < best:
+					best = d
+			result[t] = best
+		return result
+
+	def save(self, file_path, source_hash):
+		"""Write the labels to a binary file, tagged with the hash of the file the graph was built from.
+
+		The file is a JSON header followed by the four arrays as raw
+		little-endian numbers, like the graph snapshots in Graph.py.
+		"""
+		arrays = [('order', self.order), ('offsets', self.offsets), ('hubs', self.hubs), ('distances', self.distances)]
+		header = json.dumps({
+			'source_hash': source_hash,
+			'preprocessing_time': self.preprocessing_time,
+			'arrays': [[name, values.typecode, len(values)] for name, values in arrays],
+		}).encode('utf-8')
+		# Write to a temporary file first so that readers never see half the labels.
+		temp_path = file_path + '.tmp'
+		with open(temp_path, 'wb') as f:
+			f.write(HUB_LABELS_MAGIC)
+			f.write(struct.pack('<II', HUB_LABELS_VERSION, len(header)))
+			f.write(header)
+			for name, values in arrays:
+				if sys.byteorder != 'little':
+					values = array(values.typecode, values)
+					values.byteswap()
+				f.write(values.tobytes())
+		os.replace(temp_path, file_path)
+
+	@classmethod
+	def load(cls, file_path, source_hash):
+		"""Return the labels stored by save, or None if there is no file or it
+		was made from a different source file."""
+		try:
+			with open(file_path, 'rb') as f:
+				data = f.read()
+			position = len(HUB_LABELS_MAGIC)
+			if data[:position] != HUB_LABELS_MAGIC:
+				return None
+			version, header_size = struct.unpack_from('<II', data, position)
+			if version != HUB_LABELS_VERSION:
+				return None
+			position += struct.calcsize('<II')
+			header = json.loads(data[position:position + header_size].decode('utf-8'))
+			if header['source_hash'] != source_hash:
+				return None
+			position += header_size
+
+			arrays = {}
+			for name, type_code, length in header['arrays']:
+				values = array(type_code)
+				end = position + length * values.itemsize
+				values.frombytes(data[position:end])
+				if sys.byteorder != 'little':
+					values.byteswap()
+				arrays[name] = values
+				position = end
+			if position != len(data):
+				return None
+			return cls(arrays['order'], arrays['offsets'], arrays['hubs'], arrays['distances'],
+					   header['preprocessing_time'])
+		except (OSError, ValueError, KeyError, TypeError, struct.error):
+			return None
+
+
+def get_hub_labels_path(station_graph):
+	"""Return the path of the file get_hub_labels caches a station graph's labels in."""
+	return station_graph.file_path + os.path.splitext(station_graph.snapshot_suffix)[0] + '.hublabels'
+
+
+def get_hub_labels(station_graph, use_cache=True):
+	"""Return HubLabels for a Graph_journey_duration or Graph_count_stations.
+
+	If use_cache is True, the labels are loaded from a file next to the graph's
+	source file when they were made from the same contents, and built and saved
+	there otherwise, as the graph snapshots are.
+	"""
+	from Graph import file_hash
+	file_path = get_hub_labels_path(station_graph)
+	if use_cache:
+		source_hash = file_hash(station_graph.file_path)
+		labels = HubLabels.load(file_path, source_hash)
+		if labels is not None:
+			return labels
+	labels = HubLabels.build(station_graph.graph)
+	if use_cache:
+		try:
+			labels.save(file_path, source_hash)
+		except OSError:
+			pass  # the file is only a cache
+	return labels
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	import tempfile
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+
+	random.seed(6)
+	all_equal = True
+	for trial in range(20):
+		card_V = random.randint(1, 120)
+		G = AdjacencyListGraph(card_V, False, True)
+		for _ in range(random.randint(0, 3 * card_V)):
+			u, v = random.randrange(card_V), random.randrange(card_V)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, random.randint(0, 20))
+		labels = HubLabels.build(G)
+		for s in range(card_V):
+			d = dijkstra(G, s)[0]
+			if labels.distances_from(s) != d or any(labels.distance(s, t) != d[t] for t in range(card_V)):
+				print("Distance mismatch from", s, "in trial", trial)
+				all_equal = False
+	print("All hub label distances are " + ("" if all_equal else "not ") + "equal")
+
+	# Saving and loading gives the same labels.
+	with tempfile.TemporaryDirectory() as temp_dir:
+		file_path = os.path.join(temp_dir, 'test.hublabels')
+		labels.save(file_path, 'hash')
+		loaded = HubLabels.load(file_path, 'hash')
+		print(loaded.hubs == labels.hubs and loaded.distances == labels.distances
+			  and loaded.offsets == labels.offsets and HubLabels.load(file_path, 'other hash') is None)
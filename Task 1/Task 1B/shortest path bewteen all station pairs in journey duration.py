@@ -1,5 +1,6 @@
 # Import necessary classes and modules
-from Graph import Graph_journey_duration, pd  # Assuming Graph_journey_duration class and pandas are defined in Graph module.
+from Graph import Graph_journey_duration  # Assuming Graph_journey_duration class is defined in Graph module.
+import pandas as pd  # Used to write the paths to a CSV file.
 from dijkstra import dijkstra  # Importing dijkstra algorithm implementation.
 import os
 # Define a class for finding the shortest paths in a graph.
@@ -11,29 +12,30 @@ class ShortestPathFinder:
     # Method to find the shortest paths from all stations to all other stations.
     def find_shortest_paths(self):
         all_paths_data = []  # List to store data about all paths.
-        for source in self.graph.stations:  # Iterate through all source stations.
-            source_index = self.graph.station_to_int[source]  # Convert station name to index.
-            distances, predecessors = dijkstra(self.graph.graph, source_index)  # Run Dijkstra's algorithm.
+        graph = self.graph.get_frozen_graph()  # Frozen CSR copy of the graph, shared by every search.
+        station_index = self.graph.station_index  # Converts between station names and numbers.
+        for source_index, source in enumerate(station_index):  # Iterate through all source stations.
+            distances, predecessors = dijkstra(graph, source_index)  # Run Dijkstra's algorithm.
 
             # Skip specific stations as per the condition.
             if source == 'station 1' or source == 'station 2':
                 continue
 
             # Iterate through all destination stations.
-            for destination in self.graph.stations:
+            for destination_index, destination in enumerate(station_index):
                 # Skip if the destination is not in the desired range or is specific stations.
                 if destination <= source or destination in ['station 1', 'station 2']:
                     continue
-                destination_index = self.graph.station_to_int[destination]  # Convert station name to index.
 
                 # Backtrack the path from destination to source using predecessors.
-                path = []
+                path_ids = []
                 current_station = destination_index
                 while predecessors[current_station] is not None:
-                    path.insert(0, self.graph.int_to_station[current_station])
+                    path_ids.append(current_station)
                     current_station = predecessors[current_station]
                 if current_station == source_index:
-                    path.insert(0, source)
+                    path_ids.append(source_index)
+                path = station_index.get_names(reversed(path_ids))
 
                 # If a valid path exists, add it to the list.
                 if path:
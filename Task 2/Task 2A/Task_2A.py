@@ -1,7 +1,14 @@
 # Import the necessary classes and modules
 from Graph import Graph_count_stations  # Assuming this class is defined in the Graph module.
-from dijkstra import dijkstra  # Import the Dijkstra's algorithm implementation.
+from dijkstra import dijkstra_search, bidirectional_dijkstra  # Import the Dijkstra's algorithm implementation.
+from bfs import bfs_search  # Import breadth-first search, for graphs whose edges all weigh 1.
 import os
+
+# Search engines ShortestPathFinder can use: breadth-first search, which needs no priority
+# queue since every connection counts as one station, Dijkstra's algorithm from the start
+# station, or bidirectional Dijkstra from both ends.
+SEARCH_ENGINES = ("bfs", "dijkstra", "bidirectional")
+
 # Define a class to assist in finding station names and tube lines.
 class StationLineFinder:
     # Constructor for the class that takes a graph object as an argument.
@@ -10,12 +17,8 @@ class StationLineFinder:
 
     # Method to find the exact name of a station given a possible partial or case-insensitive name.
     def find_station_name(self, station_name):
-        # Iterate through all station names in the graph.
-        for real_name in self.graph.stations:
-            # Check if the provided name matches any station name in the graph, ignoring case.
-            if station_name.lower() == real_name.lower():
-                return real_name  # Return the exact station name if found.
-        return None  # Return None if no exact match is found.
+        # Look the name up in the station index, ignoring case.
+        return self.graph.station_index.find_name(station_name)
 
     # Method to get the index of a station from a given prompt.
     def get_station_index(self, station_name_prompt):
@@ -23,19 +26,39 @@ class StationLineFinder:
             station_name = input(station_name_prompt).strip().title()  # Prompt the user for the station name and format it.
             matched_station = self.find_station_name(station_name)  # Find the exact station name.
             if matched_station:
-                return self.graph.station_to_int[matched_station]  # Return the index of the station if found.
+                return self.graph.station_index.get_id(matched_station)  # Return the index of the station if found.
             print("Station not found. Please check the name and try again.")  # Prompt again if not found.
 
     # Method to find the tube line connecting two stations.
-    def get_tube_line(self, station1, station2):
-        # Return the tube line connecting the two stations (in either direction).
-        return self.graph.tube_lines.get((station1, station2)) or self.graph.tube_lines.get((station2, station1))
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        # Return the tube line connecting the two stations (in either direction), keeping to preferred_line if it also connects them.
+        return self.graph.get_tube_line(station1, station2, preferred_line)
 
 # Define a class for finding the shortest path between two stations.
 class ShortestPathFinder:
-    # Constructor for the class that takes a StationLineFinder object as an argument.
-    def __init__(self, station_finder):
+    # Constructor for the class that takes a StationLineFinder object and optionally the search engine to use.
+    # Dijkstra's algorithm is the default, so the route printed where several routes tie stays the same;
+    # breadth-first search gives the same number of stations.
+    def __init__(self, station_finder, engine="dijkstra"):
+        if engine not in SEARCH_ENGINES:
+            raise RuntimeError("Unknown search engine " + str(engine) + ".")
         self.station_finder = station_finder  # Storing the station finder object for later use.
+        self.engine = engine  # Name of the search engine, one of SEARCH_ENGINES.
+        self.num_settled = None  # Number of stations the last search settled before reaching the destination.
+
+    # Method to find the shortest path from one station to another, as distances and predecessors.
+    def search(self, source_index, destination_index):
+        graph = self.station_finder.graph.graph
+        if self.engine == "bfs":
+            # Every connection counts as one station, so stations are reached in order of distance.
+            distances, predecessors, self.num_settled = bfs_search(graph, source_index, destination_index)
+        elif self.engine == "bidirectional":
+            # Search from both ends at once, meeting in the middle.
+            distances, predecessors, self.num_settled = bidirectional_dijkstra(graph, source_index, destination_index)
+        else:
+            # The search stops once the destination is settled, since only its path is needed.
+            distances, predecessors, self.num_settled = dijkstra_search(graph, source_index, destination_index)
+        return distances, predecessors
 
     # Method to find and print the shortest path between two stations.
     def find_and_print_shortest_path(self, line):
@@ -43,12 +66,13 @@ class ShortestPathFinder:
         source_index = self.station_finder.get_station_index("Enter the start station: ")
         destination_index = self.station_finder.get_station_index("Enter the destination station: ")
         
-        # Run Dijkstra's algorithm to find the shortest path and its distance.
-        distances, predecessors = dijkstra(self.station_finder.graph.graph, source_index)
+        # Run the search engine to find the shortest path and its distance.
+        distances, predecessors = self.search(source_index, destination_index)
         
         # Prepare lists to display the path and count the number of stations.
-        display_path = [self.station_finder.graph.int_to_station[destination_index]]
-        count_path = [self.station_finder.graph.int_to_station[destination_index]]
+        station_index = self.station_finder.graph.station_index  # Converts station numbers back to names.
+        display_path = [station_index.get_name(destination_index)]
+        count_path = [station_index.get_name(destination_index)]
 
         current_station = destination_index
         previous_line = None  # Variable to track line changes in the path.
@@ -60,11 +84,11 @@ class ShortestPathFinder:
 
             # Handle line changes in the path display.
             if previous_line is not None and line != previous_line:
-                display_path.insert(1, f"(Switch to {previous_line} line at {self.station_finder.graph.int_to_station[current_station]})")
+                display_path.insert(1, f"(Switch to {previous_line} line at {station_index.get_name(current_station)})")
             
             current_station = next_station
-            display_path.insert(0, self.station_finder.graph.int_to_station[current_station])
-            count_path.insert(0, self.station_finder.graph.int_to_station[current_station])  # Add station to count path.
+            display_path.insert(0, station_index.get_name(current_station))
+            count_path.insert(0, station_index.get_name(current_station))  # Add station to count path.
             previous_line = line
 
         # Count the number of stations in the path.
@@ -0,0 +1,53 @@
+# pandas is imported by each reader, so that importing this module stays cheap.
+import os
+
+# Columns every reader must provide, named as in the London Underground workbook.
+CONNECTION_COLUMNS = ['tube line', 'station 1', 'station 2', 'time in minutes between the stations']
+
+# Rows per chunk for the readers that stream.
+DEFAULT_CHUNKSIZE = 100000
+
+
+def read_excel_chunks(file_path, chunksize=None):
+    """Yield the connections in an Excel file as a single DataFrame.
+    Excel files cannot be streamed, so chunksize is ignored."""
+    import pandas as pd
+    yield pd.read_excel(file_path, sheet_name='Sheet1')
+
+
+def read_csv_chunks(file_path, chunksize=None):
+    """Yield the connections in a CSV file as DataFrames of at most chunksize rows."""
+    import pandas as pd
+    # Keep station and line names as text even if they look like numbers.
+    names_as_text = {'tube line': str, 'station 1': str, 'station 2': str}
+    yield from pd.read_csv(file_path, usecols=CONNECTION_COLUMNS, dtype=names_as_text,
+                           chunksize=chunksize or DEFAULT_CHUNKSIZE)
+
+
+def read_parquet_chunks(file_path, chunksize=None):
+    """Yield the connections in a Parquet file as DataFrames of at most chunksize rows.
+    Needs the optional pyarrow package."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Reading Parquet files needs the pyarrow package (pip install pyarrow).")
+    parquet_file = pq.ParquetFile(file_path)
+    for batch in parquet_file.iter_batches(batch_size=chunksize or DEFAULT_CHUNKSIZE, columns=CONNECTION_COLUMNS):
+        yield batch.to_pandas()
+
+
+# Reader for each file extension. Add an entry here to support another format.
+READERS = {
+    '.xlsx': read_excel_chunks,
+    '.xls': read_excel_chunks,
+    '.csv': read_csv_chunks,
+    '.parquet': read_parquet_chunks,
+}
+
+
+def get_reader(file_path):
+    """Return the reader for a file, chosen by its extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in READERS:
+        raise RuntimeError("No reader for " + extension + " files.")
+    return READERS[extension]
@@ -0,0 +1,83 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import random
+import tempfile
+import time
+import os
+from Graph import Graph_count_stations
+from bfs import bfs, multi_source_bfs
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Function to time finding the station counts between every pair of stations on one graph,
+# one search per station and with every search at once.
+def measure_all_pairs(dataset, graph):
+    frozen_graph = graph.get_frozen_graph()
+    num_stations = frozen_graph.get_card_V()
+    timings = {}
+
+    start_time = time.perf_counter()
+    per_source = [bfs(frozen_graph, source) for source in range(num_stations)]
+    timings['bfs per station'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    dist, pi = multi_source_bfs(frozen_graph, predecessors=False)
+    timings['bit-parallel distances'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    dist, pi = multi_source_bfs(frozen_graph)
+    timings['bit-parallel distances and predecessors'] = time.perf_counter() - start_time
+
+    # The searches from every station at once must give exactly the same results.
+    inf = float('inf')
+    for source, (d, p) in enumerate(per_source):
+        if [inf if x < 0 else x for x in dist[source].tolist()] != d or [None if u < 0 else u for u in pi[source].tolist()] != p:
+            raise RuntimeError("Bit-parallel search found different results from station " + str(source) + " on " + dataset + ".")
+
+    return [{
+        'Dataset': dataset,
+        'Total Number of Stations': num_stations,
+        'Number of Edges': frozen_graph.get_card_E(),
+        'Method': method,
+        'Time Taken (s)': time_taken,
+    } for method, time_taken in timings.items()]
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_lines = 15
+    all_pairs_results = []
+    random.seed(0)
+
+    # The real network, where every connection counts as one station.
+    all_pairs_results += measure_all_pairs('London Underground', Graph_count_stations(file_path))
+
+    # Synthetic networks of growing size, sparse with one interchange between
+    # neighbouring lines and denser with five.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_interchange_stations in [1, 5]:
+            for num_stations in [500, 1000, 2000, 4000]:
+                df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations // num_lines, num_interchange_stations)
+                csv_path = os.path.join(temp_dir, f'synthetic_{num_stations}_{num_interchange_stations}.csv')
+                df.to_csv(csv_path, index=False)
+                graph = Graph_count_stations(csv_path, use_snapshot=False)
+                dataset = f'Synthetic ({num_stations} stations, {num_interchange_stations} interchanges)'
+                all_pairs_results += measure_all_pairs(dataset, graph)
+
+    # Compile the results into a DataFrame and print how much faster the bit-parallel search is.
+    df = pd.DataFrame(all_pairs_results)
+    summary_df = df.pivot(index='Dataset', columns='Method', values='Time Taken (s)')
+    summary_df = summary_df.reindex(index=df['Dataset'].unique(), columns=df['Method'].unique())
+    summary_df['Speedup (distances)'] = summary_df['bfs per station'] / summary_df['bit-parallel distances']
+    summary_df['Speedup (with predecessors)'] = summary_df['bfs per station'] / summary_df['bit-parallel distances and predecessors']
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'all_pairs_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
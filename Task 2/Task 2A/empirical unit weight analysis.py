@@ -0,0 +1,83 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import random
+import tempfile
+import time
+import os
+from Graph import Graph_count_stations
+from bfs import bfs
+from dijkstra import dijkstra
+from bellman_ford import bellman_ford
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Algorithms to compare, each returning distances and predecessors from one source station.
+ALGORITHMS = {
+    'bfs': bfs,
+    'dijkstra': dijkstra,
+    'bellman_ford': lambda graph, source: bellman_ford(graph, source)[:2],
+}
+
+# Function to time every algorithm searching from the same source stations on one graph.
+def measure_algorithms(dataset, graph, num_sources):
+    frozen_graph = graph.get_frozen_graph()
+    sources = random.sample(range(frozen_graph.get_card_V()), min(num_sources, frozen_graph.get_card_V()))
+    results = []
+    expected = None
+    for name, algorithm in ALGORITHMS.items():
+        start_time = time.perf_counter()
+        distances = [algorithm(frozen_graph, source)[0] for source in sources]
+        time_taken = time.perf_counter() - start_time
+        # Every algorithm must count the same number of stations.
+        if expected is None:
+            expected = distances
+        elif distances != expected:
+            raise RuntimeError(name + " found different station counts on " + dataset + ".")
+        results.append({
+            'Dataset': dataset,
+            'Total Number of Stations': frozen_graph.get_card_V(),
+            'Number of Edges': frozen_graph.get_card_E(),
+            'Algorithm': name,
+            'Time per Search (ms)': 1000 * time_taken / len(sources),
+        })
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    # Bellman-Ford takes O(VE) time per search, so a few sources are enough to show the gap.
+    num_sources = 10
+    num_lines = 15
+    num_interchange_stations = 1
+    algorithm_results = []
+    random.seed(0)
+
+    # The real network, where every connection counts as one station.
+    algorithm_results += measure_algorithms('London Underground', Graph_count_stations(file_path), num_sources)
+
+    # Synthetic networks of growing size.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_stations in [250, 500, 1000, 2000]:
+            df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations // num_lines, num_interchange_stations)
+            csv_path = os.path.join(temp_dir, f'synthetic_{num_stations}.csv')
+            df.to_csv(csv_path, index=False)
+            graph = Graph_count_stations(csv_path, use_snapshot=False)
+            algorithm_results += measure_algorithms(f'Synthetic ({num_stations} stations)', graph, num_sources)
+
+    # Compile the results into a DataFrame and print how much faster breadth-first search is.
+    df = pd.DataFrame(algorithm_results)
+    summary_df = df.pivot(index='Dataset', columns='Algorithm', values='Time per Search (ms)')
+    summary_df = summary_df.reindex(index=df['Dataset'].unique(), columns=list(ALGORITHMS))
+    summary_df['Speedup over dijkstra'] = summary_df['dijkstra'] / summary_df['bfs']
+    summary_df['Speedup over bellman_ford'] = summary_df['bellman_ford'] / summary_df['bfs']
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'unit_weight_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
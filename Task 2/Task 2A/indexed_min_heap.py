@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# indexed_min_heap.py
+
+"""Minimum priority queues specialised for the integers 0 to n-1, such as vertex indices:
+a binary heap and a d-ary heap."""
+
+
+class IndexedMinHeap:
+
+    def __init__(self, n, keys=None):
+        """Initialize an empty minimum priority queue for the items 0 to n-1.
+
+        Unlike MinHeapPriorityQueue, the key and the heap position of each item
+        are kept in flat lists indexed by the item, so there is no dictionary
+        to update on every swap and no key function to call on every comparison.
+
+        Arguments:
+        n -- number of possible items
+        keys -- optional list of n keys, indexed by item. The heap reads keys from
+        this list and decrease_key writes to it, so dijkstra can pass its list of
+        distances. If omitted, every key starts at infinity.
+        """
+        self.keys = [float('inf')] * n if keys is None else keys
+        self.heap = []              # items in heap order
+        self.position = [-1] * n    # index of each item in self.heap, -1 if not in the heap
+
+    def get_size(self):
+        """Return the number of items in the priority queue."""
+        return len(self.heap)
+
+    def contains(self, v):
+        """Return True if item v is in the priority queue."""
+        return self.position[v] >= 0
+
+    def get_key(self, v):
+        """Return the key of item v."""
+        return self.keys[v]
+
+    def minimum(self):
+        """Return the item with the minimum key."""
+        if not self.heap:
+            raise RuntimeError("Heap underflow.")
+        return self.heap[0]
+
+    def insert(self, v, k=None):
+        """Insert item v, with key k if given, otherwise with its current key."""
+        if self.position[v] >= 0:
+            raise RuntimeError("Error in insert: item " + str(v) + " is already in the heap.")
+        if k is not None:
+            self.keys[v] = k
+        self.heap.append(v)
+        self.sift_up(len(self.heap) - 1)
+
+    def build(self, items, keys=None):
+        """Fill an empty heap with items in O(n) time, with keys from the list keys,
+        indexed by item, if given, otherwise with their current keys.
+
+        The heap is built bottom up by sifting down every internal node, instead
+        of sifting up after each of n inserts, which costs O(n lg n) in the worst case.
+        """
+        if self.heap:
+            raise RuntimeError("Error in build: the heap is not empty.")
+        heap, position = self.heap, self.position
+        heap.extend(items)
+        for i, v in enumerate(heap):
+            if position[v] >= 0:
+                raise RuntimeError("Error in build: item " + str(v) + " appears more than once.")
+            position[v] = i
+            if keys is not None:
+                self.keys[v] = keys[v]
+        for i in range((len(heap) >> 1) - 1, -1, -1):
+            self.sift_down(i)
+
+    def extract_min(self):
+        """Return and delete the item with the minimum key."""
+        heap = self.heap
+        if not heap:
+            raise RuntimeError("Heap underflow.")
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            # Move the last item to the root and restore the heap property.
+            heap[0] = last
+            self.sift_down(0)
+        return top
+
+    def decrease_key(self, v, k):
+        """Decrease the key of item v to k.  Error if k is greater than v's current key."""
+        if k > self.keys[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[v]))
+        self.keys[v] = k
+        self.sift_up(self.position[v])
+
+    def clear(self):
+        """Remove every item, in time proportional to the number removed, so
+        that one heap can be reused for many small searches.  Keys are left as they are."""
+        position = self.position
+        for v in self.heap:
+            position[v] = -1
+        self.heap.clear()
+
+    def insert_or_decrease_key(self, v, k):
+        """Insert item v with key k, or decrease its key to k if it is already in the heap."""
+        if self.position[v] >= 0:
+            self.decrease_key(v, k)
+        else:
+            self.insert(v, k)
+
+    def sift_up(self, i):
+        """Move the item at index i towards the root until its parent's key is not greater."""
+        heap, position, keys = self.heap, self.position, self.keys
+        v = heap[i]
+        k = keys[v]
+        # Move parents down into the hole instead of swapping at every level.
+        while i > 0:
+            parent = (i - 1) >> 1
+            u = heap[parent]
+            if not k < keys[u]:
+                break
+            heap[i] = u
+            position[u] = i
+            i = parent
+        heap[i] = v
+        position[v] = i
+
+    def sift_down(self, i):
+        """Move the item at index i towards the leaves until no child has a smaller key."""
+        heap, position, keys = self.heap, self.position, self.keys
+        size = len(heap)
+        v = heap[i]
+        k = keys[v]
+        # Move the smaller child up into the hole instead of swapping at every level.
+        while True:
+            l = 2 * i + 1
+            if l >= size:
+                break
+            child, child_key = i, k
+            if keys[heap[l]] < child_key:
+                child, child_key = l, keys[heap[l]]
+            r = l + 1
+            if r < size and keys[heap[r]] < child_key:
+                child = r
+            if child == i:
+                break
+            u = heap[child]
+            heap[i] = u
+            position[u] = i
+            i = child
+        heap[i] = v
+        position[v] = i
+
+    def is_heap(self):
+        """Verify that the heap property holds and the positions are right."""
+        heap, keys = self.heap, self.keys
+        for i in range(1, len(heap)):
+            if keys[heap[i]] < keys[heap[(i - 1) >> 1]]:
+                return False
+        return all(self.position[v] == i for i, v in enumerate(heap))
+
+    def __str__(self):
+        """Return the heap as an array."""
+        return ", ".join(str(v) for v in self.heap)
+
+
+class IndexedDaryHeap(IndexedMinHeap):
+
+    def __init__(self, n, keys=None, arity=4):
+        """Initialize an empty minimum d-ary heap for the items 0 to n-1.
+
+        Each node has up to arity children instead of two, so the heap is
+        shallower: sift_up, used by insert and decrease_key, visits fewer levels,
+        while sift_down, used by extract_min, compares more children per level.
+        Dijkstra's algorithm decreases keys more often than it extracts, which
+        favours a wider heap.
+
+        Arguments:
+        n -- number of possible items
+        keys -- optional list of n keys, indexed by item, as for IndexedMinHeap
+        arity -- number of children per node, at least 2
+        """
+        if arity < 2:
+            raise RuntimeError("A d-ary heap needs an arity of at least 2.")
+        IndexedMinHeap.__init__(self, n, keys)
+        self.arity = arity
+
+    def sift_up(self, i):
+        """Move the item at index i towards the root until its parent's key is not greater."""
+        heap, position, keys, arity = self.heap, self.position, self.keys, self.arity
+        v = heap[i]
+        k = keys[v]
+        while i > 0:
+            parent = (i - 1) // arity
+            u = heap[parent]
+            if not k < keys[u]:
+                break
+            heap[i] = u
+            position[u] = i
+            i = parent
+        heap[i] = v
+        position[v] = i
+
+    def sift_down(self, i):
+        """Move the item at index i towards the leaves until no child has a smaller key."""
+        heap, position, keys, arity = self.heap, self.position, self.keys, self.arity
+        size = len(heap)
+        v = heap[i]
+        k = keys[v]
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            # Find the first child with the smallest key less than k.
+            child, child_key = i, k
+            for c in range(first, min(first + arity, size)):
+                c_key = keys[heap[c]]
+                if c_key < child_key:
+                    child, child_key = c, c_key
+            if child == i:
+                break
+            u = heap[child]
+            heap[i] = u
+            position[u] = i
+            i = child
+        heap[i] = v
+        position[v] = i
+
+    def build(self, items, keys=None):
+        """Fill an empty heap with items in O(n) time, as for IndexedMinHeap."""
+        if self.heap:
+            raise RuntimeError("Error in build: the heap is not empty.")
+        heap, position = self.heap, self.position
+        heap.extend(items)
+        for i, v in enumerate(heap):
+            if position[v] >= 0:
+                raise RuntimeError("Error in build: item " + str(v) + " appears more than once.")
+            position[v] = i
+            if keys is not None:
+                self.keys[v] = keys[v]
+        for i in range((len(heap) - 2) // self.arity, -1, -1):
+            self.sift_down(i)
+
+    def is_heap(self):
+        """Verify that the heap property holds and the positions are right."""
+        heap, keys, arity = self.heap, self.keys, self.arity
+        for i in range(1, len(heap)):
+            if keys[heap[i]] < keys[heap[(i - 1) // arity]]:
+                return False
+        return all(self.position[v] == i for i, v in enumerate(heap))
+
+
+if __name__ == "__main__":
+
+    import random
+
+    # Same sequence of operations as dijkstra: insert everything, then extract and decrease.
+    random.seed(1)
+    keys1 = [random.randint(0, 100) for _ in range(50)]
+    pq1 = IndexedMinHeap(len(keys1), list(keys1))
+    for v in range(len(keys1)):
+        pq1.insert(v)
+    print(pq1.is_heap())
+
+    # Decrease the last key to -100, which should become the minimum.
+    pq1.decrease_key(49, -100)
+    print(pq1.is_heap())
+    print(pq1.minimum() == 49)
+
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        v = pq1.extract_min()
+        extracted_keys.append(pq1.get_key(v))
+        if not pq1.is_heap() or pq1.contains(v):
+            print("Heap property broken after extracting", v)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # A bulk build gives the same keys in the same order as inserting one by one.
+    pq3 = IndexedMinHeap(len(keys1), list(keys1))
+    pq3.build(range(len(keys1)))
+    print(pq3.is_heap())
+    print([pq3.get_key(pq3.extract_min()) for _ in range(len(keys1))] == sorted(keys1))
+
+    # A 4-ary heap extracts the same keys in the same order.
+    pq4 = IndexedDaryHeap(len(keys1), list(keys1), 4)
+    pq4.build(range(len(keys1)))
+    pq4.decrease_key(49, -100)
+    print(pq4.is_heap() and pq4.minimum() == 49)
+    print([pq4.get_key(pq4.extract_min()) for _ in range(len(keys1))] == [-100] + sorted(keys1[:49]))
+
+    # Items enter only when first reached, as in dijkstra's frontier-only mode.
+    pq2 = IndexedMinHeap(10)
+    pq2.insert_or_decrease_key(3, 5)
+    pq2.insert_or_decrease_key(7, 4)
+    pq2.insert_or_decrease_key(3, 1)
+    print(pq2.get_size() == 2 and pq2.extract_min() == 3 and pq2.extract_min() == 7)
+
+    # Check minimum in empty priority queue.
+    try:
+        pq1.extract_min()
+    except RuntimeError as e:
+        print(e)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# pairing_heap.py
+
+"""Minimum pairing heap for the integers 0 to n-1, with the same interface as IndexedMinHeap."""
+
+
+class PairingHeap:
+
+    def __init__(self, n, keys=None):
+        """Initialize an empty pairing heap for the items 0 to n-1.
+
+        The heap is a single tree in which every node's key is at most its
+        children's keys.  Insert and decrease_key just link a one-node tree, or
+        the subtree cut from v, with the root in O(1) time.  extract_min does the
+        work, pairing up the root's children left to right and then linking the
+        pairs right to left, in O(lg n) amortized time.
+
+        The tree is kept in flat lists indexed by item rather than in node objects.
+
+        Arguments:
+        n -- number of possible items
+        keys -- optional list of n keys, indexed by item, as for IndexedMinHeap
+        """
+        self.keys = [float('inf')] * n if keys is None else keys
+        self.child = [-1] * n       # leftmost child of each item, -1 if none
+        self.sibling = [-1] * n     # next sibling to the right, -1 if none
+        self.prev = [-1] * n        # previous sibling, or the parent of a leftmost child
+        self.in_heap = [False] * n
+        self.root = -1
+        self.size = 0
+
+    def get_size(self):
+        """Return the number of items in the priority queue."""
+        return self.size
+
+    def contains(self, v):
+        """Return True if item v is in the priority queue."""
+        return self.in_heap[v]
+
+    def get_key(self, v):
+        """Return the key of item v."""
+        return self.keys[v]
+
+    def minimum(self):
+        """Return the item with the minimum key."""
+        if self.root < 0:
+            raise RuntimeError("Heap underflow.")
+        return self.root
+
+    def link(self, a, b):
+        """Link the trees rooted at a and b, and return the root of the result.
+        On equal keys, a stays the root."""
+        if self.keys[b] < self.keys[a]:
+            a, b = b, a
+        # Make b the leftmost child of a.
+        first = self.child[a]
+        self.sibling[b] = first
+        if first >= 0:
+            self.prev[first] = b
+        self.prev[b] = a
+        self.child[a] = b
+        return a
+
+    def insert(self, v, k=None):
+        """Insert item v, with key k if given, otherwise with its current key."""
+        if self.in_heap[v]:
+            raise RuntimeError("Error in insert: item " + str(v) + " is already in the heap.")
+        if k is not None:
+            self.keys[v] = k
+        self.in_heap[v] = True
+        self.child[v] = self.sibling[v] = self.prev[v] = -1
+        self.size += 1
+        self.root = v if self.root < 0 else self.link(self.root, v)
+
+    def build(self, items, keys=None):
+        """Insert items, with keys from the list keys, indexed by item, if given,
+        otherwise with their current keys.  Each insert already takes O(1) time."""
+        for v in items:
+            self.insert(v, None if keys is None else keys[v])
+
+    def extract_min(self):
+        """Return and delete the item with the minimum key."""
+        top = self.root
+        if top < 0:
+            raise RuntimeError("Heap underflow.")
+        sibling = self.sibling
+
+        # First pass: link the children in pairs, left to right.
+        pairs = []
+        a = self.child[top]
+        while a >= 0:
+            b = sibling[a]
+            if b < 0:
+                pairs.append(a)
+                break
+            next_a = sibling[b]
+            pairs.append(self.link(a, b))
+            a = next_a
+
+        # Second pass: link the pairs into one tree, right to left.
+        root = -1
+        for a in reversed(pairs):
+            sibling[a] = self.prev[a] = -1
+            root = a if root < 0 else self.link(a, root)
+
+        self.root = root
+        self.child[top] = -1
+        self.in_heap[top] = False
+        self.size -= 1
+        return top
+
+    def decrease_key(self, v, k):
+        """Decrease the key of item v to k.  Error if k is greater than v's current key."""
+        if k > self.keys[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[v]))
+        self.keys[v] = k
+        if v == self.root:
+            return
+        # Cut the subtree rooted at v out of its parent's list of children
+        # and link it with the root.
+        p, s = self.prev[v], self.sibling[v]
+        if self.child[p] == v:
+            self.child[p] = s
+        else:
+            self.sibling[p] = s
+        if s >= 0:
+            self.prev[s] = p
+        self.sibling[v] = self.prev[v] = -1
+        self.root = self.link(self.root, v)
+
+    def insert_or_decrease_key(self, v, k):
+        """Insert item v with key k, or decrease its key to k if it is already in the heap."""
+        if self.in_heap[v]:
+            self.decrease_key(v, k)
+        else:
+            self.insert(v, k)
+
+    def is_heap(self):
+        """Verify that every child's key is at least its parent's and the size is right."""
+        if self.root < 0:
+            return self.size == 0
+        count = 0
+        stack = [self.root]
+        while stack:
+            u = stack.pop()
+            count += 1
+            c = self.child[u]
+            while c >= 0:
+                if self.keys[c] < self.keys[u] or not self.in_heap[c]:
+                    return False
+                stack.append(c)
+                c = self.sibling[c]
+        return count == self.size
+
+
+if __name__ == "__main__":
+
+    import random
+
+    # Same sequence of operations as dijkstra: insert everything, then extract and decrease.
+    random.seed(1)
+    n = 200
+    keys = [0] + [float('inf')] * (n - 1)
+    pq = PairingHeap(n, keys)
+    pq.build(range(n))
+    extracted_keys = []
+    while pq.get_size() > 0:
+        u = pq.extract_min()
+        k = pq.get_key(u)
+        extracted_keys.append(k)
+        if not pq.is_heap() or pq.contains(u):
+            print("Heap property broken after extracting", u)
+        if k == float('inf'):
+            continue
+        for v in random.sample(range(n), 5):
+            w = random.randint(0, 9)
+            if pq.contains(v) and k + w < pq.get_key(v):
+                pq.decrease_key(v, k + w)
+    print(extracted_keys == sorted(extracted_keys), len(extracted_keys) == n)
+
+    # Check minimum in empty priority queue.
+    try:
+        pq.extract_min()
+    except RuntimeError as e:
+        print(e)
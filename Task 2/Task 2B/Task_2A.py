@@ -10,12 +10,8 @@ class StationLineFinder:
 
     # Method to find the exact name of a station given a possible partial or case-insensitive name.
     def find_station_name(self, station_name):
-        # Iterate through all station names in the graph.
-        for real_name in self.graph.stations:
-            # Check if the provided name matches any station name in the graph, ignoring case.
-            if station_name.lower() == real_name.lower():
-                return real_name  # Return the exact station name if found.
-        return None  # Return None if no exact match is found.
+        # Look the name up in the station index, ignoring case.
+        return self.graph.station_index.find_name(station_name)
 
     # Method to get the index of a station from a given prompt.
     def get_station_index(self, station_name_prompt):
@@ -23,13 +19,13 @@ class StationLineFinder:
             station_name = input(station_name_prompt).strip().title()  # Prompt the user for the station name and format it.
             matched_station = self.find_station_name(station_name)  # Find the exact station name.
             if matched_station:
-                return self.graph.station_to_int[matched_station]  # Return the index of the station if found.
+                return self.graph.station_index.get_id(matched_station)  # Return the index of the station if found.
             print("Station not found. Please check the name and try again.")  # Prompt again if not found.
 
     # Method to find the tube line connecting two stations.
-    def get_tube_line(self, station1, station2):
-        # Return the tube line connecting the two stations (in either direction).
-        return self.graph.tube_lines.get((station1, station2)) or self.graph.tube_lines.get((station2, station1))
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        # Return the tube line connecting the two stations (in either direction), keeping to preferred_line if it also connects them.
+        return self.graph.get_tube_line(station1, station2, preferred_line)
 
 # Define a class for finding the shortest path between two stations.
 class ShortestPathFinder:
@@ -47,8 +43,9 @@ class ShortestPathFinder:
         distances, predecessors = dijkstra(self.station_finder.graph.graph, source_index)
         
         # Prepare lists to display the path and count the number of stations.
-        display_path = [self.station_finder.graph.int_to_station[destination_index]]
-        count_path = [self.station_finder.graph.int_to_station[destination_index]]
+        station_index = self.station_finder.graph.station_index  # Converts station numbers back to names.
+        display_path = [station_index.get_name(destination_index)]
+        count_path = [station_index.get_name(destination_index)]
 
         current_station = destination_index
         previous_line = None  # Variable to track line changes in the path.
@@ -60,11 +57,11 @@ class ShortestPathFinder:
 
             # Handle line changes in the path display.
             if previous_line is not None and line != previous_line:
-                display_path.insert(1, f"(Switch to {previous_line} line at {self.station_finder.graph.int_to_station[current_station]})")
+                display_path.insert(1, f"(Switch to {previous_line} line at {station_index.get_name(current_station)})")
             
             current_station = next_station
-            display_path.insert(0, self.station_finder.graph.int_to_station[current_station])
-            count_path.insert(0, self.station_finder.graph.int_to_station[current_station])  # Add station to count path.
+            display_path.insert(0, station_index.get_name(current_station))
+            count_path.insert(0, station_index.get_name(current_station))  # Add station to count path.
             previous_line = line
 
         # Count the number of stations in the path.
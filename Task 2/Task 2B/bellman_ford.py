@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# bellman_ford.py
+
+# Introduction to Algorithms, Fourth edition
+# Linda Xiao
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+from single_source_shortest_paths import initialize_single_source, relax
+from csr_graph import CSRGraph, freeze
+from collections import deque
+
+
+def bellman_ford(G, s, early_exit=False):
+	"""Solve the single-source shortest-paths problem in the general case in which
+	edge weights may be negative. 
+
+	Arguments:
+	G -- a directed, weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of the source vertex
+	early_exit -- if True, stop as soon as a pass relaxes no edge.  No later
+	pass could change anything, so d and pi are the same as without it, and
+	there is no negative-weight cycle.  Distances usually settle after about as
+	many passes as there are edges on the longest shortest path.
+	Returns:
+	d -- distances from source s
+	pi -- predecessors
+	A boolean value indicating whether there is a negative-weight cycle
+	reachable from the source; True if no negative-weight cycle, False if there is one
+	"""
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+
+	if isinstance(G, CSRGraph):
+		return bellman_ford_csr(G, d, pi, early_exit)
+
+	# Run through all the edges |V| - 1 times.
+	for i in range(1, card_V):
+		changed = False
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				# Relax each edge.
+				if d[edge.get_v()] > d[u] + edge.get_weight():
+					relax(u, edge.get_v(), edge.get_weight(), d, pi)
+					changed = True
+		if early_exit and not changed:
+			return d, pi, True  # distances have settled
+
+	# One more pass to see whether a relaxation would have changed a distance.
+	for u in range(card_V):
+		for edge in G.get_adj_list(u):
+			# If changed, a negative cycle exists.
+			if d[edge.get_v()] > d[u] + edge.get_weight():
+				return d, pi, False  # negative-weight cycle
+	return d, pi, True
+
+
+def bellman_ford_csr(G, d, pi, early_exit=False):
+	"""Run the passes of bellman_ford straight over the arrays of a CSRGraph,
+	starting from initialized d and pi."""
+	card_V = G.get_card_V()
+	offsets, targets, weights = G.offsets, G.targets, G.weights
+
+	# Run through all the edges |V| - 1 times.
+	for i in range(1, card_V):
+		changed = False
+		for u in range(card_V):
+			if d[u] == float('inf'):
+				continue  # no edge leaving u can be relaxed yet
+			for j in range(offsets[u], offsets[u + 1]):
+				v = targets[j]
+				if d[v] > d[u] + weights[j]:  # relax edge (u, v)
+					d[v] = d[u] + weights[j]
+					pi[v] = u
+					changed = True
+		if early_exit and not changed:
+			return d, pi, True  # distances have settled
+
+	# One more pass to see whether a relaxation would have changed a distance.
+	for u in range(card_V):
+		for j in range(offsets[u], offsets[u + 1]):
+			if d[targets[j]] > d[u] + weights[j]:
+				return d, pi, False  # negative-weight cycle
+	return d, pi, True
+
+
+def bellman_ford_queue(G, s):
+	"""Solve the single-source shortest-paths problem like bellman_ford, but
+	rescan only the edges leaving vertices whose distance has changed, in the
+	first-in, first-out order of the Shortest Path Faster Algorithm (SPFA).
+
+	A vertex waits in the queue at most once at a time.  Without a
+	negative-weight cycle, a shortest path has at most |V| - 1 edges, so the
+	search reports a cycle as soon as the path to some vertex would need |V|
+	edges.  The worst case is O(VE) time, as for bellman_ford, but far fewer
+	edges are usually scanned.
+
+	Arguments:
+	G -- a directed, weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of the source vertex
+	Returns:
+	d -- distances from source s; the same as bellman_ford's when there is no
+	negative-weight cycle, though pi may pick a different one of several shortest paths
+	pi -- predecessors
+	A boolean value indicating whether there is a negative-weight cycle
+	reachable from the source; True if no negative-weight cycle, False if there is one
+	"""
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+	num_edges = [0] * card_V  # number of edges on the path to each vertex found so far
+	in_queue = [False] * card_V
+	queue = deque([s])
+	in_queue[s] = True
+
+	if isinstance(G, CSRGraph):
+		# Fast path: read the edges straight from the CSR arrays.
+		offsets, targets, weights = G.offsets, G.targets, G.weights
+		adj = lambda u: zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])
+	else:
+		adj = lambda u: ((edge.get_v(), edge.get_weight()) for edge in G.get_adj_list(u))
+
+	while queue:
+		u = queue.popleft()
+		in_queue[u] = False
+		d_u = d[u]
+		for v, w in adj(u):
+			if d[v] > d_u + w:  # relax edge (u, v)
+				d[v] = d_u + w
+				pi[v] = u
+				num_edges[v] = num_edges[u] + 1
+				if num_edges[v] >= card_V:
+					return d, pi, False  # negative-weight cycle
+				if not in_queue[v]:
+					queue.append(v)
+					in_queue[v] = True
+	return d, pi, True
+
+
+def bellman_ford_vectorized(G, s):
+	"""Solve the single-source shortest-paths problem like bellman_ford, with
+	each pass over the edges done as a few NumPy operations on arrays of the
+	edges' tails, heads and weights instead of one edge at a time.
+
+	A pass works out d[u] + w for every edge (u, v) at once from the distances
+	at the start of the pass, and np.minimum.at keeps the smallest for each v.
+	Only edges leaving vertices whose distance changed in the previous pass can
+	relax anything, so only they are gathered, and the passes stop once no
+	distance changes.  If a pass |V| would still lower a distance, a shortest
+	path would need |V| edges, so there is a negative-weight cycle.
+
+	Integer weights are relaxed in int64, with the largest int64 standing in
+	for infinity, so the distances come back as ints, just as bellman_ford's
+	do; other weights are relaxed in float64.
+
+	Arguments:
+	G -- a directed, weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of the source vertex
+	Returns:
+	d -- distances from source s, the same as bellman_ford's when there is no
+	negative-weight cycle
+	pi -- predecessors; where several edges give v the same distance in a
+	pass, the first in the graph's edge order is taken
+	A boolean value indicating whether there is a negative-weight cycle
+	reachable from the source; True if no negative-weight cycle, False if there is one
+	"""
+	import numpy as np  # not imported at the top, so bellman_ford can be used without numpy
+	if not isinstance(G, CSRGraph):
+		G = freeze(G)
+	card_V = G.get_card_V()
+	offsets = np.asarray(G.offsets, dtype=np.int64)
+	tails = np.repeat(np.arange(card_V), np.diff(offsets))
+	heads = np.asarray(G.targets, dtype=np.int64)
+	weights = np.asarray(G.weights)
+	if weights.dtype.kind in "iu":
+		weights = weights.astype(np.int64)
+		infinity = np.iinfo(np.int64).max  # never reached by a sum along a path
+	else:
+		weights = weights.astype(np.float64)
+		infinity = np.inf
+
+	d = np.full(card_V, infinity, dtype=weights.dtype)
+	d[s] = 0
+	pi = np.full(card_V, -1, dtype=np.int64)
+	changed = np.zeros(card_V, dtype=bool)
+	changed[s] = True
+	no_negative_cycle = True
+
+	for i in range(card_V):
+		edges = np.flatnonzero(changed[tails])
+		if len(edges) == 0:
+			break  # distances have settled
+		candidates = d[tails[edges]] + weights[edges]
+		if i == card_V - 1:
+			# One more pass to see whether a relaxation would have changed a distance.
+			no_negative_cycle = not np.any(candidates < d[heads[edges]])
+			break
+		new_d = d.copy()
+		np.minimum.at(new_d, heads[edges], candidates)
+		# Edges that gave their head its new, smaller distance; the first one for each head wins.
+		improving = edges[(candidates == new_d[heads[edges]]) & (candidates < d[heads[edges]])]
+		improved, first = np.unique(heads[improving], return_index=True)
+		pi[improved] = tails[improving[first]]
+		changed = new_d < d
+		d = new_d
+
+	d = [float('inf') if x == infinity else x for x in d.tolist()]
+	if pi[s] < 0:
+		d[s] = 0  # bellman_ford leaves the source's distance as the int 0 unless it is lowered
+	return d, [None if u < 0 else u for u in pi.tolist()], no_negative_cycle
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+
+	# Textbook example. 
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 6), ('s', 'y', 7), ('t', 'x', 5), ('t', 'y', 8), ('t', 'z', -4),
+			 ('x', 't', -2), ('y', 'x', -3), ('y', 'z', 9), ('z', 's', 2), ('z', 'x', 7)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	print(graph1.strmap(lambda i: vertices[i]))
+	# d should be [0, 2, 4, 7, -2], pi should be [None, x, y, s, t]
+	d, pi, cycle = bellman_ford(graph1, vertices.index('s'))
+	print("No negative-weight cycle:", cycle)
+	for i in range(len(vertices)):
+		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+	print()
+
+	# Same example on the frozen CSR graph.
+	print(bellman_ford(freeze(graph1), vertices.index('s')) == (d, pi, cycle))
+	print()
+
+	# Negative-weight cycle.
+	graph2 = graph1.copy()
+	graph2.insert_edge(vertices.index('s'), vertices.index('x'), -5)
+	print(graph2.strmap(lambda i: vertices[i]))
+	d, pi, cycle = bellman_ford(graph2, vertices.index('s'))
+	print("No negative-weight cycle:", cycle)
+	for i in range(len(vertices)):
+		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+	print()
+
+	# Early exit and the queue-based version must find the same distances and
+	# the same negative-weight cycles, on both kinds of graph.
+	import random
+	for G, no_cycle in ((graph1, True), (freeze(graph1), True), (graph2, False), (freeze(graph2), False)):
+		print(bellman_ford(G, 0, early_exit=True)[2] == bellman_ford_queue(G, 0)[2]
+			  == bellman_ford_vectorized(G, 0)[2] == no_cycle, end=" ")
+	print()
+	random.seed(2)
+	all_equal = True
+	for trial in range(100):
+		card_V = random.randint(1, 40)
+		G = AdjacencyListGraph(card_V, True, True)
+		# Edges only go from lower to higher vertices, so negative weights make no cycle,
+		# unless one edge is added going back.  Odd trials have float weights.
+		for _ in range(random.randint(0, 4 * card_V)):
+			u, v = sorted(random.sample(range(card_V), 2)) if card_V > 1 else (0, 0)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, random.randint(-5, 20) / (2 if trial % 2 else 1))
+		if trial % 4 == 0 and card_V > 1:
+			u, v = sorted(random.sample(range(card_V), 2))
+			if not G.has_edge(v, u):
+				G.insert_edge(v, u, random.randint(-30, 5) / (2 if trial % 2 else 1))
+		for graph in (G, freeze(G)):
+			for s in range(card_V):
+				d, pi, no_cycle = bellman_ford(graph, s)
+				early = bellman_ford(graph, s, early_exit=True)
+				queued = bellman_ford_queue(graph, s)
+				vectorized = bellman_ford_vectorized(graph, s)
+				if (early[2] != no_cycle or queued[2] != no_cycle or vectorized[2] != no_cycle
+						or (no_cycle and (early != (d, pi, True) or queued[0] != d or vectorized[0] != d
+										  or list(map(type, vectorized[0])) != list(map(type, d))
+										  or any(vectorized[1][v] is not None and d[v] != d[vectorized[1][v]]
+												 + G.find_edge(vectorized[1][v], v).get_weight() for v in range(card_V))))):
+					print("Mismatch from", s, "in trial", trial)
+					all_equal = False
+	print("All early-exit, queue-based and vectorized results are " + ("" if all_equal else "not ") + "equal")
@@ -31,15 +31,85 @@
 #########################################################################
 
 from single_source_shortest_paths import initialize_single_source, relax
-from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_min_heap import IndexedMinHeap, IndexedDaryHeap
+from pairing_heap import PairingHeap
+from fibonacci_heap import FibonacciHeap
+from bucket_queue import DialQueue, RadixHeap
+from csr_graph import CSRGraph, integer_weight_bound
 
+# Priority queues dijkstra can use, by queue_type name.
+QUEUE_TYPES = ('binary', '4-ary', 'pairing', 'fibonacci', 'dial', 'radix')
 
-def dijkstra(G, s):
+# Largest edge weight for which queue_type 'auto' chooses Dial's bucket queue.
+# Above it, its circular array of max weight + 1 buckets gets long to scan, so
+# a radix heap is chosen instead.
+DIAL_MAX_WEIGHT = 1000
+
+
+def make_queue(G, d, queue_type=None):
+	"""Return an empty priority queue of the given type for the vertices of G.
+
+	Arguments:
+	G -- the graph being searched
+	d -- list of distances, used as keys
+	queue_type -- 'binary' for a binary heap, '4-ary' for a heap with four
+	children per node, 'pairing' for a pairing heap, 'fibonacci' for a Fibonacci
+	heap, 'dial' for Dial's bucket queue, 'radix' for a radix heap, 'auto' to
+	choose, or None for a binary heap. All of them share IndexedMinHeap's
+	interface. For a CSRGraph whose edge weights are all nonnegative whole
+	numbers, 'auto' chooses Dial's queue or a radix heap, otherwise a binary
+	heap. Adjacency lists can change, so checking their weights would take a
+	pass over every edge on each call; 'auto' always chooses a binary heap for
+	them. The queues break ties between equal distances differently, so 'auto'
+	is never the default: the paths found by default stay the binary heap's.
+	"""
+	max_weight = None
+	if queue_type is None:
+		queue_type = 'binary'
+	elif isinstance(G, CSRGraph):
+		if queue_type in ('auto', 'dial', 'radix'):
+			max_weight = G.get_integer_weight_bound()  # worked out once per graph
+	elif queue_type in ('dial', 'radix'):
+		max_weight = integer_weight_bound(edge.get_weight() for u in range(G.get_card_V())
+										  for edge in G.get_adj_list(u))
+	if queue_type == 'auto':
+		if max_weight is None:
+			queue_type = 'binary'
+		else:
+			queue_type = 'dial' if max_weight <= DIAL_MAX_WEIGHT else 'radix'
+
+	# The vertices are the integers 0 to card_V-1, so the heaps keep their structure
+	# in flat lists and read their keys straight from the distances in d.
+	if queue_type == 'binary':
+		return IndexedMinHeap(len(d), d)
+	if queue_type == '4-ary':
+		return IndexedDaryHeap(len(d), d, 4)
+	if queue_type == 'pairing':
+		return PairingHeap(len(d), d)
+	if queue_type == 'fibonacci':
+		return FibonacciHeap(len(d), d)
+	if queue_type not in QUEUE_TYPES:
+		raise RuntimeError("Unknown priority queue type " + str(queue_type) + ".")
+	if max_weight is None:
+		raise RuntimeError("The " + queue_type + " queue needs nonnegative whole-number edge weights.")
+	return DialQueue(len(d), max_weight) if queue_type == 'dial' else RadixHeap(len(d))
+
+
+def dijkstra(G, s, frontier_only=False, queue_type=None):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
 
 	Arguments:
-	G -- a directed, weighted graph
+	G -- a directed, weighted graph, either an AdjacencyListGraph or a CSRGraph
 	s -- index of source vertex
+	frontier_only -- if True, a vertex enters the priority queue only when it is
+	first reached, instead of every vertex being inserted up front with an
+	infinite key. The queue then holds just the frontier of the search, and
+	unreachable vertices are never inserted or extracted. Distances are the
+	same either way, but among equally short paths pi may differ.
+	queue_type -- priority queue to use, as for make_queue. By default a binary
+	heap; 'auto' chooses a bucket queue for a CSRGraph whose edge weights are
+	whole numbers, such as minutes or station counts. Among equally short
+	paths, pi depends on the queue.
 	Assumption:
 	All weights are nonnegative
 
@@ -47,27 +117,165 @@ def dijkstra(G, s):
 	d -- distances from source vertex s
 	pi -- predecessors
 	"""
+	d, pi, num_settled = dijkstra_search(G, s, None, frontier_only, queue_type)
+	return d, pi
+
+
+def dijkstra_search(G, s, target=None, frontier_only=False, queue_type=None):
+	"""Run Dijkstra's algorithm from s, stopping as soon as target is extracted
+	from the priority queue, if a target is given.
+
+	Vertices are extracted in the same order as by dijkstra, so d[target] and the
+	path to target found by following pi back from it are the same as dijkstra's.
+	The entries for vertices not yet extracted when the search stops are only
+	upper bounds.
+
+	Arguments:
+	G -- a directed, weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of source vertex
+	target -- index of the vertex to stop at, or None to search the whole graph
+	frontier_only, queue_type -- as for dijkstra
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	num_settled -- number of vertices extracted from the priority queue
+	"""
 
 	card_V = G.get_card_V()
 
 	d, pi = initialize_single_source(G, s)
 
-	# Key function for the priority queue is distance.
-	queue = MinHeapPriorityQueue(lambda u: d[u])
-	for u in range(card_V):
-		queue.insert(u)
+	queue = make_queue(G, d, queue_type)
+	if frontier_only:
+		queue.insert(s, d[s])
+	else:
+		# Every vertex but s has an infinite key, so a binary or 4-ary heap is built
+		# bottom up in O(V) time instead of inserting the vertices one at a time.
+		queue.build(range(card_V), d)
+	num_settled = 0
+
+	if isinstance(G, CSRGraph):
+		# Fast path: read the edges straight from the CSR arrays.
+		offsets, targets, weights = G.offsets, G.targets, G.weights
+		while queue.get_size() > 0:
+			u = queue.extract_min()
+			num_settled += 1
+			if u == target:
+				break
+			d_u = d[u]
+			for i in range(offsets[u], offsets[u + 1]):
+				v = targets[i]
+				if d[v] > d_u + weights[i]:  # relax edge (u, v)
+					d[v] = d_u + weights[i]
+					pi[v] = u
+					queue.insert_or_decrease_key(v, d[v])
+		return d, pi, num_settled
 
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
+		num_settled += 1
+		if u == target:
+			break  # its distance and path are final
 
 		# Relax each edge and update d and pi.
 		for edge in G.get_adj_list(u):
 			v = edge.get_v()
-			# Upon each relaxation, decrease the key in the priority queue.
+			# Upon each relaxation, decrease the key in the priority queue,
+			# or insert v if this is the first time it has been reached.
 			relax(u, v, edge.get_weight(), d, pi,
-					lambda v: queue.decrease_key(v, d[u] + edge.get_weight()))
+					lambda v: queue.insert_or_decrease_key(v, d[u] + edge.get_weight()))
 
-	return d, pi
+	return d, pi, num_settled
+
+
+def bidirectional_dijkstra(G, s, t, queue_type=None):
+	"""Find a shortest path from s to t by searching forward from s and backward
+	from t at the same time, stopping when the two searches can no longer find
+	a shorter path between them.
+
+	Each step settles a vertex on the side whose next distance is smaller, so the
+	two searches grow balls of about the same radius, which between them cover
+	far fewer vertices than one ball reaching all the way from s to t. Whenever
+	an edge joins a vertex reached from s to one reached from t, the weight of
+	the path through it is a candidate for the shortest. The search stops once
+	the two smallest distances left in the queues add up to at least the best
+	candidate, since any shorter path would have to go through a vertex that
+	neither search has settled yet.
+
+	Arguments:
+	G -- an undirected, weighted graph, either an AdjacencyListGraph or a CSRGraph
+	s -- index of source vertex
+	t -- index of target vertex
+	queue_type -- priority queue to use in both searches, as for make_queue
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from s, as for dijkstra_search: d[t] and the d values of the
+	vertices on the path are exact, the rest only upper bounds
+	pi -- predecessors, with the path from s to t spliced in, so that following
+	pi back from t gives a shortest path to s
+	num_settled -- number of vertices extracted from the two priority queues
+	"""
+	if G.is_directed():
+		raise RuntimeError("bidirectional_dijkstra needs an undirected graph, since the backward search follows edges from t.")
+
+	d, pi = initialize_single_source(G, s)
+	if s == t:
+		return d, pi, 0
+	d_back, pi_back = initialize_single_source(G, t)  # pi_back[v] is the next vertex from v towards t
+
+	# Both searches only put vertices into their queues when they first reach them.
+	forward = make_queue(G, d, queue_type)
+	forward.insert(s, d[s])
+	backward = make_queue(G, d_back, queue_type)
+	backward.insert(t, d_back[t])
+	best = float('inf')  # weight of the shortest path from s to t found so far
+	meeting_edge = None  # (u, v, w) such that that path is s ~> u -> v ~> t
+	num_settled = 0
+
+	while forward.get_size() > 0 and backward.get_size() > 0:
+		min_forward, min_backward = d[forward.minimum()], d_back[backward.minimum()]
+		if min_forward + min_backward >= best:
+			break
+
+		# Settle a vertex on the side with the smaller distance.
+		if min_forward <= min_backward:
+			queue, dist, pred, other_dist = forward, d, pi, d_back
+		else:
+			queue, dist, pred, other_dist = backward, d_back, pi_back, d
+		u = queue.extract_min()
+		num_settled += 1
+
+		for edge in G.get_adj_list(u):
+			v, w = edge.get_v(), edge.get_weight()
+			if dist[v] > dist[u] + w:  # relax edge (u, v)
+				dist[v] = dist[u] + w
+				pred[v] = u
+				queue.insert_or_decrease_key(v, dist[v])
+			# A path through an edge to a vertex the other side has reached.
+			if dist[u] + w + other_dist[v] < best:
+				best = dist[u] + w + other_dist[v]
+				meeting_edge = (u, v, w) if queue is forward else (v, u, w)
+
+	if meeting_edge is None:
+		return d, pi, num_settled  # t is unreachable from s
+
+	# Splice the backward half of the path into d and pi. Its distances are added up
+	# forward, edge by edge, as dijkstra would, since working them out from d_back
+	# by subtraction can be off in the last digit with fractional weights.
+	u, v, w = meeting_edge
+	pi[v] = u
+	d[v] = d[u] + w
+	while pi_back[v] is not None:
+		x = pi_back[v]
+		pi[x] = v
+		# The backward search reached v along the lightest of any parallel edges.
+		d[x] = d[v] + min(edge.get_weight() for edge in G.get_adj_list(v) if edge.get_v() == x)
+		v = x
+
+	return d, pi, num_settled
 
 
 # Testing
@@ -87,6 +295,7 @@ if __name__ == "__main__":
 	d, pi = dijkstra(graph1, vertices.index('s'))
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+	print(dijkstra(graph1, vertices.index('s'), frontier_only=True) == (d, pi))
 	print()
 
 	# Larger example with all single-source shortest paths.
@@ -97,9 +306,46 @@ if __name__ == "__main__":
 	all_equal = True
 	for s in range(card_V):
 		dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
+		if dijkstra(graph2, s, frontier_only=True)[0] != dijkstra_d:
+			print("Frontier-only distances mismatch for source vertex", s)
+			all_equal = False
+		t = (s * 7) % card_V
+		target_d, target_pi, num_settled = dijkstra_search(graph2, s, t)
+		if target_d[t] != dijkstra_d[t] or target_pi[t] != dijkstra_pi[t] or num_settled > card_V:
+			print("Early-stopping search mismatch for source vertex", s, "and target", t)
+			all_equal = False
+		for queue_type in QUEUE_TYPES:
+			if dijkstra(graph2, s, queue_type=queue_type)[0] != dijkstra_d:
+				print(queue_type, "queue distances mismatch for source vertex", s)
+				all_equal = False
 		bf_d, bf_pi, cycle = bellman_ford(graph2, s)
 		if bf_d != dijkstra_d:
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Bidirectional search on undirected graphs with fractional weights must give
+	# exactly dijkstra's distance to t, and the same distances along its path.
+	import random
+	random.seed(5)
+	all_equal = True
+	for trial in range(50):
+		card_V = random.randint(2, 60)
+		graph3 = AdjacencyListGraph(card_V, False, True)
+		for _ in range(random.randint(0, 3 * card_V)):
+			u, v = random.sample(range(card_V), 2)
+			if not graph3.has_edge(u, v):
+				graph3.insert_edge(u, v, round(random.uniform(0.1, 10), 3))
+		for s in range(0, card_V, 3):
+			dijkstra_d = dijkstra(graph3, s)[0]
+			for t in range(card_V):
+				d, pi, num_settled = bidirectional_dijkstra(graph3, s, t)
+				path = [t]
+				while pi[path[-1]] is not None and len(path) <= card_V:
+					path.append(pi[path[-1]])
+				if d[t] != dijkstra_d[t] or (d[t] != float('inf') and (path[-1] != s or any(
+						d[x] != d[pi[x]] + graph3.find_edge(pi[x], x).get_weight() for x in path[:-1]))):
+					print("Bidirectional search mismatch from", s, "to", t, "in trial", trial)
+					all_equal = False
+	print("All bidirectional search distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
@@ -102,28 +102,71 @@ class Heap:
     def heapify(self, i):
         """Maintain the heap property.
 
+        Sifts the element at i down iteratively.  The element's key is looked up
+        once, and children move up into the hole it leaves instead of being
+        swapped with it, so each level costs one or two key lookups.
+
         Argument:
         i -- index of the element in the heap.
         """
-        l = self.left(i)
-        r = self.right(i)
-
-        if l < self.heap_size and self.compare(self.get_key(self.array[l]), self.get_key(self.array[i])):
-            swap_with = l
-        else:
-            swap_with = i
+        array, compare, get_key, dict = self.array, self.compare, self.get_key, self.dict
+        heap_size = self.heap_size
+        x = array[i]
+        key = get_key(x)
+
+        while True:
+            l = 2*i + 1
+            if l >= heap_size:
+                break
+            # Pick the child to move up, as the recursive version would swap with it.
+            swap_with, swap_key = i, key
+            l_key = get_key(array[l])
+            if compare(l_key, swap_key):
+                swap_with, swap_key = l, l_key
+            r = l + 1
+            if r < heap_size and compare(get_key(array[r]), swap_key):
+                swap_with = r
+            if swap_with == i:
+                break
+            array[i] = array[swap_with]
+            if dict is not None:
+                dict[array[i]] = i
+            i = swap_with
+
+        array[i] = x
+        if dict is not None:
+            dict[x] = i
+
+    def sift_up(self, i):
+        """Move the element at index i towards the root while its key beats its parent's.
 
-        if r < self.heap_size and self.compare(self.get_key(self.array[r]), self.get_key(self.array[swap_with])):
-            swap_with = r
-
-        if swap_with != i:
-            self.swap(i, swap_with)
-            self.heapify(swap_with)
+        Argument:
+        i -- index of the element in the heap.
+        """
+        array, compare, get_key, dict = self.array, self.compare, self.get_key, self.dict
+        x = array[i]
+        key = get_key(x)
+
+        while i > 0:
+            parent = (i - 1) // 2
+            if not compare(key, get_key(array[parent])):
+                break
+            array[i] = array[parent]
+            if dict is not None:
+                dict[array[i]] = i
+            i = parent
+
+        array[i] = x
+        if dict is not None:
+            dict[x] = i
 
     def build_heap(self):
-        """Convert a list or numpy array into a heap."""
+        """Convert a list or numpy array into a heap in O(n) time."""
         # Run heapify on all roots of the tree, from ((heap_size // 2) - 1) to 0.
         self.heap_size = len(self.array)
+        if self.dict is not None:
+            for i in range(self.heap_size):
+                self.dict[self.array[i]] = i
         for i in range((len(self.array) // 2) - 1, -1, -1):
             self.heapify(i)
 
@@ -110,16 +110,8 @@ class HeapPriorityQueue:
         if self.set_key is not None:
             self.set_key(x, k)
 
-        # Get the index from the dictionary.
-        i = self.dict[x]
-
-        # Compare the value with parents up the heap to place in the correct position.
-        while i > 0 and \
-                self.compare(self.get_key(self.heap.get_array()[i]),
-                             self.get_key(self.heap.get_array()[self.heap.parent(i)])):
-            # Exchange positions and continue if the element should head toward the root.
-            self.heap.swap(i, self.heap.parent(i))
-            i = self.heap.parent(i)
+        # Get the index from the dictionary, and move the object up the heap to its correct position.
+        self.heap.sift_up(self.dict[x])
 
     def insert(self, x):
         """Insert x into the heap.  Grows the heap as necessary.
@@ -136,13 +128,33 @@ class HeapPriorityQueue:
         if self.set_key is not None:
             self.set_key(x, self.temp_insert_value)
 
-        # Insert x into the array and the dictionary.
-        self.heap.get_array().insert(self.heap.get_heap_size() - 1, x)
-        self.dict[x] = self.heap.get_heap_size() - 1
+        # Put x into the array just past the old heap, reusing any slot left by
+        # extract_top instead of shifting the rest of the array, and into the dictionary.
+        i = self.heap.get_heap_size() - 1
+        array = self.heap.get_array()
+        if i < len(array):
+            array[i] = x
+        else:
+            array.append(x)
+        self.dict[x] = i
 
         # Maintain the heap property.
         self.update_key(x, k)
 
+    def build(self, objects):
+        """Fill an empty priority queue with objects at their current keys in O(n)
+        time, building the heap bottom up instead of inserting them one by one.
+
+        Arguments:
+        objects -- iterable of objects to insert
+        """
+        if self.heap.get_heap_size() > 0:
+            raise RuntimeError("build needs an empty priority queue.")
+        array = self.heap.get_array()
+        array[:] = objects
+        self.dict.clear()
+        self.heap.build_heap()
+
     def is_heap(self):
         """Verify that the array or list represents a heap."""
         return self.heap.is_heap()
@@ -1,40 +1,60 @@
 # Import necessary modules and classes
-from Graph import Graph_count_stations, pd  # Import the Graph_count_stations class and pandas as pd
+from Graph import Graph_count_stations  # Import the Graph_count_stations class
+import pandas as pd  # Used to write the paths to a CSV file
 from dijkstra import dijkstra  # Import the Dijkstra's algorithm implementation
+from bfs import all_pairs_bfs  # Import breadth-first search from every station at once, for graphs whose edges all weigh 1
 import os
+
+# Algorithms ShortestPathFinder can use: Dijkstra's algorithm from each station, or breadth-first
+# search, which is enough when every connection counts as one station.
+ALGORITHMS = ("dijkstra", "bfs")
+
 # Define a class to find the shortest paths in a graph
 class ShortestPathFinder:
-    # Constructor for the class that takes a graph object as an argument
-    def __init__(self, graph):
+    # Constructor for the class that takes a graph object and optionally the algorithm to use
+    # Dijkstra's algorithm is the default, matching the name of the CSV file the main block writes
+    def __init__(self, graph, algorithm="dijkstra"):
+        if algorithm not in ALGORITHMS:
+            raise RuntimeError("Unknown algorithm " + str(algorithm) + ".")
         self.graph = graph  # Store the graph object for later use
+        self.algorithm = algorithm  # Name of the algorithm, one of ALGORITHMS
 
     # Method to find shortest paths from all stations to all other stations
     def find_shortest_paths(self):
         all_paths_data = []  # List to store data about all paths
+        graph = self.graph.get_frozen_graph()  # Frozen CSR copy of the graph, shared by every search
+        station_index = self.graph.station_index  # Converts between station names and numbers
+        if self.algorithm == "bfs":
+            # Every connection counts as one station, so breadth-first search gives the same counts
+            # as Dijkstra's algorithm without a priority queue. The searches from all the stations
+            # run together, 64 stations to a machine word.
+            all_searches = all_pairs_bfs(graph)
         # Iterate through all source stations in the graph
-        for source in self.graph.stations:
-            source_index = self.graph.station_to_int[source]  # Get index of the source station
-            distances, predecessors = dijkstra(self.graph.graph, source_index)  # Apply Dijkstra's algorithm
+        for source_index, source in enumerate(station_index):
+            if self.algorithm == "bfs":
+                distances, predecessors = all_searches[source_index]
+            else:
+                distances, predecessors = dijkstra(graph, source_index)  # Apply Dijkstra's algorithm
 
             # Skip specific stations if needed
             if source in ['station 1', 'station 2']:
                 continue
 
             # Iterate through all destination stations
-            for destination in self.graph.stations:
+            for destination_index, destination in enumerate(station_index):
                 # Skip if destination is not in the desired range or is specific stations
                 if destination <= source or destination in ['station 1', 'station 2']:
                     continue
-                destination_index = self.graph.station_to_int[destination]  # Get index of the destination station
 
                 # Backtrack the path from destination to source using predecessors
-                path = []
+                path_ids = []
                 current_station = destination_index
                 while predecessors[current_station] is not None:
-                    path.insert(0, self.graph.int_to_station[current_station])
+                    path_ids.append(current_station)
                     current_station = predecessors[current_station]
                 if current_station == source_index:
-                    path.insert(0, source)
+                    path_ids.append(source_index)
+                path = station_index.get_names(reversed(path_ids))
 
                 # If a valid path exists, add it to the list
                 if path:
@@ -0,0 +1,66 @@
+def normalize_station_name(station_name):
+    """Return the key used to match a typed station name, ignoring case and surrounding spaces."""
+    return station_name.strip().lower()
+
+
+class StationIndex:
+    """Two-way mapping between station names and the station numbers used as graph vertices.
+
+    Names are kept in a list indexed by station number and numbers in a dictionary
+    keyed by name. The lower-case and normalized names of every station are computed
+    once, so looking up a typed name takes at most two dictionary lookups rather than
+    a scan of all stations.
+    """
+
+    def __init__(self, stations):
+        # Station name of each station number.
+        self.names = [station for station in stations]
+        # Station number of each station name.
+        self.ids = {station: i for i, station in enumerate(self.names)}
+        # Station number of each lower-case name. The first station wins if two names
+        # only differ by case, just like a scan of the stations in order would.
+        self.lower_ids = {}
+        # Station number of each normalized name, for typed names that only match once
+        # surrounding spaces are ignored. Some stations appear twice in the workbook, with
+        # and without a trailing space, so this is only tried after an exact match fails.
+        self.normalized_ids = {}
+        for i, station in enumerate(self.names):
+            if isinstance(station, str):
+                self.lower_ids.setdefault(station.lower(), i)
+                self.normalized_ids.setdefault(normalize_station_name(station), i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, station_name):
+        return station_name in self.ids
+
+    def get_id(self, station_name):
+        """Return the station number of a station name."""
+        return self.ids[station_name]
+
+    def get_name(self, station_id):
+        """Return the station name of a station number."""
+        return self.names[station_id]
+
+    def get_names(self, station_ids):
+        """Return the station names of a sequence of station numbers."""
+        names = self.names
+        return [names[station_id] for station_id in station_ids]
+
+    def find_id(self, station_name):
+        """Return the station number of a typed station name, ignoring case, or None
+        if there is no such station. Surrounding spaces are only ignored when the name
+        does not match a station exactly."""
+        station_id = self.lower_ids.get(station_name.lower())
+        if station_id is None:
+            station_id = self.normalized_ids.get(normalize_station_name(station_name))
+        return station_id
+
+    def find_name(self, station_name):
+        """Return the real name of a typed station name, or None if there is no such station."""
+        station_id = self.find_id(station_name)
+        return None if station_id is None else self.names[station_id]
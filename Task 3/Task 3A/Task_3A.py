@@ -1,7 +1,15 @@
 # Import necessary classes and modules
 from Graph import Graph_count_stations  # Importing Graph_count_stations class from Graph module
-from bellman_ford import bellman_ford  # Import the Bellman-Ford algorithm implementation
+from bellman_ford import bellman_ford, bellman_ford_queue, bellman_ford_vectorized  # Import the Bellman-Ford algorithm implementations
+from bfs import bfs_search  # Import breadth-first search, for graphs whose edges all weigh 1
 import os
+
+# Algorithms ShortestPathFinder can use: breadth-first search, which is enough when every
+# connection counts as one station, or Bellman-Ford, which also handles negative weights,
+# either in passes over every connection, rescanning only stations whose distance changed,
+# or in passes done as NumPy operations over arrays of all the connections.
+ALGORITHMS = ("bfs", "bellman_ford", "spfa", "vectorized")
+
 # Define a class to assist in finding station names and tube lines on the graph
 class StationLineFinder:
     # Constructor for the class that takes a graph object as an argument
@@ -10,12 +18,8 @@ class StationLineFinder:
 
     # Method to find the exact name of a station given a possible partial or case-insensitive name
     def find_station_name(self, station_name):
-        # Iterate through all station names in the graph
-        for real_name in self.graph.stations:
-            # Check if the provided name matches any station name in the graph, ignoring case
-            if station_name.lower() == real_name.lower():
-                return real_name  # Return the exact station name if found
-        return None  # Return None if no exact match is found
+        # Look the name up in the station index, ignoring case
+        return self.graph.station_index.find_name(station_name)
 
     # Method to get the index of a station from a given prompt
     def get_station_index(self, station_name_prompt):
@@ -23,19 +27,23 @@ class StationLineFinder:
             station_name = input(station_name_prompt).strip().title()  # Prompt the user for the station name and format it
             matched_station = self.find_station_name(station_name)  # Find the exact station name
             if matched_station:
-                return self.graph.station_to_int[matched_station]  # Return the index of the station if found
+                return self.graph.station_index.get_id(matched_station)  # Return the index of the station if found
             print("Station not found. Please check the name and try again.")  # Prompt again if not found
 
     # Method to find the tube line connecting two stations
-    def get_tube_line(self, station1, station2):
-        # Return the tube line connecting the two stations (in either direction)
-        return self.graph.tube_lines.get((station1, station2)) or self.graph.tube_lines.get((station2, station1))
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        # Return the tube line connecting the two stations (in either direction), keeping to preferred_line if it also connects them
+        return self.graph.get_tube_line(station1, station2, preferred_line)
 
-# Define a class for finding the shortest path between two stations using Bellman-Ford algorithm
+# Define a class for finding the shortest path between two stations using breadth-first search or Bellman-Ford algorithm
 class ShortestPathFinder:
-    # Constructor for the class that takes a StationLineFinder object as an argument
-    def __init__(self, station_finder):
+    # Constructor for the class that takes a StationLineFinder object and optionally the algorithm to use
+    # Bellman-Ford is the default, since breadth-first search is only right when every connection weighs 1
+    def __init__(self, station_finder, algorithm="bellman_ford"):
+        if algorithm not in ALGORITHMS:
+            raise RuntimeError("Unknown algorithm " + str(algorithm) + ".")
         self.station_finder = station_finder  # Storing the station finder object for later use
+        self.algorithm = algorithm  # Name of the algorithm, one of ALGORITHMS
 
     # Method to find and print the shortest path between two stations
     def find_and_print_shortest_path(self, line):
@@ -43,8 +51,21 @@ class ShortestPathFinder:
         source_index = self.station_finder.get_station_index("Enter the start station: ")
         destination_index = self.station_finder.get_station_index("Enter the destination station: ")
         
-        # Run Bellman-Ford algorithm to find the shortest path and its distance
-        distances, predecessors, no_negative_cycle = bellman_ford(self.station_finder.graph.graph, source_index)
+        graph = self.station_finder.graph.graph
+        if self.algorithm == "bfs":
+            # Every connection counts as one station, so breadth-first search finds the shortest path
+            # in linear time, stopping once the destination is reached. There are no negative weights.
+            distances, predecessors, num_settled = bfs_search(graph, source_index, destination_index)
+            no_negative_cycle = True
+        elif self.algorithm == "vectorized":
+            # Run Bellman-Ford algorithm with each pass over the connections done by NumPy
+            distances, predecessors, no_negative_cycle = bellman_ford_vectorized(graph, source_index)
+        elif self.algorithm == "spfa":
+            # Run the queue-based Bellman-Ford algorithm, which only rescans stations whose distance changed
+            distances, predecessors, no_negative_cycle = bellman_ford_queue(graph, source_index)
+        else:
+            # Run Bellman-Ford algorithm to find the shortest path and its distance, stopping once a pass changes nothing
+            distances, predecessors, no_negative_cycle = bellman_ford(graph, source_index, early_exit=True)
 
         # Check for negative weight cycles
         if not no_negative_cycle:
@@ -52,8 +73,9 @@ class ShortestPathFinder:
             return
 
         # Prepare lists to display the path and count the number of stations
-        display_path = [self.station_finder.graph.int_to_station[destination_index]]
-        count_path = [self.station_finder.graph.int_to_station[destination_index]]
+        station_index = self.station_finder.graph.station_index  # Converts station numbers back to names
+        display_path = [station_index.get_name(destination_index)]
+        count_path = [station_index.get_name(destination_index)]
 
         current_station = destination_index
         previous_line = None  # Variable to track line changes in the path
@@ -65,11 +87,11 @@ class ShortestPathFinder:
 
             # Handle line changes in the path display
             if previous_line is not None and line != previous_line:
-                display_path.insert(1, f"(Switch to {previous_line} line at {self.station_finder.graph.int_to_station[current_station]})")
+                display_path.insert(1, f"(Switch to {previous_line} line at {station_index.get_name(current_station)})")
             
             current_station = next_station
-            display_path.insert(0, self.station_finder.graph.int_to_station[current_station])
-            count_path.insert(0, self.station_finder.graph.int_to_station[current_station])  # Add station to count path
+            display_path.insert(0, station_index.get_name(current_station))
+            count_path.insert(0, station_index.get_name(current_station))  # Add station to count path
             previous_line = line
 
         # Count the number of stations in the path
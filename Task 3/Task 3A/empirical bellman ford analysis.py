@@ -0,0 +1,88 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import random
+import tempfile
+import time
+import os
+from Graph import Graph_journey_duration, Graph_count_stations
+from bellman_ford import bellman_ford, bellman_ford_queue, bellman_ford_vectorized
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Ways of running Bellman-Ford, each returning distances, predecessors and whether there is no negative-weight cycle.
+MODES = {
+    'all passes': bellman_ford,
+    'early exit': lambda graph, source: bellman_ford(graph, source, early_exit=True),
+    'spfa': bellman_ford_queue,
+    'vectorized': bellman_ford_vectorized,
+}
+
+# Function to time each mode searching from the same source stations on one graph.
+def measure_modes(dataset, graph, num_sources, modes=MODES):
+    frozen_graph = graph.get_frozen_graph()
+    sources = random.sample(range(frozen_graph.get_card_V()), min(num_sources, frozen_graph.get_card_V()))
+    results = []
+    expected = None
+    for name, mode in modes.items():
+        start_time = time.perf_counter()
+        searches = [mode(frozen_graph, source) for source in sources]
+        time_taken = time.perf_counter() - start_time
+        # Every mode must find the same distances, and no negative-weight cycle.
+        distances = [(d, no_negative_cycle) for d, pi, no_negative_cycle in searches]
+        if expected is None:
+            expected = distances
+        elif distances != expected:
+            raise RuntimeError(name + " found different distances on " + dataset + ".")
+        results.append({
+            'Dataset': dataset,
+            'Total Number of Stations': frozen_graph.get_card_V(),
+            'Number of Edges': frozen_graph.get_card_E(),
+            'Mode': name,
+            'Time per Search (ms)': 1000 * time_taken / len(sources),
+        })
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    # Running every pass takes O(VE) time per search, so a few sources are enough to show the gap,
+    # and networks bigger than all_passes_limit stations are left to the faster modes.
+    num_sources = 10
+    all_passes_limit = 2000
+    num_lines = 15
+    num_interchange_stations = 1
+    mode_results = []
+    random.seed(0)
+
+    # The real network, weighted by journey time and by number of stations.
+    mode_results += measure_modes('London Underground (minutes)', Graph_journey_duration(file_path), num_sources)
+    mode_results += measure_modes('London Underground (stations)', Graph_count_stations(file_path), num_sources)
+
+    # Synthetic networks of growing size.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_stations in [250, 500, 1000, 2000, 5000]:
+            df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations // num_lines, num_interchange_stations)
+            csv_path = os.path.join(temp_dir, f'synthetic_{num_stations}.csv')
+            df.to_csv(csv_path, index=False)
+            graph = Graph_journey_duration(csv_path, use_snapshot=False)
+            modes = MODES if num_stations <= all_passes_limit else {name: mode for name, mode in MODES.items() if name != 'all passes'}
+            mode_results += measure_modes(f'Synthetic ({num_stations} stations)', graph, num_sources, modes)
+
+    # Compile the results into a DataFrame and print how much each mode saves over running every pass.
+    df = pd.DataFrame(mode_results)
+    summary_df = df.pivot(index='Dataset', columns='Mode', values='Time per Search (ms)')
+    summary_df = summary_df.reindex(index=df['Dataset'].unique(), columns=list(MODES))
+    summary_df['Speedup (early exit)'] = summary_df['all passes'] / summary_df['early exit']
+    summary_df['Speedup (spfa)'] = summary_df['all passes'] / summary_df['spfa']
+    summary_df['Speedup (vectorized)'] = summary_df['all passes'] / summary_df['vectorized']
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'bellman_ford_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
@@ -0,0 +1,81 @@
+# Import necessary libraries
+import pandas as pd
+import runpy
+import random
+import tempfile
+import time
+import os
+from Graph import Graph_journey_duration, Graph_count_stations
+from bellman_ford import bellman_ford, bellman_ford_queue, bellman_ford_vectorized
+from johnson import johnson
+
+# Reuse the synthetic network generator from the performance analysis.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PerformanceRecorder = runpy.run_path(os.path.join(current_dir, 'empirical performance analysis .py'))['PerformanceRecorder']
+
+# Ways of finding the distances between every pair of stations, all of which allow negative weights.
+METHODS = {
+    'bellman_ford from every station': lambda graph: [bellman_ford(graph, source, early_exit=True)[0] for source in range(graph.get_card_V())],
+    'spfa from every station': lambda graph: [bellman_ford_queue(graph, source)[0] for source in range(graph.get_card_V())],
+    'vectorized from every station': lambda graph: [bellman_ford_vectorized(graph, source)[0] for source in range(graph.get_card_V())],
+    'johnson': lambda graph: [d for d, pi in johnson(graph)[0]],
+}
+
+# Function to time every method on one graph.
+def measure_methods(dataset, graph):
+    frozen_graph = graph.get_frozen_graph()
+    results = []
+    expected = None
+    for name, method in METHODS.items():
+        start_time = time.perf_counter()
+        distances = method(frozen_graph)
+        time_taken = time.perf_counter() - start_time
+        # Every method must find the same distances.
+        if expected is None:
+            expected = distances
+        elif distances != expected:
+            raise RuntimeError(name + " found different distances on " + dataset + ".")
+        results.append({
+            'Dataset': dataset,
+            'Total Number of Stations': frozen_graph.get_card_V(),
+            'Number of Edges': frozen_graph.get_card_E(),
+            'Method': name,
+            'Time Taken (s)': time_taken,
+        })
+    return results
+
+# Main execution block
+if __name__ == "__main__":
+    parent_dir = os.path.dirname(current_dir)
+    directory = os.path.join(parent_dir, r"Data sets")
+    file_path = os.path.join(directory, "London Underground data with times only.xlsx")
+    num_lines = 15
+    num_interchange_stations = 1
+    method_results = []
+    random.seed(0)
+
+    # The real network, weighted by journey time and by number of stations.
+    method_results += measure_methods('London Underground (minutes)', Graph_journey_duration(file_path))
+    method_results += measure_methods('London Underground (stations)', Graph_count_stations(file_path))
+
+    # Synthetic networks of growing size.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_stations in [250, 500, 1000]:
+            df = PerformanceRecorder.generate_synthetic_data(num_lines, num_stations // num_lines, num_interchange_stations)
+            csv_path = os.path.join(temp_dir, f'synthetic_{num_stations}.csv')
+            df.to_csv(csv_path, index=False)
+            graph = Graph_journey_duration(csv_path, use_snapshot=False)
+            method_results += measure_methods(f'Synthetic ({num_stations} stations)', graph)
+
+    # Compile the results into a DataFrame and print how much faster Johnson's algorithm is.
+    df = pd.DataFrame(method_results)
+    summary_df = df.pivot(index='Dataset', columns='Method', values='Time Taken (s)')
+    summary_df = summary_df.reindex(index=df['Dataset'].unique(), columns=list(METHODS))
+    for name in list(METHODS)[:-1]:
+        summary_df['Speedup over ' + name.split()[0]] = summary_df[name] / summary_df['johnson']
+    print(summary_df.round(3).to_string())
+
+    # Save the results and the summary to an Excel file.
+    with pd.ExcelWriter(os.path.join(directory, 'johnson_analysis.xlsx'), engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Detailed Data', index=False)
+        summary_df.to_excel(writer, sheet_name='Summary', index=True)
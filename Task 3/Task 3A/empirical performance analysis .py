@@ -103,7 +103,9 @@ def analyze_performance(num_lines, num_stations_per_line, num_interchange_statio
     # Create a graph and initialize the shortest path finder
     graph = Graph_journey_duration(file_path)
     station_finder = StationLineFinder(graph)
-    spf = ShortestPathFinder(station_finder)
+    # Journey times are not all 1, so breadth-first search would not find the shortest path. The NumPy
+    # passes of the vectorized Bellman-Ford keep the sweep up to 5000 stations practical.
+    spf = ShortestPathFinder(station_finder, "vectorized")
     
     # Randomly choose start and end stations for the shortest path
     line_stations = [station for station in graph.stations if f'Line_{line}' in station]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# johnson.py
+
+"""Johnson's algorithm for all-pairs shortest paths in graphs that may have
+negative edge weights.
+
+One Bellman-Ford search, from an extra vertex with an edge of weight 0 to
+every vertex, gives each vertex v a potential h(v).  Reweighting each edge
+(u, v) to w(u, v) + h(u) - h(v) makes every weight nonnegative without
+changing which paths are shortest, since every path from s to t changes by
+the same h(s) - h(t).  Dijkstra's algorithm then runs from every vertex in
+O(V E lg V) time in all, instead of the O(V^2 E) of Bellman-Ford from every vertex.
+"""
+
+from csr_graph import CSRGraph, freeze
+from bellman_ford import bellman_ford
+from dijkstra import dijkstra
+
+
+def johnson(G):
+	"""Find shortest paths between every pair of vertices of G.
+
+	Arguments:
+	G -- a weighted graph, either an AdjacencyListGraph or a CSRGraph.  Weights
+	may be negative only if G is directed: an undirected edge with a negative
+	weight can be crossed back and forth, which is itself a negative-weight
+	cycle, so an undirected graph must have nonnegative weights
+
+	Returns:
+	results -- list with the distances d and predecessors pi from every
+	source, with the same distances as bellman_ford(G, s) from each source s,
+	or None if there is a negative-weight cycle
+	A boolean value indicating whether there is a negative-weight cycle; True
+	if no negative-weight cycle, False if there is one
+	"""
+	if not isinstance(G, CSRGraph):
+		G = freeze(G)
+	card_V = G.get_card_V()
+	offsets, targets, weights = list(G.offsets), list(G.targets), list(G.weights)
+	if not G.is_directed() and any(w < 0 for w in weights):
+		raise RuntimeError("Undirected graph has a negative edge weight.")
+
+	# Add a vertex, number card_V, with an edge of weight 0 to every vertex.  The
+	# distances from it are the potentials, and no cycle goes through it, so it
+	# finds every negative-weight cycle in G.
+	augmented = CSRGraph(offsets + [len(targets) + card_V], targets + list(range(card_V)),
+						 weights + [0] * card_V)
+	h, pi, no_negative_cycle = bellman_ford(augmented, card_V, early_exit=True)
+	if not no_negative_cycle:
+		return None, False
+
+	# Reweight every edge (u, v) to w(u, v) + h(u) - h(v), which is never negative.
+	# An undirected graph stores each edge both ways, and the two directions now
+	# have different weights, so the reweighted graph is directed.
+	reweighted = [0] * len(targets)
+	for u in range(card_V):
+		for j in range(offsets[u], offsets[u + 1]):
+			reweighted[j] = weights[j] + h[u] - h[targets[j]]
+	G_hat = CSRGraph(offsets, targets, reweighted)
+
+	# Dijkstra from every vertex, then undo the reweighting of each distance.
+	results = []
+	for u in range(card_V):
+		d_hat, pi = dijkstra(G_hat, u)
+		d = [d_hat[v] + h[v] - h[u] if d_hat[v] != float('inf') else d_hat[v] for v in range(card_V)]
+		results.append((d, pi))
+	return results, True
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+
+	random.seed(7)
+	all_equal = True
+	for trial in range(100):
+		card_V = random.randint(1, 40)
+		directed = trial % 5 != 0
+		G = AdjacencyListGraph(card_V, directed, True)
+		# In a directed graph, edges from lower to higher vertices may be negative without
+		# making a cycle; some trials add an edge going back, which may make one.
+		for _ in range(random.randint(0, 4 * card_V)):
+			u, v = sorted(random.sample(range(card_V), 2)) if card_V > 1 else (0, 0)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, random.randint(-5 if directed else 0, 20))
+		if trial % 4 == 0 and card_V > 1:
+			u, v = sorted(random.sample(range(card_V), 2))
+			if not G.has_edge(v, u):
+				G.insert_edge(v, u, random.randint(-30 if directed else 0, 5))
+
+		results, no_negative_cycle = johnson(G)
+		expected = [bellman_ford(G, s) for s in range(card_V)]
+		if no_negative_cycle != all(no_cycle for d, pi, no_cycle in expected):
+			print("Negative-weight cycle mismatch in trial", trial)
+			all_equal = False
+		elif no_negative_cycle:
+			for s in range(card_V):
+				d, pi = results[s]
+				# Distances must match, and every predecessor edge must lie on a shortest path.
+				if (d != expected[s][0] or any(pi[v] is not None and d[v] != d[pi[v]]
+						+ G.find_edge(pi[v], v).get_weight() for v in range(card_V))):
+					print("Mismatch from", s, "in trial", trial)
+					all_equal = False
+	print("All Johnson's algorithm distances are " + ("" if all_equal else "not ") + "equal")
+
+	# An undirected graph with a negative weight is rejected.
+	G = AdjacencyListGraph(2, False, True)
+	G.insert_edge(0, 1, -1)
+	try:
+		johnson(G)
+		print("Undirected graph with a negative weight was not rejected")
+	except RuntimeError as e:
+		print(e)
@@ -1,85 +1,314 @@
-import pandas as pd
+# Only the standard library is imported here, so a graph can be loaded from its
+# snapshot without importing numpy or pandas. They are imported when a graph has
+# to be built from its source file.
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
 from adjacency_list_graph import AdjacencyListGraph
-class Graph_count_stations:
-    def __init__(self, file_path):
-        # Read our Excel file and store its data in a table (DataFrame).
-        self.db = pd.read_excel(file_path, sheet_name='Sheet1')
-        
-        # Get all unique station names from our data.
-        self.stations = pd.concat([self.db['station 1'], self.db['station 2']]).unique()
-        
-        # Create a dictionary to convert station names to numbers.
-        self.station_to_int = {station: i for i, station in enumerate(self.stations)}
-        
-        # Create a dictionary to convert numbers back to station names.
-        self.int_to_station = {i: station for i, station in enumerate(self.stations)}
-        
-        # Make our graph to store stations and connections between them.
-        self.graph = AdjacencyListGraph(len(self.stations), directed=False, weighted=True)
-        
-        # Make a dictionary to remember which tube line connects two stations.
-        self.tube_lines = {}
-        
-        # Fill our graph with stations and connections.
-        self.construct_graph()
+from connection_readers import get_reader
+from station_index import StationIndex
+
+# Bump when the layout of the snapshot files changes.
+SNAPSHOT_VERSION = 3
+
+# First bytes of every snapshot file.
+SNAPSHOT_MAGIC = b'STNGRAPH'
+
+
+def file_hash(file_path):
+    """Return the SHA-256 hex digest of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_snapshot(snapshot_path, source_hash, stations, edge_u, edge_v, edge_weights,
+                  line_names, edge_lines, edge_line_bits):
+    """Write the arrays returned by compile_network to a binary snapshot.
+
+    The snapshot is a JSON header with the station and tube line names, followed
+    by the edge arrays as raw little-endian numbers, so that load_snapshot only
+    needs the standard library.
+
+    Returns False without writing if a station or line name is not a string.
+    """
+    stations = list(stations)
+    line_names = list(line_names)
+    if not all(isinstance(name, str) for name in stations) or \
+            not all(isinstance(name, str) for name in line_names):
+        return False
+    edge_weights = edge_weights.tolist()
+    weight_type = 'q' if all(type(weight) is int for weight in edge_weights) else 'd'
+    arrays = [
+        ('edge_u', array('i', edge_u.tolist())),
+        ('edge_v', array('i', edge_v.tolist())),
+        ('edge_weights', array(weight_type, edge_weights)),
+        ('edge_lines', array('h', edge_lines.tolist())),
+        ('edge_line_bits', array('B', edge_line_bits.tobytes())),
+    ]
+    header = json.dumps({
+        'source_hash': source_hash,
+        'stations': stations,
+        'line_names': line_names,
+        'line_bytes': edge_line_bits.shape[1],
+        'arrays': [[name, values.typecode, len(values)] for name, values in arrays],
+    }).encode('utf-8')
+
+    # Write to a temporary file first so that readers never see half a snapshot.
+    temp_path = snapshot_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack('<II', SNAPSHOT_VERSION, len(header)) + header)
+        for name, values in arrays:
+            if sys.byteorder != 'little':
+                values.byteswap()
+            f.write(values.tobytes())
+    os.replace(temp_path, snapshot_path)
+    return True
+
+
+def load_snapshot(snapshot_path, source_hash):
+    """Return the arrays stored by save_snapshot, or None if there is no
+    snapshot or it was made from a different source file.
+
+    Names come back as lists and edge arrays as array.array objects, which
+    load_network accepts just like the numpy arrays from compile_network.
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            data = f.read()
+        position = len(SNAPSHOT_MAGIC)
+        if data[:position] != SNAPSHOT_MAGIC:
+            return None
+        version, header_size = struct.unpack_from('<II', data, position)
+        if version != SNAPSHOT_VERSION:
+            return None
+        position += struct.calcsize('<II')
+        header = json.loads(data[position:position + header_size].decode('utf-8'))
+        if header['source_hash'] != source_hash:
+            return None
+        position += header_size
+
+        arrays = {}
+        for name, type_code, length in header['arrays']:
+            values = array(type_code)
+            end = position + length * values.itemsize
+            values.frombytes(data[position:end])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            arrays[name] = values
+            position = end
+        # One row of line bits per edge, like the array returned by line_bitsets.
+        edge_line_bits = memoryview(arrays['edge_line_bits']).cast(
+            'B', (len(arrays['edge_u']), header['line_bytes']))
+        return (header['stations'], arrays['edge_u'], arrays['edge_v'], arrays['edge_weights'],
+                header['line_names'], arrays['edge_lines'], edge_line_bits)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+class StationGraph:
+    """Base class for Graph_count_stations and Graph_journey_duration."""
+
+    # Suffix added to the source file name for this kind of graph's snapshot.
+    snapshot_suffix = None
+
+    def __init__(self, file_path, use_snapshot=True, reader=None, chunksize=None):
+        """Build the graph for the connections in an Excel, CSV or Parquet file.
+
+        Arguments:
+        file_path -- path of the file with the connections
+        use_snapshot -- if True, load the graph from a binary snapshot next to
+        the file when it matches the file's contents, and write one otherwise
+        reader -- optional function that yields the file's rows as DataFrame
+        chunks; by default chosen by the file extension (see connection_readers)
+        chunksize -- optional number of rows per chunk for readers that stream
+        """
+        self.file_path = file_path
+        self.reader = reader if reader is not None else get_reader(file_path)
+        self.chunksize = chunksize
+        self._db = None
+
+        network = None
+        if use_snapshot:
+            source_hash = file_hash(file_path)
+            snapshot_path = file_path + self.snapshot_suffix
+            network = load_snapshot(snapshot_path, source_hash)
+
+        if network is not None:
+            self.load_network(*network)
+        else:
+            # Fill our graph with stations and connections, one chunk of rows at a time.
+            network = self.construct_graph_from_chunks(self.read_chunks())
+            if use_snapshot:
+                try:
+                    save_snapshot(snapshot_path, source_hash, *network)
+                except OSError:
+                    pass  # the snapshot is only a cache
+
+    @property
+    def db(self):
+        """The table (DataFrame) of connections, read from the file on first use."""
+        if self._db is None:
+            import pandas as pd
+            self._db = pd.concat(list(self.reader(self.file_path, self.chunksize)), ignore_index=True)
+        return self._db
+
+    def read_chunks(self):
+        """Yield the rows of the file as DataFrame chunks. Chunks are not kept
+        unless the whole table has already been read into db."""
+        if self._db is not None:
+            yield self._db
+        else:
+            yield from self.reader(self.file_path, self.chunksize)
 
     def construct_graph(self):
-        for index, row in self.db.iterrows():
-            try:
-                station_1 = self.station_to_int[row['station 1']]
-                station_2 = self.station_to_int[row['station 2']]
-                
-                # Set edge weight to 1 for each connection
-                edge_weight = 1
-                
-                tube_line = row['tube line']
-                
-                if not self.graph.has_edge(station_1, station_2):
-                    self.graph.insert_edge(station_1, station_2, edge_weight)
-                    self.tube_lines[(station_1, station_2)] = tube_line
-            except ValueError:
-                continue
-class Graph_journey_duration:
-    def __init__(self, file_path):
-        # Read our Excel file and store its data in a table (DataFrame).
-        self.db = pd.read_excel(file_path, sheet_name='Sheet1')
-        
-        # Get all unique station names from our data.
-        self.stations = pd.concat([self.db['station 1'], self.db['station 2']]).unique()
-        
-        # Create a dictionary to convert station names to numbers.
-        self.station_to_int = {station: i for i, station in enumerate(self.stations)}
-        
-        # Create a dictionary to convert numbers back to station names.
-        self.int_to_station = {i: station for i, station in enumerate(self.stations)}
-        
+        """Build the graph from the whole table in db.
+        Return the arrays returned by compile_network."""
+        return self.construct_graph_from_arrays(*self.connection_columns(self.db))
+
+    def construct_graph_from_chunks(self, chunks):
+        """Build the graph from an iterable of DataFrame chunks of connections.
+        Return the arrays returned by compile_network."""
+        from network_compiler import NetworkBuilder
+        builder = NetworkBuilder()
+        for chunk in chunks:
+            builder.add_chunk(*self.connection_columns(chunk))
+        network = builder.compile()
+        self.load_network(*network)
+        return network
+
+    def construct_graph_from_arrays(self, station_1, station_2, weights, lines, valid=None):
+        """Build the graph in O(V + E) from the station, weight and tube line columns.
+        Return the arrays returned by compile_network."""
+        from network_compiler import compile_network
+        network = compile_network(station_1, station_2, weights, lines, valid)
+        self.load_network(*network)
+        return network
+
+    def load_network(self, stations, edge_u, edge_v, edge_weights, line_names, edge_lines, edge_line_bits):
+        """Build the graph from the arrays returned by compile_network or load_snapshot."""
+        # All unique station names from our data.
+        self.stations = stations
+
+        # Convert between station names and numbers.
+        self.station_index = StationIndex(stations)
+
+        # The dictionary and list behind the station index, for older code.
+        self.station_to_int = self.station_index.ids
+        self.int_to_station = self.station_index.names
+
         # Make our graph to store stations and connections between them.
-        self.graph = AdjacencyListGraph(len(self.stations), directed=False, weighted=True)
-        
-        # Make a dictionary to remember which tube line connects two stations.
-        self.tube_lines = {}
-        
-        # Fill our graph with stations and connections.
-        self.construct_graph()
+        # The neighbour index makes has_edge checks constant time, even at big interchanges.
+        self.graph = AdjacencyListGraph(len(self.stations), directed=False, weighted=True, indexed=True,
+                                        compact=True)
 
-    def construct_graph(self):
-        # Look at each row in our data.
-        for index, row in self.db.iterrows():
-            try:
-                # Change station names to numbers.
-                station_1 = self.station_to_int[row['station 1']]
-                station_2 = self.station_to_int[row['station 2']]
-                
-                # Change travel time to a number.
-                journey_time = float(row['time in minutes between the stations'])
-                
-                # Remember the name of the tube line for this connection.
-                tube_line = row['tube line']
-                
-                # Add a connection between stations to our graph (if it's not already there).
-                if not self.graph.has_edge(station_1, station_2):
-                    self.graph.insert_edge(station_1, station_2, journey_time)
-                    self.tube_lines[(station_1, station_2)] = tube_line
-            except ValueError:
-                # If something goes wrong (like if the data is not a number), skip this row.
-                continue
\ No newline at end of file
+        # Tube line names, indexed by their small integer codes, and the other way round.
+        self.line_names = list(line_names)
+        self.line_to_code = {line: code for code, line in enumerate(self.line_names)}
+
+        # Each edge is labelled with a bitmask of the codes of every tube line on it.
+        num_bytes = edge_line_bits.shape[1]
+        line_bytes = edge_line_bits.tobytes()
+        line_masks = [int.from_bytes(line_bytes[i:i + num_bytes], 'little')
+                      for i in range(0, len(line_bytes), num_bytes)]
+
+        # Lists of Python ints keep the edge weights plain numbers.
+        self.graph.insert_edges(edge_u.tolist(), edge_v.tolist(), edge_weights.tolist(), line_masks)
+
+        # The tube_lines dictionary is only made if older code asks for it.
+        self._line_table = (edge_u, edge_v, edge_lines)
+        self._tube_lines = None
+
+        # Read-only CSR copy of the graph, made on first use.
+        self._frozen_graph = None
+
+    @property
+    def tube_lines(self):
+        """Dictionary mapping (station 1, station 2) numbers to the first tube line
+        seen between them, made on first use. get_tube_line knows every line."""
+        if self._tube_lines is None:
+            edge_u, edge_v, edge_lines = self._line_table
+            self._tube_lines = dict(zip(zip(edge_u.tolist(), edge_v.tolist()),
+                                        (self.line_names[code] for code in edge_lines.tolist())))
+        return self._tube_lines
+
+    def get_line_mask(self, station1, station2):
+        """Return the bitmask of the codes of every tube line between two stations,
+        0 if they are not connected."""
+        edge = self.graph.find_edge(station1, station2)  # constant time with the neighbour index
+        return 0 if edge is None else edge.get_label()
+
+    def get_tube_lines(self, station1, station2):
+        """Return the names of every tube line between two stations."""
+        mask = self.get_line_mask(station1, station2)
+        return [line for code, line in enumerate(self.line_names) if mask >> code & 1]
+
+    def get_tube_line(self, station1, station2, preferred_line=None):
+        """Return the name of the first tube line seen between two stations, as in
+        tube_lines, None if they are not connected. If preferred_line is given and is
+        also one of them, return it instead, so a route can stay on the same line."""
+        mask = self.get_line_mask(station1, station2)
+        if mask == 0:
+            return None
+        code = self.line_to_code.get(preferred_line)
+        if code is not None and mask >> code & 1:
+            return preferred_line
+        tube_lines = self.tube_lines
+        return tube_lines.get((station1, station2)) or tube_lines.get((station2, station1))
+
+    def get_frozen_graph(self):
+        """Return a read-only CSRGraph copy of self.graph for fast repeated searches."""
+        if self._frozen_graph is None:
+            from csr_graph import freeze
+            self._frozen_graph = freeze(self.graph)
+        return self._frozen_graph
+
+    def save_shared_graph(self, file_path):
+        """Write the frozen graph, station names and tube lines to a file that
+        worker processes open with csr_graph.open_csr, sharing its memory."""
+        from csr_graph import save_csr
+        frozen_graph = self.get_frozen_graph()
+        # Code of the lowest-coded tube line on each entry, in the order of the frozen graph.
+        line_ids = []
+        for u in range(self.graph.get_card_V()):
+            for edge in self.graph.get_adj_list(u):
+                mask = edge.get_label()
+                line_ids.append((mask & -mask).bit_length() - 1)
+        save_csr(file_path, frozen_graph, self.stations, line_ids, self.line_names)
+
+
+class Graph_count_stations(StationGraph):
+    snapshot_suffix = '.count_stations.snapshot'
+
+    def connection_columns(self, table):
+        """Return the station 1, station 2, weight and tube line columns of a table
+        of connections, and which rows to build edges from."""
+        import numpy as np
+        # Set edge weight to 1 for each connection.
+        edge_weights = np.ones(len(table), dtype=np.int64)
+
+        return (table['station 1'].to_numpy(), table['station 2'].to_numpy(),
+                edge_weights, table['tube line'].to_numpy(), None)
+
+
+class Graph_journey_duration(StationGraph):
+    snapshot_suffix = '.journey_duration.snapshot'
+
+    def connection_columns(self, table):
+        """Return the station 1, station 2, weight and tube line columns of a table
+        of connections, and which rows to build edges from."""
+        import pandas as pd
+        # Change travel times to numbers.
+        travel_times = table['time in minutes between the stations']
+        journey_times = pd.to_numeric(travel_times, errors='coerce').astype(float)
+
+        # If the travel time is not a number, skip that row.
+        valid = journey_times.notna() | travel_times.isna()
+
+        return (table['station 1'].to_numpy(), table['station 2'].to_numpy(),
+                journey_times.to_numpy(), table['tube line'].to_numpy(), valid.to_numpy())
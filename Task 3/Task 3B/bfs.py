@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# bfs.py
+
+"""Breadth-first search for shortest paths in graphs whose edges all weigh 1.
+
+Breadth-first search visits vertices in order of their number of edges from
+the source, so with unit weights it reaches each vertex first along a shortest
+path.  A first-in, first-out queue takes the place of Dijkstra's priority
+queue, and the search runs in O(V + E) time.
+"""
+
+from single_source_shortest_paths import initialize_single_source
+from csr_graph import CSRGraph, freeze
+
+
+def bfs(G, s):
+	"""Find shortest paths from s to every vertex of a graph whose edges all
+	weigh 1, such as the graph of a Graph_count_stations.
+
+	Arguments:
+	G -- a graph, either an AdjacencyListGraph or a CSRGraph; edge weights are
+	ignored, and every edge counts as one step
+	s -- index of source vertex
+
+	Returns:
+	d -- distances from source vertex s, the same as dijkstra's when every weight is 1
+	pi -- predecessors
+	"""
+	d, pi, num_settled = bfs_search(G, s)
+	return d, pi
+
+
+def bfs_search(G, s, target=None):
+	"""Run breadth-first search from s, stopping as soon as target is reached,
+	if a target is given.
+
+	A vertex's distance and predecessor are final as soon as it is first
+	reached, so the search can stop there instead of waiting until target is
+	taken from the queue.  Vertices not reached when the search stops keep an
+	infinite distance.
+
+	Arguments:
+	G -- a graph, either an AdjacencyListGraph or a CSRGraph; edge weights are
+	ignored, and every edge counts as one step
+	s -- index of source vertex
+	target -- index of the vertex to stop at, or None to search the whole graph
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	num_settled -- number of vertices taken from the queue
+	"""
+	d, pi = initialize_single_source(G, s)
+	if s == target:
+		return d, pi, 0
+
+	# The queue is a list that only grows: vertices are taken from position head,
+	# and each vertex is added at most once.
+	queue = [s]
+	head = 0
+
+	if isinstance(G, CSRGraph):
+		# Fast path: read the edges straight from the CSR arrays.
+		offsets, targets = G.offsets, G.targets
+		while head < len(queue):
+			u = queue[head]
+			head += 1
+			d_v = d[u] + 1
+			for i in range(offsets[u], offsets[u + 1]):
+				v = targets[i]
+				if d[v] == float('inf'):  # v is reached for the first time
+					d[v] = d_v
+					pi[v] = u
+					if v == target:
+						return d, pi, head
+					queue.append(v)
+		return d, pi, head
+
+	while head < len(queue):  # while the queue is not empty
+		u = queue[head]  # take the vertex that has waited longest
+		head += 1
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			if d[v] == float('inf'):  # v is reached for the first time
+				d[v] = d[u] + 1
+				pi[v] = u
+				if v == target:
+					return d, pi, head  # its distance and path are final
+				queue.append(v)
+
+	return d, pi, head
+
+
+def multi_source_bfs(G, predecessors=True):
+	"""Run breadth-first search from every vertex at once, with the sets of
+	sources that have reached each vertex held as bitsets.
+
+	Each vertex keeps one bit per source in an array of 64-bit words.  One
+	step ORs together the frontier bitsets of a vertex's neighbours, so a
+	single pass over the edges advances the searches from all card_V sources
+	a level, 64 sources to a machine word.
+
+	Predecessors are then worked out level by level from the distances,
+	choosing for each vertex the neighbour one step closer that bfs would
+	have taken from its queue first, so they are exactly the ones bfs finds.
+
+	Arguments:
+	G -- a graph, either an AdjacencyListGraph or a CSRGraph; edge weights are
+	ignored, and every edge counts as one step
+	predecessors -- if False, skip working out the predecessors
+
+	Returns:
+	dist -- card_V x card_V numpy array, dist[s, v] is the distance from s to
+	v, or -1 if v is unreachable from s
+	pi -- card_V x card_V numpy array, pi[s, v] is the predecessor of v on
+	the path from s, or -1 if it has none; None if predecessors is False
+	"""
+	import numpy as np  # not imported at the top, so bfs can be used without numpy
+	if not isinstance(G, CSRGraph):
+		G = freeze(G)
+	card_V = G.get_card_V()
+	offsets = np.asarray(G.offsets, dtype=np.int64)
+	targets = np.asarray(G.targets, dtype=np.int64)
+	has_edges = offsets[1:] > offsets[:-1]
+	starts = offsets[:-1][has_edges]
+
+	# Bit t of row v is set once the distance from v to t is known.  Row v ORs in
+	# the frontier rows of the vertices its edges enter, since v is one step
+	# farther from t than any of them, so dist[v, t] is read straight off row v.
+	num_words = (card_V + 63) // 64
+	vertices = np.arange(card_V)
+	frontier = np.zeros((card_V, num_words), dtype=np.uint64)
+	frontier[vertices, vertices // 64] = np.left_shift(np.uint64(1), (vertices % 64).astype(np.uint64))
+	reached = frontier.copy()
+	dist = np.full((card_V, card_V), -1, dtype=np.int32)
+	dist[vertices, vertices] = 0
+	levels = [(vertices, vertices)]  # (sources, vertices) at each distance
+
+	level = 0
+	while len(targets) > 0:
+		level += 1
+		next_frontier = np.zeros_like(frontier)
+		next_frontier[has_edges] = np.bitwise_or.reduceat(frontier[targets], starts, axis=0)
+		next_frontier &= ~reached
+		rows, words = np.nonzero(next_frontier)
+		if len(rows) == 0:
+			break
+		reached |= next_frontier
+		# Read the set bits off the nonzero words, lowest first.  Most words have
+		# only a bit or two set, so this touches each new distance about once.
+		values = next_frontier[rows, words]
+		sources, reached_vertices = [], []
+		while len(values) > 0:
+			lowest = values & (~values + np.uint64(1))
+			sources.append(rows)
+			reached_vertices.append(words * 64 + np.frexp(lowest.astype(np.float64))[1] - 1)
+			values ^= lowest
+			left = values != 0
+			rows, words, values = rows[left], words[left], values[left]
+		sources, reached_vertices = np.concatenate(sources), np.concatenate(reached_vertices)
+		dist[sources, reached_vertices] = level
+		levels.append((sources.astype(np.int32), reached_vertices.astype(np.int32)))
+		frontier = next_frontier
+
+	if not predecessors:
+		return dist, None
+
+	# Edges entering each vertex, with the position of each edge in its tail's adjacency list.
+	tails = np.repeat(vertices, np.diff(offsets))
+	in_edges = np.argsort(targets, kind='stable')
+	in_offsets = np.concatenate(([0], np.cumsum(np.bincount(targets, minlength=card_V))))
+	max_degree = max(1, int(np.diff(offsets).max())) if card_V > 0 else 1
+
+	# bfs takes vertex u from its queue before w when u is at a smaller distance,
+	# or at the same distance and reached from an earlier vertex, or from the same
+	# vertex by an earlier edge.  rank[s, u] is u's place within its level for source s.
+	rank = np.zeros((card_V, card_V), dtype=np.int32)
+	pi = np.full((card_V, card_V), -1, dtype=np.int32)
+	for level in range(1, len(levels)):
+		sources, vs = levels[level]
+		# Every neighbour leading into v, for each (source, v) pair at this level.
+		num_in = in_offsets[vs + 1] - in_offsets[vs]
+		pair = np.repeat(np.arange(len(vs)), num_in)
+		first = np.cumsum(num_in) - num_in
+		edges = in_edges[in_offsets[vs][pair] + np.arange(len(pair)) - first[pair]]
+		us = tails[edges]
+		# The first neighbour one step closer to be taken from the queue reaches v.
+		candidate_sources = sources[pair]
+		order = rank[candidate_sources, us].astype(np.int64) * max_degree + (edges - offsets[us])
+		order = order * card_V + us
+		order[dist[candidate_sources, us] != level - 1] = np.iinfo(np.int64).max
+		best = np.minimum.reduceat(order, first)
+		pi[sources, vs] = best % card_V
+		# Number the vertices of this level in the order bfs would queue them.
+		queue_order = np.argsort(sources.astype(np.int64) * (max_degree * card_V * card_V) + best)
+		sorted_sources = sources[queue_order]
+		group_start = np.searchsorted(sorted_sources, sorted_sources)
+		rank[sorted_sources, vs[queue_order]] = np.arange(len(queue_order)) - group_start
+	return dist, pi
+
+
+def all_pairs_bfs(G):
+	"""Return a list with bfs(G, s) for every vertex s, worked out by
+	multi_source_bfs: d as a list with infinite distances to unreachable
+	vertices, and pi as a list with None for no predecessor."""
+	dist, pi = multi_source_bfs(G)
+	inf = float('inf')
+	return [([inf if x < 0 else x for x in d_row], [None if u < 0 else u for u in pi_row])
+			for d_row, pi_row in zip(dist.tolist(), pi.tolist())]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	from adjacency_list_graph import AdjacencyListGraph
+	from bellman_ford import bellman_ford
+
+	random.seed(5)
+	all_equal = True
+	for trial in range(50):
+		card_V = random.randint(1, 100)
+		directed = random.random() < 0.5
+		G = AdjacencyListGraph(card_V, directed, True)
+		for _ in range(random.randint(0, 3 * card_V)):
+			u, v = random.randrange(card_V), random.randrange(card_V)
+			if u != v and not G.has_edge(u, v):
+				G.insert_edge(u, v, 1)
+		frozen = freeze(G)
+		for s in range(card_V):
+			expected = bellman_ford(G, s)[0]
+			for graph in (G, frozen):
+				d, pi = bfs(graph, s)
+				# Distances must match, and each predecessor must be one step closer.
+				if d != expected or any(pi[v] is not None and d[pi[v]] != d[v] - 1 for v in range(card_V)):
+					print("Mismatch from", s, "in trial", trial)
+					all_equal = False
+				t = random.randrange(card_V)
+				if bfs_search(graph, s, t)[0][t] != expected[t]:
+					print("Mismatch from", s, "to", t, "in trial", trial)
+					all_equal = False
+		# Searching from every vertex at once must give exactly what bfs gives from each.
+		for graph in (G, frozen):
+			if all_pairs_bfs(graph) != [bfs(frozen, s) for s in range(card_V)]:
+				print("All-pairs mismatch in trial", trial)
+				all_equal = False
+	print("All breadth-first search distances are " + ("" if all_equal else "not ") + "equal")